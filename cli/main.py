@@ -843,7 +843,7 @@ def run_analysis():
         init_agent_state = graph.propagator.create_initial_state(
             selections["ticker"], selections["analysis_date"]
         )
-        args = graph.propagator.get_graph_args()
+        args = graph.propagator.get_graph_args(state=init_agent_state)
 
         # Stream the analysis
         trace = []
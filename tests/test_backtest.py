@@ -0,0 +1,102 @@
+import pandas as pd
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from langchain_core.utils.function_calling import convert_to_openai_tool
+
+import tradingagents.graph.backtest as backtest
+import tradingagents.graph.trading_graph as trading_graph
+from tradingagents.dataflows import interface
+from tradingagents.default_config import DEFAULT_CONFIG
+from tradingagents.graph.backtest import Backtester
+
+DATES = [f"2024-01-{day:02d}" for day in range(2, 10)]
+SAMPLE_ARGS = {
+    "string": {
+        "ticker": "NVDA",
+        "symbol": "NVDA",
+        "query": "NVDA",
+        "indicator": "rsi",
+        "freq": "quarterly",
+    },
+    "integer": 7,
+}
+
+
+class ScriptedChatModel(BaseChatModel):
+    """Calls every bound tool once, then answers with a BUY proposal."""
+
+    @property
+    def _llm_type(self) -> str:
+        return "scripted"
+
+    def bind_tools(self, tools, **kwargs):
+        return self.bind(tools=[convert_to_openai_tool(t) for t in tools], **kwargs)
+
+    def _generate(self, messages, stop=None, run_manager=None, tools=None, **kwargs):
+        if tools and messages[-1].type != "tool":
+            tool_calls = []
+            for i, tool in enumerate(tools):
+                function = tool["function"]
+                args = {}
+                for name in function["parameters"].get("required", []):
+                    schema = function["parameters"]["properties"][name]
+                    if schema.get("type") == "integer":
+                        args[name] = SAMPLE_ARGS["integer"]
+                    else:
+                        args[name] = SAMPLE_ARGS["string"].get(name, "2024-01-05")
+                tool_calls.append({"name": function["name"], "args": args, "id": f"call_{i}"})
+            message = AIMessage(content="", tool_calls=tool_calls)
+        else:
+            message = AIMessage(content="FINAL TRANSACTION PROPOSAL: **BUY**")
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+
+def spy(calls, vendor, method):
+    def impl(*args, **kwargs):
+        calls.append((vendor, method))
+        return f"{vendor} {method} data"
+
+    impl.__name__ = f"{vendor}_{method}"
+    return impl
+
+
+def test_backtest_only_calls_local_vendors(tmp_path, monkeypatch):
+    calls = []
+    live = []
+    for method, vendors in interface.VENDOR_METHODS.items():
+        for vendor, vendor_impl in vendors.items():
+            if isinstance(vendor_impl, list):
+                impls = []
+                for impl in vendor_impl:
+                    impls.append(spy(calls, vendor, method))
+                    if impl in interface.LIVE_LOCAL_IMPLEMENTATIONS:
+                        live.append(impls[-1])
+                monkeypatch.setitem(vendors, vendor, impls)
+            else:
+                monkeypatch.setitem(vendors, vendor, spy(calls, vendor, method))
+    monkeypatch.setattr(interface, "LIVE_LOCAL_IMPLEMENTATIONS", live)
+
+    monkeypatch.setattr(
+        trading_graph, "ChatOpenAI", lambda **kwargs: ScriptedChatModel()
+    )
+    prices = pd.DataFrame({"Date": DATES, "Close": range(100, 100 + len(DATES))})
+    monkeypatch.setattr(backtest, "load_prices", lambda symbol, path: prices)
+
+    monkeypatch.chdir(tmp_path)  # the graph logs states to ./eval_results
+    config = {
+        **DEFAULT_CONFIG,
+        "data_cache_dir": str(tmp_path),
+        "embedding_backend": "hashing",
+    }
+    report = Backtester(config, holding_days=1, step=3).run(
+        ["NVDA"], DATES[0], DATES[-1]
+    )
+
+    assert report["errors"] == []
+    assert report["runs"] == 3
+    assert calls
+    assert {vendor for vendor, _ in calls} == {"local"}
+    # The live part of the local news was skipped, get_fundamentals never offered
+    assert calls.count(("local", "get_news")) == 2 * 2 * report["runs"]
+    assert ("local", "get_fundamentals") not in calls
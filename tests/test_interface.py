@@ -0,0 +1,38 @@
+import threading
+
+from tradingagents.dataflows import interface
+
+release = threading.Event()
+
+
+def hanging(symbol):
+    release.wait(5)
+    return "late data"
+
+
+def failing(symbol):
+    return "Error retrieving data: rate limited"
+
+
+def working(symbol):
+    return f"{symbol} data"
+
+
+def test_hanging_vendor_is_skipped_after_its_timeout(monkeypatch):
+    monkeypatch.setitem(
+        interface.VENDOR_METHODS,
+        "get_stock_data",
+        {"a": hanging, "b": failing, "c": working},
+    )
+    try:
+        race = interface.run_vendors_concurrently(
+            "get_stock_data", "core_stock_apis", ["a", "b", "c"], "race", 0.2, "NVDA"
+        )
+        gather = interface.run_vendors_concurrently(
+            "get_stock_data", "core_stock_apis", ["a", "b", "c"], "gather", 0.2, "NVDA"
+        )
+    finally:
+        release.set()
+
+    assert race == ["NVDA data"]
+    assert gather == ["Error retrieving data: rate limited", "NVDA data"]
@@ -0,0 +1,113 @@
+import itertools
+from datetime import datetime, timedelta
+from typing import Any, List
+
+import pytest
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, HumanMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from langchain_core.tools import tool
+
+from tradingagents.default_config import DEFAULT_CONFIG
+from tradingagents.graph.llm_recording import (
+    LLMRecordingStore,
+    RecordingChatModel,
+    ReplayOnlyChatModel,
+)
+
+_retrievals = itertools.count()
+
+
+@tool
+def get_prices(symbol: str) -> str:
+    """Price history of a symbol."""
+    # Like the yfinance tools: the header changes on every call, the data doesn't
+    retrieved = datetime(2025, 1, 1) + timedelta(seconds=next(_retrievals))
+    header = f"# Stock data for {symbol}\n"
+    header += f"# Data retrieved on: {retrieved.strftime('%Y-%m-%d %H:%M:%S')}\n\n"
+    return header + "Date,Close\n2025-01-02,100.0\n"
+
+
+class ScriptedChatModel(BaseChatModel):
+    """Answers with a tool call first, then with a report."""
+
+    calls: List[Any] = []
+
+    @property
+    def _llm_type(self) -> str:
+        return "scripted"
+
+    def bind_tools(self, tools, **kwargs):
+        return self.bind(tools=[t.name for t in tools], **kwargs)
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        self.calls.append(kwargs)
+        if messages[-1].type == "tool":
+            message = AIMessage(content="Report: close at 100.0")
+        else:
+            message = AIMessage(
+                content="",
+                tool_calls=[
+                    {"name": "get_prices", "args": {"symbol": "NVDA"}, "id": "call_1"}
+                ],
+            )
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+
+def run_analyst(llm):
+    """One analyst turn: a tool call, the tool's output, then the report."""
+    messages = [HumanMessage(content="Analyze NVDA")]
+    chain = llm.bind_tools([get_prices])
+    response = chain.invoke(messages)
+    messages += [response, get_prices.invoke(response.tool_calls[0])]
+    return chain.invoke(messages).content
+
+
+def test_replay_matches_tool_turns_with_volatile_output(tmp_path):
+    store = LLMRecordingStore(str(tmp_path / "recordings.sqlite"))
+    model = ScriptedChatModel()
+    recorder = RecordingChatModel(
+        llm=model, store=store, mode="record", model_id="openai:gpt-4o-mini"
+    )
+    recorded = run_analyst(recorder)
+
+    # The provider-formatted tools reach the model, the key's schemas don't
+    assert [call.get("tools") for call in model.calls] == [["get_prices"]] * 2
+    assert all("recorded_tools" not in call for call in model.calls)
+
+    # Replay needs no provider model, only the same model id
+    replayer = RecordingChatModel(
+        llm=ReplayOnlyChatModel(model="gpt-4o-mini"),
+        store=store,
+        mode="replay",
+        model_id="openai:gpt-4o-mini",
+    )
+    assert run_analyst(replayer) == recorded == "Report: close at 100.0"
+
+
+def test_replay_miss_raises(tmp_path):
+    replayer = RecordingChatModel(
+        llm=ReplayOnlyChatModel(model="gpt-4o-mini"),
+        store=LLMRecordingStore(str(tmp_path / "recordings.sqlite")),
+        mode="replay",
+        model_id="openai:gpt-4o-mini",
+    )
+    with pytest.raises(LookupError):
+        replayer.invoke("Analyze NVDA")
+
+
+def test_replay_graph_needs_no_provider_clients(tmp_path, monkeypatch):
+    from tradingagents.graph.trading_graph import TradingAgentsGraph
+
+    for key in ("OPENAI_API_KEY", "ANTHROPIC_API_KEY", "GOOGLE_API_KEY"):
+        monkeypatch.delenv(key, raising=False)
+    config = {
+        **DEFAULT_CONFIG,
+        "data_cache_dir": str(tmp_path),
+        "llm_recording": {"mode": "replay", "path": None},
+    }
+    graph = TradingAgentsGraph(config=config)
+
+    assert isinstance(graph.deep_thinking_llm.llm, ReplayOnlyChatModel)
+    assert isinstance(graph.quick_thinking_llm.llm, ReplayOnlyChatModel)
+    assert graph.bull_memory.get_memories("NVDA rallies on earnings") == []
@@ -0,0 +1,38 @@
+import pandas as pd
+
+from tradingagents.dataflows import config, y_finance
+from tradingagents.dataflows.price_cache import HISTORY_COLUMNS, price_cache_path
+
+
+class FakeTicker:
+    requests = []
+
+    def __init__(self, symbol):
+        self.symbol = symbol
+
+    def history(self, start, end):
+        self.requests.append((self.symbol, start, end))
+        index = pd.DatetimeIndex(pd.bdate_range(start, end, inclusive="left"), name="Date")
+        return pd.DataFrame({"Close": 1.0}, index=index)
+
+
+def test_online_prices_before_cached_window_are_downloaded(tmp_path, monkeypatch):
+    monkeypatch.setattr(
+        config, "_config", {**config.get_config(), "data_cache_dir": str(tmp_path)}
+    )
+    monkeypatch.setattr(y_finance.yf, "Ticker", FakeTicker)
+
+    # Written now, so the cache counts as refreshed today and is not downloaded
+    dates = pd.bdate_range("2012-01-02", "2012-03-30").strftime("%Y-%m-%d")
+    cached = pd.DataFrame({column: 2.0 for column in HISTORY_COLUMNS[1:]}, index=dates)
+    cached.rename_axis("Date").reset_index().to_csv(price_cache_path("NVDA"), index=False)
+
+    # Inside the cached window: served from the cache
+    result = y_finance.get_YFin_data_online("NVDA", "2012-02-01", "2012-03-01")
+    assert FakeTicker.requests == []
+    assert "# Total records: 21" in result
+
+    # Starting before the first cached bar: downloaded in full, not truncated
+    result = y_finance.get_YFin_data_online("NVDA", "2011-12-01", "2012-03-01")
+    assert FakeTicker.requests == [("NVDA", "2011-12-01", "2012-03-01")]
+    assert "2011-12-01" in result
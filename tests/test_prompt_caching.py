@@ -0,0 +1,75 @@
+import json
+
+import httpx
+from langchain_core.runnables import RunnableLambda
+from langchain_openai import ChatOpenAI
+
+from tradingagents.graph.prompt_caching import PromptCachingChatModel
+
+COMPLETION = {
+    "id": "chatcmpl-1",
+    "object": "chat.completion",
+    "created": 0,
+    "model": "gpt-4o-mini",
+    "choices": [
+        {
+            "index": 0,
+            "message": {"role": "assistant", "content": "ok"},
+            "finish_reason": "stop",
+        }
+    ],
+    "usage": {"prompt_tokens": 10, "completion_tokens": 1, "total_tokens": 11},
+}
+
+
+class PayloadRecordingChatOpenAI(ChatOpenAI):
+    """ChatOpenAI that records the keyword arguments it passes to create()."""
+
+    payloads: list = []
+
+    def _get_request_payload(self, input_, *, stop=None, **kwargs):
+        payload = super()._get_request_payload(input_, stop=stop, **kwargs)
+        self.payloads.append(payload)
+        return payload
+
+
+def recording_chat_openai(requests):
+    def handler(request):
+        requests.append(json.loads(request.content))
+        return httpx.Response(200, json=COMPLETION)
+
+    return PayloadRecordingChatOpenAI(
+        model="gpt-4o-mini",
+        api_key="test",
+        payloads=[],
+        http_client=httpx.Client(transport=httpx.MockTransport(handler)),
+    )
+
+
+def test_openai_cache_parameters_reach_the_request_body():
+    requests = []
+    inner = recording_chat_openai(requests)
+    llm = PromptCachingChatModel(llm=inner, provider="openai", cache_retention="24h")
+
+    node = RunnableLambda(lambda _: llm.invoke([("system", "static"), ("human", "AAPL")]))
+    result = node.invoke(None, config={"metadata": {"langgraph_node": "Market Analyst"}})
+
+    assert result.content == "ok"
+    # openai==1.86 (uv.lock) rejects them as keyword arguments of create()
+    assert "prompt_cache_key" not in inner.payloads[0]
+    assert "prompt_cache_retention" not in inner.payloads[0]
+    assert requests[0]["prompt_cache_key"] == "tradingagents-Market Analyst"
+    assert requests[0]["prompt_cache_retention"] == "24h"
+    assert requests[0]["messages"][0] == {"role": "system", "content": "static"}
+
+
+def test_openai_cache_parameters_keep_configured_extra_body():
+    requests = []
+    inner = recording_chat_openai(requests)
+    inner.extra_body = {"user": "backtest"}
+    llm = PromptCachingChatModel(llm=inner, provider="openai")
+
+    llm.invoke([("system", "static"), ("human", "AAPL")])
+
+    assert requests[0]["user"] == "backtest"
+    assert requests[0]["prompt_cache_key"] == "tradingagents-default"
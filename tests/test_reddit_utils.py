@@ -0,0 +1,49 @@
+import json
+import sqlite3
+from datetime import datetime, timezone
+
+from tradingagents.dataflows import config
+from tradingagents.dataflows.reddit_utils import fetch_top_from_category_range
+
+TITLES = [
+    "Visa beats earnings estimates",
+    "$V breaks out to a new high",
+    "Is V still a buy?",
+    "Vitamins are a great business",
+    "v is for vendetta",
+    "Swapped in a V8 engine",
+    "Nvidia guidance raised",
+]
+
+
+def write_posts(path):
+    created = datetime(2024, 1, 5, 12, tzinfo=timezone.utc).timestamp()
+    with open(path, "w") as f:
+        for i, title in enumerate(TITLES):
+            post = {
+                "title": title,
+                "selftext": "",
+                "url": f"https://reddit.com/{i}",
+                "ups": 100 - i,
+                "created_utc": created,
+            }
+            f.write(json.dumps(post) + "\n")
+
+
+def test_company_news_matches_short_tickers_as_words_and_indexes_lazily(
+    tmp_path, monkeypatch
+):
+    monkeypatch.setattr(
+        config, "_config", {**config.get_config(), "data_cache_dir": str(tmp_path)}
+    )
+    (tmp_path / "reddit" / "company_news").mkdir(parents=True)
+    write_posts(tmp_path / "reddit" / "company_news" / "stocks.jsonl")
+
+    posts = fetch_top_from_category_range(
+        "company_news", "2024-01-05", "2024-01-05", 10, "V", str(tmp_path / "reddit")
+    )
+
+    assert [post["title"] for post in posts] == TITLES[:3]
+    with sqlite3.connect(tmp_path / "reddit_index.sqlite") as conn:
+        indexed = conn.execute("SELECT ticker FROM mention_terms").fetchall()
+    assert indexed == [("V",)]
@@ -0,0 +1,26 @@
+import pandas as pd
+
+from tradingagents.dataflows.stockstats_utils import StockstatsFrameCache
+
+
+def test_duplicate_indicators_give_one_column_each(tmp_path):
+    dates = pd.bdate_range("2024-01-01", periods=30).strftime("%Y-%m-%d")
+    prices = pd.DataFrame(
+        {
+            "Date": dates,
+            "Open": range(30),
+            "High": range(1, 31),
+            "Low": range(30),
+            "Close": range(30),
+            "Volume": 1000,
+        }
+    )
+
+    frame = StockstatsFrameCache().get_indicators(
+        "NVDA",
+        str(tmp_path / "NVDA.csv"),
+        lambda: prices.copy(),
+        ["rsi", "close_10_sma", "rsi"],
+    )
+
+    assert list(frame.columns) == ["Date", "rsi", "close_10_sma"]
@@ -1,22 +1,25 @@
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
+from langchain_core.runnables import RunnableLambda
 import time
 import json
-from tradingagents.agents.utils.agent_utils import get_fundamentals, get_balance_sheet, get_cashflow, get_income_statement, get_insider_sentiment, get_insider_transactions
+from tradingagents.agents.utils.agent_utils import available_tools, get_fundamentals, get_balance_sheet, get_cashflow, get_income_statement, get_insider_sentiment, get_insider_transactions
 from tradingagents.dataflows.config import get_config
 
 
 def create_fundamentals_analyst(llm):
-    def fundamentals_analyst_node(state):
+    def build_chain(state):
         current_date = state["trade_date"]
         ticker = state["company_of_interest"]
         company_name = state["company_of_interest"]
 
-        tools = [
-            get_fundamentals,
-            get_balance_sheet,
-            get_cashflow,
-            get_income_statement,
-        ]
+        tools = available_tools(
+            [
+                get_fundamentals,
+                get_balance_sheet,
+                get_cashflow,
+                get_income_statement,
+            ]
+        )
 
         system_message = (
             "Sie sind ein Forscher mit der Aufgabe, fundamentale Informationen der letzten Woche über ein Unternehmen zu analysieren. Bitte schreiben Sie einen umfassenden Bericht über die fundamentalen Informationen des Unternehmens wie Finanzdokumente, Unternehmensprofil, grundlegende Unternehmensfinanzen und Unternehmensfinanzgeschichte, um einen vollständigen Überblick über die fundamentalen Informationen des Unternehmens zu erhalten, um Händler zu informieren. Achten Sie darauf, so viele Details wie möglich einzubeziehen. Sagen Sie nicht einfach, die Trends seien gemischt, sondern liefern Sie detaillierte und feingranulare Analysen und Einblicke, die Händlern bei Entscheidungen helfen können."
@@ -34,7 +37,10 @@ def create_fundamentals_analyst(llm):
                     " wird dort weitermachen, wo Sie aufgehört haben. Führen Sie aus, was Sie können, um Fortschritte zu erzielen."
                     " Wenn Sie oder ein anderer Assistent den FINALEN TRANSAKTIONSVORSCHLAG: **KAUFEN/HALTEN/VERKAUFEN** oder das Ergebnis hat,"
                     " stellen Sie Ihrer Antwort FINALER TRANSAKTIONSVORSCHLAG: **KAUFEN/HALTEN/VERKAUFEN** voran, damit das Team weiß, dass es aufhören muss."
-                    " Sie haben Zugriff auf die folgenden Tools: {tool_names}.\n{system_message}"
+                    " Sie haben Zugriff auf die folgenden Tools: {tool_names}.\n{system_message}",
+                ),
+                (
+                    "human",
                     "Zu Ihrer Information, das aktuelle Datum ist {current_date}. Das Unternehmen, das wir betrachten möchten, ist {ticker}",
                 ),
                 MessagesPlaceholder(variable_name="messages"),
@@ -46,10 +52,9 @@ def create_fundamentals_analyst(llm):
         prompt = prompt.partial(current_date=current_date)
         prompt = prompt.partial(ticker=ticker)
 
-        chain = prompt | llm.bind_tools(tools)
-
-        result = chain.invoke(state["messages"])
+        return prompt | llm.bind_tools(tools)
 
+    def build_update(result):
         report = ""
 
         if len(result.tool_calls) == 0:
@@ -60,4 +65,12 @@ def create_fundamentals_analyst(llm):
             "fundamentals_report": report,
         }
 
-    return fundamentals_analyst_node
+    def fundamentals_analyst_node(state):
+        result = build_chain(state).invoke(state["messages"])
+        return build_update(result)
+
+    async def afundamentals_analyst_node(state):
+        result = await build_chain(state).ainvoke(state["messages"])
+        return build_update(result)
+
+    return RunnableLambda(fundamentals_analyst_node, afunc=afundamentals_analyst_node)
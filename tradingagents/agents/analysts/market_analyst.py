@@ -1,21 +1,24 @@
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
+from langchain_core.runnables import RunnableLambda
 import time
 import json
-from tradingagents.agents.utils.agent_utils import get_stock_data, get_indicators
+from tradingagents.agents.utils.agent_utils import available_tools, get_stock_data, get_indicators
 from tradingagents.dataflows.config import get_config
 
 
 def create_market_analyst(llm):
 
-    def market_analyst_node(state):
+    def build_chain(state):
         current_date = state["trade_date"]
         ticker = state["company_of_interest"]
         company_name = state["company_of_interest"]
 
-        tools = [
-            get_stock_data,
-            get_indicators,
-        ]
+        tools = available_tools(
+            [
+                get_stock_data,
+                get_indicators,
+            ]
+        )
 
         system_message = (
             """Sie sind ein Trading-Assistent mit der Aufgabe, Finanzmärkte zu analysieren. Ihre Rolle besteht darin, die **relevantesten Indikatoren** für eine bestimmte Marktsituation oder Handelsstrategie aus der folgenden Liste auszuwählen. Ziel ist es, bis zu **8 Indikatoren** zu wählen, die sich ergänzende Einblicke bieten, ohne Redundanz. Kategorien und die Indikatoren jeder Kategorie sind:
@@ -56,7 +59,10 @@ Volumenbasierte Indikatoren:
                     " wird dort weitermachen, wo Sie aufgehört haben. Führen Sie aus, was Sie können, um Fortschritte zu erzielen."
                     " Wenn Sie oder ein anderer Assistent den FINALEN TRANSAKTIONSVORSCHLAG: **KAUFEN/HALTEN/VERKAUFEN** oder das Ergebnis hat,"
                     " stellen Sie Ihrer Antwort FINALER TRANSAKTIONSVORSCHLAG: **KAUFEN/HALTEN/VERKAUFEN** voran, damit das Team weiß, dass es aufhören muss."
-                    " Sie haben Zugriff auf die folgenden Tools: {tool_names}.\n{system_message}"
+                    " Sie haben Zugriff auf die folgenden Tools: {tool_names}.\n{system_message}",
+                ),
+                (
+                    "human",
                     "Zu Ihrer Information, das aktuelle Datum ist {current_date}. Das Unternehmen, das wir betrachten möchten, ist {ticker}",
                 ),
                 MessagesPlaceholder(variable_name="messages"),
@@ -68,18 +74,25 @@ Volumenbasierte Indikatoren:
         prompt = prompt.partial(current_date=current_date)
         prompt = prompt.partial(ticker=ticker)
 
-        chain = prompt | llm.bind_tools(tools)
-
-        result = chain.invoke(state["messages"])
+        return prompt | llm.bind_tools(tools)
 
+    def build_update(result):
         report = ""
 
         if len(result.tool_calls) == 0:
             report = result.content
-       
+
         return {
             "messages": [result],
             "market_report": report,
         }
 
-    return market_analyst_node
+    def market_analyst_node(state):
+        result = build_chain(state).invoke(state["messages"])
+        return build_update(result)
+
+    async def amarket_analyst_node(state):
+        result = await build_chain(state).ainvoke(state["messages"])
+        return build_update(result)
+
+    return RunnableLambda(market_analyst_node, afunc=amarket_analyst_node)
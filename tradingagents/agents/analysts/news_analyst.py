@@ -1,19 +1,22 @@
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
+from langchain_core.runnables import RunnableLambda
 import time
 import json
-from tradingagents.agents.utils.agent_utils import get_news, get_global_news
+from tradingagents.agents.utils.agent_utils import available_tools, get_news, get_global_news
 from tradingagents.dataflows.config import get_config
 
 
 def create_news_analyst(llm):
-    def news_analyst_node(state):
+    def build_chain(state):
         current_date = state["trade_date"]
         ticker = state["company_of_interest"]
 
-        tools = [
-            get_news,
-            get_global_news,
-        ]
+        tools = available_tools(
+            [
+                get_news,
+                get_global_news,
+            ]
+        )
 
         system_message = (
             "Sie sind ein Nachrichtenforscher mit der Aufgabe, aktuelle Nachrichten und Trends der letzten Woche zu analysieren. Bitte schreiben Sie einen umfassenden Bericht über den aktuellen Zustand der Welt, der für Trading und Makroökonomie relevant ist. Verwenden Sie die verfügbaren Tools: get_news(query, start_date, end_date) für unternehmensspezifische oder gezielte Nachrichtensuchen, und get_global_news(curr_date, look_back_days, limit) für breitere makroökonomische Nachrichten. Sagen Sie nicht einfach, die Trends seien gemischt, sondern liefern Sie detaillierte und feingranulare Analysen und Einblicke, die Händlern bei Entscheidungen helfen können."
@@ -30,7 +33,10 @@ def create_news_analyst(llm):
                     " wird dort weitermachen, wo Sie aufgehört haben. Führen Sie aus, was Sie können, um Fortschritte zu erzielen."
                     " Wenn Sie oder ein anderer Assistent den FINALEN TRANSAKTIONSVORSCHLAG: **KAUFEN/HALTEN/VERKAUFEN** oder das Ergebnis hat,"
                     " stellen Sie Ihrer Antwort FINALER TRANSAKTIONSVORSCHLAG: **KAUFEN/HALTEN/VERKAUFEN** voran, damit das Team weiß, dass es aufhören muss."
-                    " Sie haben Zugriff auf die folgenden Tools: {tool_names}.\n{system_message}"
+                    " Sie haben Zugriff auf die folgenden Tools: {tool_names}.\n{system_message}",
+                ),
+                (
+                    "human",
                     "Zu Ihrer Information, das aktuelle Datum ist {current_date}. Wir betrachten das Unternehmen {ticker}",
                 ),
                 MessagesPlaceholder(variable_name="messages"),
@@ -42,9 +48,9 @@ def create_news_analyst(llm):
         prompt = prompt.partial(current_date=current_date)
         prompt = prompt.partial(ticker=ticker)
 
-        chain = prompt | llm.bind_tools(tools)
-        result = chain.invoke(state["messages"])
+        return prompt | llm.bind_tools(tools)
 
+    def build_update(result):
         report = ""
 
         if len(result.tool_calls) == 0:
@@ -55,4 +61,12 @@ def create_news_analyst(llm):
             "news_report": report,
         }
 
-    return news_analyst_node
+    def news_analyst_node(state):
+        result = build_chain(state).invoke(state["messages"])
+        return build_update(result)
+
+    async def anews_analyst_node(state):
+        result = await build_chain(state).ainvoke(state["messages"])
+        return build_update(result)
+
+    return RunnableLambda(news_analyst_node, afunc=anews_analyst_node)
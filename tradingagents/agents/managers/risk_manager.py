@@ -1,9 +1,13 @@
 import time
 import json
+from langchain_core.runnables import RunnableLambda
 
 
 def create_risk_manager(llm, memory):
-    def risk_manager_node(state) -> dict:
+    def get_situation(state):
+        return f"{state['market_report']}\n\n{state['sentiment_report']}\n\n{state['news_report']}\n\n{state['fundamentals_report']}"
+
+    def build_prompt(state, past_memories):
 
         company_name = state["company_of_interest"]
 
@@ -15,35 +19,37 @@ def create_risk_manager(llm, memory):
         sentiment_report = state["sentiment_report"]
         trader_plan = state["investment_plan"]
 
-        curr_situation = f"{market_research_report}\n\n{sentiment_report}\n\n{news_report}\n\n{fundamentals_report}"
-        past_memories = memory.get_memories(curr_situation, n_matches=2)
-
         past_memory_str = ""
         for i, rec in enumerate(past_memories, 1):
             past_memory_str += rec["recommendation"] + "\n\n"
 
-        prompt = f"""Als Risikomanagement-Richter und Debattenleiter ist es Ihr Ziel, die Debatte zwischen drei Risikoanalysten – Risikoreich, Neutral und Sicher/Konservativ – zu bewerten und den besten Handlungsweg für den Händler zu bestimmen. Ihre Entscheidung muss zu einer klaren Empfehlung führen: Kaufen, Verkaufen oder Halten. Wählen Sie Halten nur, wenn dies durch spezifische Argumente stark gerechtfertigt ist, nicht als Rückfallebene, wenn alle Seiten gültig erscheinen. Streben Sie nach Klarheit und Entscheidungsfreudigkeit.
+        system_prompt = """Als Risikomanagement-Richter und Debattenleiter ist es Ihr Ziel, die Debatte zwischen drei Risikoanalysten – Risikoreich, Neutral und Sicher/Konservativ – zu bewerten und den besten Handlungsweg für den Händler zu bestimmen. Ihre Entscheidung muss zu einer klaren Empfehlung führen: Kaufen, Verkaufen oder Halten. Wählen Sie Halten nur, wenn dies durch spezifische Argumente stark gerechtfertigt ist, nicht als Rückfallebene, wenn alle Seiten gültig erscheinen. Streben Sie nach Klarheit und Entscheidungsfreudigkeit.
 
 Richtlinien für die Entscheidungsfindung:
 1. **Zusammenfassung der Schlüsselargumente**: Extrahieren Sie die stärksten Punkte jedes Analysten und konzentrieren Sie sich auf die Relevanz für den Kontext.
 2. **Begründung liefern**: Unterstützen Sie Ihre Empfehlung mit direkten Zitaten und Gegenargumenten aus der Debatte.
-3. **Plan des Händlers verfeinern**: Beginnen Sie mit dem ursprünglichen Plan des Händlers, **{trader_plan}**, und passen Sie ihn basierend auf den Erkenntnissen der Analysten an.
-4. **Aus vergangenen Fehlern lernen**: Nutzen Sie Lektionen aus **{past_memory_str}**, um frühere Fehleinschätzungen anzugehen und die Entscheidung, die Sie jetzt treffen, zu verbessern, um sicherzustellen, dass Sie keinen falschen KAUFEN/VERKAUFEN/HALTEN-Aufruf tätigen, der Geld verliert.
+3. **Plan des Händlers verfeinern**: Beginnen Sie mit dem ursprünglichen Plan des Händlers und passen Sie ihn basierend auf den Erkenntnissen der Analysten an.
+4. **Aus vergangenen Fehlern lernen**: Nutzen Sie die Lektionen aus Ihren vergangenen Reflexionen, um frühere Fehleinschätzungen anzugehen und die Entscheidung, die Sie jetzt treffen, zu verbessern, um sicherzustellen, dass Sie keinen falschen KAUFEN/VERKAUFEN/HALTEN-Aufruf tätigen, der Geld verliert.
 
 Ergebnisse:
 - Eine klare und umsetzbare Empfehlung: Kaufen, Verkaufen oder Halten.
 - Detaillierte Begründung, die in der Debatte und vergangenen Reflexionen verankert ist.
+- Schließen Sie Ihre Antwort immer mit 'FINALER TRANSAKTIONSVORSCHLAG: **KAUFEN/HALTEN/VERKAUFEN**' ab, um Ihre Empfehlung zu bestätigen.
 
----
+Konzentrieren Sie sich auf umsetzbare Erkenntnisse und kontinuierliche Verbesserung. Bauen Sie auf vergangenen Lektionen auf, bewerten Sie alle Perspektiven kritisch und stellen Sie sicher, dass jede Entscheidung bessere Ergebnisse vorantreibt."""
 
-**Debattenverlauf der Analysten:**  
-{history}
+        prompt = f"""**Ursprünglicher Plan des Händlers:** {trader_plan}
+
+**Lektionen aus vergangenen Reflexionen:** {past_memory_str}
 
 ---
 
-Konzentrieren Sie sich auf umsetzbare Erkenntnisse und kontinuierliche Verbesserung. Bauen Sie auf vergangenen Lektionen auf, bewerten Sie alle Perspektiven kritisch und stellen Sie sicher, dass jede Entscheidung bessere Ergebnisse vorantreibt."""
+**Debattenverlauf der Analysten:**  
+{history}"""
+        return [("system", system_prompt), ("human", prompt)]
 
-        response = llm.invoke(prompt)
+    def build_update(state, response):
+        risk_debate_state = state["risk_debate_state"]
 
         new_risk_debate_state = {
             "judge_decision": response.content,
@@ -63,4 +69,14 @@ Konzentrieren Sie sich auf umsetzbare Erkenntnisse und kontinuierliche Verbesser
             "final_trade_decision": response.content,
         }
 
-    return risk_manager_node
+    def risk_manager_node(state) -> dict:
+        past_memories = memory.get_memories(get_situation(state), n_matches=2)
+        response = llm.invoke(build_prompt(state, past_memories))
+        return build_update(state, response)
+
+    async def arisk_manager_node(state) -> dict:
+        past_memories = await memory.aget_memories(get_situation(state), n_matches=2)
+        response = await llm.ainvoke(build_prompt(state, past_memories))
+        return build_update(state, response)
+
+    return RunnableLambda(risk_manager_node, afunc=arisk_manager_node)
@@ -1,28 +1,33 @@
 from langchain_core.messages import AIMessage
 import time
 import json
+from langchain_core.runnables import RunnableLambda
 
+from tradingagents.agents.utils.debate_context import DebateContext
+from tradingagents.agents.utils.report_distiller import report_for_prompt
 
-def create_bear_researcher(llm, memory):
-    def bear_node(state) -> dict:
+
+def create_bear_researcher(llm, memory, debate_context=None):
+    debate_context = debate_context or DebateContext(llm)
+
+    def get_situation(state):
+        return f"{state['market_report']}\n\n{state['sentiment_report']}\n\n{state['news_report']}\n\n{state['fundamentals_report']}"
+
+    def build_prompt(state, past_memories, history):
         investment_debate_state = state["investment_debate_state"]
-        history = investment_debate_state.get("history", "")
         bear_history = investment_debate_state.get("bear_history", "")
 
         current_response = investment_debate_state.get("current_response", "")
-        market_research_report = state["market_report"]
-        sentiment_report = state["sentiment_report"]
-        news_report = state["news_report"]
-        fundamentals_report = state["fundamentals_report"]
-
-        curr_situation = f"{market_research_report}\n\n{sentiment_report}\n\n{news_report}\n\n{fundamentals_report}"
-        past_memories = memory.get_memories(curr_situation, n_matches=2)
+        market_research_report = report_for_prompt(state, "market")
+        sentiment_report = report_for_prompt(state, "sentiment")
+        news_report = report_for_prompt(state, "news")
+        fundamentals_report = report_for_prompt(state, "fundamentals")
 
         past_memory_str = ""
         for i, rec in enumerate(past_memories, 1):
             past_memory_str += rec["recommendation"] + "\n\n"
 
-        prompt = f"""Sie sind ein Bären-Analyst, der den Fall gegen Investitionen in die Aktie vorbringt. Ihr Ziel ist es, ein gut begründetes Argument zu präsentieren, das Risiken, Herausforderungen und negative Indikatoren betont. Nutzen Sie die bereitgestellten Forschungsergebnisse und Daten, um potenzielle Nachteile hervorzuheben und bullische Argumente effektiv zu kontern.
+        system_prompt = """Sie sind ein Bären-Analyst, der den Fall gegen Investitionen in die Aktie vorbringt. Ihr Ziel ist es, ein gut begründetes Argument zu präsentieren, das Risiken, Herausforderungen und negative Indikatoren betont. Nutzen Sie die bereitgestellten Forschungsergebnisse und Daten, um potenzielle Nachteile hervorzuheben und bullische Argumente effektiv zu kontern.
 
 Wichtige Punkte, auf die Sie sich konzentrieren sollten:
 
@@ -32,19 +37,22 @@ Wichtige Punkte, auf die Sie sich konzentrieren sollten:
 - Bull-Gegenargumente: Analysieren Sie das Bull-Argument kritisch mit spezifischen Daten und fundierter Argumentation, legen Sie Schwächen oder übermäßig optimistische Annahmen offen.
 - Engagement: Präsentieren Sie Ihr Argument in einem gesprächigen Stil, gehen Sie direkt auf die Punkte des Bull-Analysten ein und debattieren Sie effektiv, anstatt einfach nur Fakten aufzulisten.
 
-Verfügbare Ressourcen:
+Verwenden Sie die bereitgestellten Ressourcen, um ein überzeugendes Bärenargument zu liefern, die Behauptungen des Bulls zu widerlegen und eine dynamische Debatte zu führen, die die Risiken und Schwächen einer Investition in die Aktie demonstriert. Sie müssen auch Reflexionen ansprechen und aus Lektionen und Fehlern lernen, die Sie in der Vergangenheit gemacht haben."""
 
+        prompt = f"""Verfügbare Ressourcen:
 Marktforschungsbericht: {market_research_report}
 Social-Media-Sentiment-Bericht: {sentiment_report}
 Aktuelle Weltnachrichten: {news_report}
 Unternehmensfundamentalbericht: {fundamentals_report}
-Gesprächsverlauf der Debatte: {history}
-Letztes Bull-Argument: {current_response}
 Reflexionen aus ähnlichen Situationen und gelernte Lektionen: {past_memory_str}
-Verwenden Sie diese Informationen, um ein überzeugendes Bärenargument zu liefern, die Behauptungen des Bulls zu widerlegen und eine dynamische Debatte zu führen, die die Risiken und Schwächen einer Investition in die Aktie demonstriert. Sie müssen auch Reflexionen ansprechen und aus Lektionen und Fehlern lernen, die Sie in der Vergangenheit gemacht haben.
-"""
+Gesprächsverlauf der Debatte: {history}
+Letztes Bull-Argument: {current_response}"""
+        return [("system", system_prompt), ("human", prompt)]
 
-        response = llm.invoke(prompt)
+    def build_update(state, response, context_update):
+        investment_debate_state = state["investment_debate_state"]
+        history = investment_debate_state.get("history", "")
+        bear_history = investment_debate_state.get("bear_history", "")
 
         argument = f"Bear Analyst: {response.content}"
 
@@ -54,8 +62,21 @@ Verwenden Sie diese Informationen, um ein überzeugendes Bärenargument zu liefe
             "bull_history": investment_debate_state.get("bull_history", ""),
             "current_response": argument,
             "count": investment_debate_state["count"] + 1,
+            **debate_context.update(investment_debate_state, argument, context_update),
         }
 
         return {"investment_debate_state": new_investment_debate_state}
 
-    return bear_node
+    def bear_node(state) -> dict:
+        past_memories = memory.get_memories(get_situation(state), n_matches=2)
+        history, context_update = debate_context.build(state["investment_debate_state"])
+        response = llm.invoke(build_prompt(state, past_memories, history))
+        return build_update(state, response, context_update)
+
+    async def abear_node(state) -> dict:
+        past_memories = await memory.aget_memories(get_situation(state), n_matches=2)
+        history, context_update = await debate_context.abuild(state["investment_debate_state"])
+        response = await llm.ainvoke(build_prompt(state, past_memories, history))
+        return build_update(state, response, context_update)
+
+    return RunnableLambda(bear_node, afunc=abear_node)
@@ -1,28 +1,33 @@
 from langchain_core.messages import AIMessage
 import time
 import json
+from langchain_core.runnables import RunnableLambda
 
+from tradingagents.agents.utils.debate_context import DebateContext
+from tradingagents.agents.utils.report_distiller import report_for_prompt
 
-def create_bull_researcher(llm, memory):
-    def bull_node(state) -> dict:
+
+def create_bull_researcher(llm, memory, debate_context=None):
+    debate_context = debate_context or DebateContext(llm)
+
+    def get_situation(state):
+        return f"{state['market_report']}\n\n{state['sentiment_report']}\n\n{state['news_report']}\n\n{state['fundamentals_report']}"
+
+    def build_prompt(state, past_memories, history):
         investment_debate_state = state["investment_debate_state"]
-        history = investment_debate_state.get("history", "")
         bull_history = investment_debate_state.get("bull_history", "")
 
         current_response = investment_debate_state.get("current_response", "")
-        market_research_report = state["market_report"]
-        sentiment_report = state["sentiment_report"]
-        news_report = state["news_report"]
-        fundamentals_report = state["fundamentals_report"]
-
-        curr_situation = f"{market_research_report}\n\n{sentiment_report}\n\n{news_report}\n\n{fundamentals_report}"
-        past_memories = memory.get_memories(curr_situation, n_matches=2)
+        market_research_report = report_for_prompt(state, "market")
+        sentiment_report = report_for_prompt(state, "sentiment")
+        news_report = report_for_prompt(state, "news")
+        fundamentals_report = report_for_prompt(state, "fundamentals")
 
         past_memory_str = ""
         for i, rec in enumerate(past_memories, 1):
             past_memory_str += rec["recommendation"] + "\n\n"
 
-        prompt = f"""Sie sind ein Bull-Analyst, der für Investitionen in die Aktie plädiert. Ihre Aufgabe ist es, einen starken, evidenzbasierten Fall aufzubauen, der Wachstumspotenzial, Wettbewerbsvorteile und positive Marktindikatoren betont. Nutzen Sie die bereitgestellten Forschungsergebnisse und Daten, um Bedenken anzusprechen und bärische Argumente effektiv zu kontern.
+        system_prompt = """Sie sind ein Bull-Analyst, der für Investitionen in die Aktie plädiert. Ihre Aufgabe ist es, einen starken, evidenzbasierten Fall aufzubauen, der Wachstumspotenzial, Wettbewerbsvorteile und positive Marktindikatoren betont. Nutzen Sie die bereitgestellten Forschungsergebnisse und Daten, um Bedenken anzusprechen und bärische Argumente effektiv zu kontern.
 
 Wichtige Punkte, auf die Sie sich konzentrieren sollten:
 - Wachstumspotenzial: Heben Sie die Marktchancen, Umsatzprognosen und Skalierbarkeit des Unternehmens hervor.
@@ -31,18 +36,22 @@ Wichtige Punkte, auf die Sie sich konzentrieren sollten:
 - Bärische Gegenargumente: Analysieren Sie das Bärenargument kritisch mit spezifischen Daten und fundierter Argumentation, gehen Sie Bedenken gründlich an und zeigen Sie, warum die Bull-Perspektive stärkere Verdienste hat.
 - Engagement: Präsentieren Sie Ihr Argument in einem gesprächigen Stil, gehen Sie direkt auf die Punkte des Bärenanalysten ein und debattieren Sie effektiv, anstatt nur Daten aufzulisten.
 
-Verfügbare Ressourcen:
+Verwenden Sie die bereitgestellten Ressourcen, um ein überzeugendes Bull-Argument zu liefern, die Bedenken des Bären zu widerlegen und eine dynamische Debatte zu führen, die die Stärken der Bull-Position demonstriert. Sie müssen auch Reflexionen ansprechen und aus Lektionen und Fehlern lernen, die Sie in der Vergangenheit gemacht haben."""
+
+        prompt = f"""Verfügbare Ressourcen:
 Marktforschungsbericht: {market_research_report}
 Social-Media-Sentiment-Bericht: {sentiment_report}
 Aktuelle Weltnachrichten: {news_report}
 Unternehmensfundamentalbericht: {fundamentals_report}
-Gesprächsverlauf der Debatte: {history}
-Letztes Bärenargument: {current_response}
 Reflexionen aus ähnlichen Situationen und gelernte Lektionen: {past_memory_str}
-Verwenden Sie diese Informationen, um ein überzeugendes Bull-Argument zu liefern, die Bedenken des Bären zu widerlegen und eine dynamische Debatte zu führen, die die Stärken der Bull-Position demonstriert. Sie müssen auch Reflexionen ansprechen und aus Lektionen und Fehlern lernen, die Sie in der Vergangenheit gemacht haben.
-"""
+Gesprächsverlauf der Debatte: {history}
+Letztes Bärenargument: {current_response}"""
+        return [("system", system_prompt), ("human", prompt)]
 
-        response = llm.invoke(prompt)
+    def build_update(state, response, context_update):
+        investment_debate_state = state["investment_debate_state"]
+        history = investment_debate_state.get("history", "")
+        bull_history = investment_debate_state.get("bull_history", "")
 
         argument = f"Bull Analyst: {response.content}"
 
@@ -52,8 +61,21 @@ Verwenden Sie diese Informationen, um ein überzeugendes Bull-Argument zu liefer
             "bear_history": investment_debate_state.get("bear_history", ""),
             "current_response": argument,
             "count": investment_debate_state["count"] + 1,
+            **debate_context.update(investment_debate_state, argument, context_update),
         }
 
         return {"investment_debate_state": new_investment_debate_state}
 
-    return bull_node
+    def bull_node(state) -> dict:
+        past_memories = memory.get_memories(get_situation(state), n_matches=2)
+        history, context_update = debate_context.build(state["investment_debate_state"])
+        response = llm.invoke(build_prompt(state, past_memories, history))
+        return build_update(state, response, context_update)
+
+    async def abull_node(state) -> dict:
+        past_memories = await memory.aget_memories(get_situation(state), n_matches=2)
+        history, context_update = await debate_context.abuild(state["investment_debate_state"])
+        response = await llm.ainvoke(build_prompt(state, past_memories, history))
+        return build_update(state, response, context_update)
+
+    return RunnableLambda(bull_node, afunc=abull_node)
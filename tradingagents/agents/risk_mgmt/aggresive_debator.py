@@ -1,38 +1,49 @@
 import time
 import json
+from langchain_core.runnables import RunnableLambda
 
+from tradingagents.agents.utils.debate_context import DebateContext
+from tradingagents.agents.utils.report_distiller import report_for_prompt
 
-def create_risky_debator(llm):
-    def risky_node(state) -> dict:
+
+def create_risky_debator(llm, debate_context=None):
+    debate_context = debate_context or DebateContext(llm)
+
+    def build_prompt(state, history):
         risk_debate_state = state["risk_debate_state"]
-        history = risk_debate_state.get("history", "")
         risky_history = risk_debate_state.get("risky_history", "")
 
         current_safe_response = risk_debate_state.get("current_safe_response", "")
         current_neutral_response = risk_debate_state.get("current_neutral_response", "")
 
-        market_research_report = state["market_report"]
-        sentiment_report = state["sentiment_report"]
-        news_report = state["news_report"]
-        fundamentals_report = state["fundamentals_report"]
+        market_research_report = report_for_prompt(state, "market")
+        sentiment_report = report_for_prompt(state, "sentiment")
+        news_report = report_for_prompt(state, "news")
+        fundamentals_report = report_for_prompt(state, "fundamentals")
 
         trader_decision = state["trader_investment_plan"]
 
-        prompt = f"""Als Risiko-Analyst für hohe Risiken ist Ihre Aufgabe, aktiv für hochlohnende, risikoreiche Chancen einzutreten und mutige Strategien sowie Wettbewerbsvorteile zu betonen. Bei der Bewertung der Entscheidung oder des Plans des Händlers konzentrieren Sie sich intensiv auf das potenzielle Aufwärtspotenzial, Wachstumspotenzial und innovative Vorteile – selbst wenn diese mit erhöhtem Risiko einhergehen. Nutzen Sie die bereitgestellten Marktdaten und Sentiment-Analysen, um Ihre Argumente zu stärken und gegensätzliche Ansichten herauszufordern. Reagieren Sie speziell direkt auf jeden Punkt der konservativen und neutralen Analysten, indem Sie mit datengestützten Widerlegungen und überzeugender Argumentation kontern. Heben Sie hervor, wo ihre Vorsicht kritische Chancen verpassen könnte oder wo ihre Annahmen übermäßig konservativ sein könnten. Hier ist die Entscheidung des Händlers:
+        system_prompt = """Als Risiko-Analyst für hohe Risiken ist Ihre Aufgabe, aktiv für hochlohnende, risikoreiche Chancen einzutreten und mutige Strategien sowie Wettbewerbsvorteile zu betonen. Bei der Bewertung der Entscheidung oder des Plans des Händlers konzentrieren Sie sich intensiv auf das potenzielle Aufwärtspotenzial, Wachstumspotenzial und innovative Vorteile – selbst wenn diese mit erhöhtem Risiko einhergehen. Nutzen Sie die bereitgestellten Marktdaten und Sentiment-Analysen, um Ihre Argumente zu stärken und gegensätzliche Ansichten herauszufordern. Reagieren Sie speziell direkt auf jeden Punkt der konservativen und neutralen Analysten, indem Sie mit datengestützten Widerlegungen und überzeugender Argumentation kontern. Heben Sie hervor, wo ihre Vorsicht kritische Chancen verpassen könnte oder wo ihre Annahmen übermäßig konservativ sein könnten. Die Entscheidung des Händlers, die Berichte und der bisherige Gesprächsverlauf werden Ihnen in der folgenden Nachricht bereitgestellt.
 
-{trader_decision}
+Ihre Aufgabe ist es, einen überzeugenden Fall für die Entscheidung des Händlers zu erstellen, indem Sie die konservativen und neutralen Haltungen hinterfragen und kritisieren, um zu demonstrieren, warum Ihre Hochrendite-Perspektive den besten Weg nach vorne bietet. Integrieren Sie Erkenntnisse aus den bereitgestellten Berichten in Ihre Argumente. Wenn es keine Antworten von den anderen Standpunkten gibt, halluzinieren Sie nicht und präsentieren Sie einfach Ihren Punkt.
 
-Ihre Aufgabe ist es, einen überzeugenden Fall für die Entscheidung des Händlers zu erstellen, indem Sie die konservativen und neutralen Haltungen hinterfragen und kritisieren, um zu demonstrieren, warum Ihre Hochrendite-Perspektive den besten Weg nach vorne bietet. Integrieren Sie Erkenntnisse aus den folgenden Quellen in Ihre Argumente:
+Engagieren Sie sich aktiv, indem Sie auf spezifische Bedenken eingehen, Schwächen in ihrer Logik widerlegen und die Vorteile der Risikobereitschaft betonen, um Marktnormen zu übertreffen. Konzentrieren Sie sich auf Debattieren und Überzeugen, nicht nur auf das Präsentieren von Daten. Fordern Sie jeden Gegenpunkt heraus, um zu unterstreichen, warum ein hochriskanter Ansatz optimal ist. Geben Sie gesprächig aus, als würden Sie sprechen, ohne spezielle Formatierung."""
+
+        prompt = f"""Hier ist die Entscheidung des Händlers:
+
+{trader_decision}
 
 Marktforschungsbericht: {market_research_report}
 Social-Media-Sentiment-Bericht: {sentiment_report}
 Aktueller Weltgeschehensbericht: {news_report}
 Unternehmensfundamentalbericht: {fundamentals_report}
-Hier ist der aktuelle Gesprächsverlauf: {history} Hier sind die letzten Argumente des konservativen Analysten: {current_safe_response} Hier sind die letzten Argumente des neutralen Analysten: {current_neutral_response}. Wenn es keine Antworten von den anderen Standpunkten gibt, halluzinieren Sie nicht und präsentieren Sie einfach Ihren Punkt.
+Hier ist der aktuelle Gesprächsverlauf: {history} Hier sind die letzten Argumente des konservativen Analysten: {current_safe_response} Hier sind die letzten Argumente des neutralen Analysten: {current_neutral_response}."""
+        return [("system", system_prompt), ("human", prompt)]
 
-Engagieren Sie sich aktiv, indem Sie auf spezifische Bedenken eingehen, Schwächen in ihrer Logik widerlegen und die Vorteile der Risikobereitschaft betonen, um Marktnormen zu übertreffen. Konzentrieren Sie sich auf Debattieren und Überzeugen, nicht nur auf das Präsentieren von Daten. Fordern Sie jeden Gegenpunkt heraus, um zu unterstreichen, warum ein hochriskanter Ansatz optimal ist. Geben Sie gesprächig aus, als würden Sie sprechen, ohne spezielle Formatierung."""
-
-        response = llm.invoke(prompt)
+    def build_update(state, response, context_update):
+        risk_debate_state = state["risk_debate_state"]
+        history = risk_debate_state.get("history", "")
+        risky_history = risk_debate_state.get("risky_history", "")
 
         argument = f"Risky Analyst: {response.content}"
 
@@ -48,8 +59,19 @@ Engagieren Sie sich aktiv, indem Sie auf spezifische Bedenken eingehen, Schwäch
                 "current_neutral_response", ""
             ),
             "count": risk_debate_state["count"] + 1,
+            **debate_context.update(risk_debate_state, argument, context_update),
         }
 
         return {"risk_debate_state": new_risk_debate_state}
 
-    return risky_node
+    def risky_node(state) -> dict:
+        history, context_update = debate_context.build(state["risk_debate_state"])
+        response = llm.invoke(build_prompt(state, history))
+        return build_update(state, response, context_update)
+
+    async def arisky_node(state) -> dict:
+        history, context_update = await debate_context.abuild(state["risk_debate_state"])
+        response = await llm.ainvoke(build_prompt(state, history))
+        return build_update(state, response, context_update)
+
+    return RunnableLambda(risky_node, afunc=arisky_node)
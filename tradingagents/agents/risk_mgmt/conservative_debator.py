@@ -1,39 +1,50 @@
 from langchain_core.messages import AIMessage
 import time
 import json
+from langchain_core.runnables import RunnableLambda
 
+from tradingagents.agents.utils.debate_context import DebateContext
+from tradingagents.agents.utils.report_distiller import report_for_prompt
 
-def create_safe_debator(llm):
-    def safe_node(state) -> dict:
+
+def create_safe_debator(llm, debate_context=None):
+    debate_context = debate_context or DebateContext(llm)
+
+    def build_prompt(state, history):
         risk_debate_state = state["risk_debate_state"]
-        history = risk_debate_state.get("history", "")
         safe_history = risk_debate_state.get("safe_history", "")
 
         current_risky_response = risk_debate_state.get("current_risky_response", "")
         current_neutral_response = risk_debate_state.get("current_neutral_response", "")
 
-        market_research_report = state["market_report"]
-        sentiment_report = state["sentiment_report"]
-        news_report = state["news_report"]
-        fundamentals_report = state["fundamentals_report"]
+        market_research_report = report_for_prompt(state, "market")
+        sentiment_report = report_for_prompt(state, "sentiment")
+        news_report = report_for_prompt(state, "news")
+        fundamentals_report = report_for_prompt(state, "fundamentals")
 
         trader_decision = state["trader_investment_plan"]
 
-        prompt = f"""Als Sicherer/Konservativer Risiko-Analyst ist Ihr primäres Ziel, Vermögenswerte zu schützen, Volatilität zu minimieren und stetiges, zuverlässiges Wachstum sicherzustellen. Sie priorisieren Stabilität, Sicherheit und Risikominderung, indem Sie sorgfältig potenzielle Verluste, wirtschaftliche Abschwünge und Marktvolatilität bewerten. Bei der Bewertung der Entscheidung oder des Plans des Händlers untersuchen Sie kritisch risikoreiche Elemente und weisen darauf hin, wo die Entscheidung das Unternehmen unangemessenen Risiken aussetzen könnte und wo vorsichtigere Alternativen langfristige Gewinne sichern könnten. Hier ist die Entscheidung des Händlers:
+        system_prompt = """Als Sicherer/Konservativer Risiko-Analyst ist Ihr primäres Ziel, Vermögenswerte zu schützen, Volatilität zu minimieren und stetiges, zuverlässiges Wachstum sicherzustellen. Sie priorisieren Stabilität, Sicherheit und Risikominderung, indem Sie sorgfältig potenzielle Verluste, wirtschaftliche Abschwünge und Marktvolatilität bewerten. Bei der Bewertung der Entscheidung oder des Plans des Händlers untersuchen Sie kritisch risikoreiche Elemente und weisen darauf hin, wo die Entscheidung das Unternehmen unangemessenen Risiken aussetzen könnte und wo vorsichtigere Alternativen langfristige Gewinne sichern könnten. Die Entscheidung des Händlers, die Berichte und der bisherige Gesprächsverlauf werden Ihnen in der folgenden Nachricht bereitgestellt.
 
-{trader_decision}
+Ihre Aufgabe ist es, aktiv den Argumenten der Risiko- und Neutralen Analysten entgegenzutreten und hervorzuheben, wo ihre Ansichten potenzielle Bedrohungen übersehen oder Nachhaltigkeit nicht priorisieren könnten. Reagieren Sie direkt auf ihre Punkte und ziehen Sie aus den bereitgestellten Datenquellen, um einen überzeugenden Fall für eine risikoarme Anpassung der Händlerentscheidung aufzubauen. Wenn es keine Antworten von den anderen Standpunkten gibt, halluzinieren Sie nicht und präsentieren Sie einfach Ihren Punkt.
 
-Ihre Aufgabe ist es, aktiv den Argumenten der Risiko- und Neutralen Analysten entgegenzutreten und hervorzuheben, wo ihre Ansichten potenzielle Bedrohungen übersehen oder Nachhaltigkeit nicht priorisieren könnten. Reagieren Sie direkt auf ihre Punkte und ziehen Sie aus den folgenden Datenquellen, um einen überzeugenden Fall für eine risikoarme Anpassung der Händlerentscheidung aufzubauen:
+Engagieren Sie sich, indem Sie ihren Optimismus hinterfragen und die potenziellen Nachteile betonen, die sie möglicherweise übersehen haben. Gehen Sie auf jeden ihrer Gegenpunkte ein, um zu zeigen, warum eine konservative Haltung letztendlich der sicherste Weg für die Vermögenswerte des Unternehmens ist. Konzentrieren Sie sich auf das Debattieren und Kritisieren ihrer Argumente, um die Stärke einer risikoarmen Strategie gegenüber ihren Ansätzen zu demonstrieren. Geben Sie gesprächig aus, als würden Sie sprechen, ohne spezielle Formatierung."""
+
+        prompt = f"""Hier ist die Entscheidung des Händlers:
+
+{trader_decision}
 
 Marktforschungsbericht: {market_research_report}
 Social-Media-Sentiment-Bericht: {sentiment_report}
 Aktueller Weltgeschehensbericht: {news_report}
 Unternehmensfundamentalbericht: {fundamentals_report}
-Hier ist der aktuelle Gesprächsverlauf: {history} Hier ist die letzte Antwort des Risiko-Analysten: {current_risky_response} Hier ist die letzte Antwort des neutralen Analysten: {current_neutral_response}. Wenn es keine Antworten von den anderen Standpunkten gibt, halluzinieren Sie nicht und präsentieren Sie einfach Ihren Punkt.
+Hier ist der aktuelle Gesprächsverlauf: {history} Hier ist die letzte Antwort des Risiko-Analysten: {current_risky_response} Hier ist die letzte Antwort des neutralen Analysten: {current_neutral_response}."""
+        return [("system", system_prompt), ("human", prompt)]
 
-Engagieren Sie sich, indem Sie ihren Optimismus hinterfragen und die potenziellen Nachteile betonen, die sie möglicherweise übersehen haben. Gehen Sie auf jeden ihrer Gegenpunkte ein, um zu zeigen, warum eine konservative Haltung letztendlich der sicherste Weg für die Vermögenswerte des Unternehmens ist. Konzentrieren Sie sich auf das Debattieren und Kritisieren ihrer Argumente, um die Stärke einer risikoarmen Strategie gegenüber ihren Ansätzen zu demonstrieren. Geben Sie gesprächig aus, als würden Sie sprechen, ohne spezielle Formatierung."""
-
-        response = llm.invoke(prompt)
+    def build_update(state, response, context_update):
+        risk_debate_state = state["risk_debate_state"]
+        history = risk_debate_state.get("history", "")
+        safe_history = risk_debate_state.get("safe_history", "")
 
         argument = f"Safe Analyst: {response.content}"
 
@@ -51,8 +62,19 @@ Engagieren Sie sich, indem Sie ihren Optimismus hinterfragen und die potenzielle
                 "current_neutral_response", ""
             ),
             "count": risk_debate_state["count"] + 1,
+            **debate_context.update(risk_debate_state, argument, context_update),
         }
 
         return {"risk_debate_state": new_risk_debate_state}
 
-    return safe_node
+    def safe_node(state) -> dict:
+        history, context_update = debate_context.build(state["risk_debate_state"])
+        response = llm.invoke(build_prompt(state, history))
+        return build_update(state, response, context_update)
+
+    async def asafe_node(state) -> dict:
+        history, context_update = await debate_context.abuild(state["risk_debate_state"])
+        response = await llm.ainvoke(build_prompt(state, history))
+        return build_update(state, response, context_update)
+
+    return RunnableLambda(safe_node, afunc=asafe_node)
@@ -1,10 +1,12 @@
-from typing import Annotated, Sequence
+from typing import Annotated, List, Sequence
 from datetime import date, timedelta, datetime
 from typing_extensions import TypedDict, Optional
 from langchain_openai import ChatOpenAI
 from tradingagents.agents import *
 from langgraph.prebuilt import ToolNode
 from langgraph.graph import END, StateGraph, START, MessagesState
+from langgraph.graph.message import add_messages
+from langchain_core.messages import AnyMessage
 
 
 # Researcher team state
@@ -19,6 +21,10 @@ class InvestDebateState(TypedDict):
     current_response: Annotated[str, "Latest response"]  # Last response
     judge_decision: Annotated[str, "Final judge decision"]  # Last response
     count: Annotated[int, "Length of the current conversation"]  # Conversation length
+    # rolling-context mode (see DebateContext)
+    turns: Annotated[List[str], "Debate turns in order"]
+    summary: Annotated[str, "Summary of the turns no longer shown verbatim"]
+    summarized_count: Annotated[int, "Number of turns folded into the summary"]
 
 
 # Risk management team state
@@ -45,6 +51,10 @@ class RiskDebateState(TypedDict):
     ]  # Last response
     judge_decision: Annotated[str, "Judge's decision"]
     count: Annotated[int, "Length of the current conversation"]  # Conversation length
+    # rolling-context mode (see DebateContext)
+    turns: Annotated[List[str], "Debate turns in order"]
+    summary: Annotated[str, "Summary of the turns no longer shown verbatim"]
+    summarized_count: Annotated[int, "Number of turns folded into the summary"]
 
 
 class AgentState(MessagesState):
@@ -53,6 +63,12 @@ class AgentState(MessagesState):
 
     sender: Annotated[str, "Agent that sent this message"]
 
+    # isolated per-analyst message channels, used when the analysts run in parallel
+    market_messages: Annotated[Sequence[AnyMessage], add_messages]
+    social_messages: Annotated[Sequence[AnyMessage], add_messages]
+    news_messages: Annotated[Sequence[AnyMessage], add_messages]
+    fundamentals_messages: Annotated[Sequence[AnyMessage], add_messages]
+
     # research step
     market_report: Annotated[str, "Report from the Market Analyst"]
     sentiment_report: Annotated[str, "Report from the Social Media Analyst"]
@@ -61,6 +77,12 @@ class AgentState(MessagesState):
     ]
     fundamentals_report: Annotated[str, "Report from the Fundamentals Researcher"]
 
+    # compact digests of the reports, used in later prompts when present
+    market_digest: Annotated[str, "Digest of the Market Analyst report"]
+    sentiment_digest: Annotated[str, "Digest of the Social Media Analyst report"]
+    news_digest: Annotated[str, "Digest of the News Researcher report"]
+    fundamentals_digest: Annotated[str, "Digest of the Fundamentals Researcher report"]
+
     # researcher team discussion step
     investment_debate_state: Annotated[
         InvestDebateState, "Current state of the debate on if to invest or not"
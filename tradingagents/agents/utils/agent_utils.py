@@ -19,6 +19,12 @@ from tradingagents.agents.utils.news_data_tools import (
     get_insider_transactions,
     get_global_news
 )
+from tradingagents.dataflows.interface import has_data_source
+
+def available_tools(tools):
+    """The tools whose data can be routed under the current config (with
+    local_only routing, tools without a local source are left out)."""
+    return [tool for tool in tools if has_data_source(tool.name)]
 
 def create_msg_delete():
     def delete_messages(state):
@@ -0,0 +1,121 @@
+from typing import Any, Dict, List, Tuple
+
+
+class DebateContext:
+    """Bounds the debate history that debaters see in their prompts.
+
+    Disabled, debaters get the full history as before. Enabled, they see the
+    last `recent_turns` turns verbatim (fewer if those exceed `max_tokens`)
+    plus a rolling summary of all earlier turns. The summary is extended
+    incrementally with the turns that leave the window, so every turn is
+    summarized once. Turns, summary and the number of summarized turns are
+    kept in the debate state; `history` still records the full debate for
+    the judges, logs and reflection.
+    """
+
+    def __init__(
+        self,
+        llm,
+        enabled: bool = False,
+        recent_turns: int = 2,
+        max_tokens: int = 2000,
+        summary_tokens: int = 500,
+    ):
+        self.llm = llm
+        self.enabled = enabled
+        self.recent_turns = max(recent_turns, 1)
+        self.max_tokens = max_tokens
+        self.summary_tokens = summary_tokens
+
+    @classmethod
+    def from_config(cls, llm, config: Dict[str, Any]) -> "DebateContext":
+        settings = config.get("debate_context", {})
+        return cls(
+            llm,
+            enabled=settings.get("enabled", False),
+            recent_turns=settings.get("recent_turns", 2),
+            max_tokens=settings.get("max_tokens", 2000),
+            summary_tokens=settings.get("summary_tokens", 500),
+        )
+
+    @staticmethod
+    def estimate_tokens(text: str) -> int:
+        """Rough, tokenizer-independent token count (about 4 characters each)."""
+        return len(text) // 4
+
+    def _window(self, turns: List[str]) -> int:
+        """Number of latest turns shown verbatim."""
+        window = min(self.recent_turns, len(turns))
+        while window > 1 and sum(
+            self.estimate_tokens(turn) for turn in turns[-window:]
+        ) > self.max_tokens:
+            window -= 1
+        return window
+
+    def _summary_messages(self, summary: str, turns: List[str]) -> list:
+        new_turns = "\n\n".join(turns)
+        return [
+            (
+                "system",
+                f"Sie fassen eine laufende Debatte zwischen Finanzanalysten zusammen. Ergänzen Sie die bisherige Zusammenfassung um die neuen Beiträge. Behalten Sie für jeden Sprecher die zentralen Argumente, genannten Zahlen und offenen Streitpunkte bei und lassen Sie Wiederholungen weg. Antworten Sie nur mit der aktualisierten Zusammenfassung in höchstens {self.summary_tokens * 3 // 4} Wörtern.",
+            ),
+            (
+                "human",
+                f"Bisherige Zusammenfassung:\n{summary or '(keine)'}\n\nNeue Beiträge:\n{new_turns}",
+            ),
+        ]
+
+    def _pending(self, debate_state) -> Tuple[str, int, List[str], List[str]]:
+        """(summary, summarized turns, turns to fold into it, turns shown verbatim)"""
+        turns = debate_state.get("turns", [])
+        summary = debate_state.get("summary", "")
+        summarized = debate_state.get("summarized_count", 0)
+        start = max(len(turns) - self._window(turns), summarized)
+        return summary, summarized, turns[summarized:start], turns[start:]
+
+    def _render(self, summary: str, recent: List[str]) -> str:
+        recent_text = "\n".join(recent)
+        if not summary:
+            return recent_text
+        return f"Zusammenfassung der früheren Debatte: {summary}\n\nLetzte Beiträge:\n{recent_text}"
+
+    def build(self, debate_state) -> Tuple[str, Dict[str, Any]]:
+        """The history to put into a debater's prompt, and the summary fields
+        to store in the debate state."""
+        if not self.enabled:
+            return debate_state.get("history", ""), {}
+        summary, summarized, to_fold, recent = self._pending(debate_state)
+        if to_fold:
+            summary = self.llm.invoke(self._summary_messages(summary, to_fold)).content
+            summarized += len(to_fold)
+        return self._render(summary, recent), {
+            "summary": summary,
+            "summarized_count": summarized,
+        }
+
+    async def abuild(self, debate_state) -> Tuple[str, Dict[str, Any]]:
+        """Async variant of build."""
+        if not self.enabled:
+            return debate_state.get("history", ""), {}
+        summary, summarized, to_fold, recent = self._pending(debate_state)
+        if to_fold:
+            result = await self.llm.ainvoke(self._summary_messages(summary, to_fold))
+            summary = result.content
+            summarized += len(to_fold)
+        return self._render(summary, recent), {
+            "summary": summary,
+            "summarized_count": summarized,
+        }
+
+    def update(self, debate_state, argument: str, context_update: Dict[str, Any]) -> Dict[str, Any]:
+        """Rolling-context fields of the debate state after a new turn; none when
+        disabled, since `history` already records every turn."""
+        if not self.enabled:
+            return {}
+        return {
+            "turns": debate_state.get("turns", []) + [argument],
+            "summary": context_update.get("summary", debate_state.get("summary", "")),
+            "summarized_count": context_update.get(
+                "summarized_count", debate_state.get("summarized_count", 0)
+            ),
+        }
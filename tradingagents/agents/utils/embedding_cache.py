@@ -0,0 +1,122 @@
+import hashlib
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import List, Optional
+
+import numpy as np
+
+
+class EmbeddingCache:
+    """Content-addressed cache of text embeddings shared by all memories.
+
+    Embeddings are keyed by a hash of (model, text), kept in a bounded
+    in-process LRU and, when a path is given, in a SQLite file so they
+    survive the process.
+    """
+
+    def __init__(self, max_entries: int = 4096, path: Optional[str] = None):
+        self.max_entries = max_entries
+        self.path = path
+        self._entries = OrderedDict()  # key -> float32 vector
+        self._lock = threading.Lock()
+
+        if path:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            with self._connect() as conn:
+                conn.execute(
+                    """
+                    CREATE TABLE IF NOT EXISTS embeddings (
+                        key TEXT PRIMARY KEY,
+                        embedding BLOB NOT NULL
+                    )
+                    """
+                )
+
+    @contextmanager
+    def _connect(self):
+        """Open a connection that commits on success and is always closed."""
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    @staticmethod
+    def key(model: str, text: str) -> str:
+        return hashlib.sha256(f"{model}\n{text}".encode("utf-8")).hexdigest()
+
+    def _remember(self, key: str, embedding: np.ndarray):
+        self._entries[key] = embedding
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def get_many(self, model: str, texts: List[str]) -> List[Optional[List[float]]]:
+        """Cached embeddings for texts, None where a text is not cached."""
+        keys = [self.key(model, text) for text in texts]
+        found = {}
+        with self._lock:
+            for key in keys:
+                if key in self._entries:
+                    self._entries.move_to_end(key)
+                    found[key] = self._entries[key]
+
+        missing = [key for key in dict.fromkeys(keys) if key not in found]
+        if missing and self.path:
+            with self._connect() as conn:
+                rows = conn.execute(
+                    f"SELECT key, embedding FROM embeddings WHERE key IN ({','.join('?' * len(missing))})",
+                    missing,
+                ).fetchall()
+            with self._lock:
+                for key, blob in rows:
+                    found[key] = np.frombuffer(blob, dtype=np.float32)
+                    self._remember(key, found[key])
+
+        return [found[key].tolist() if key in found else None for key in keys]
+
+    def set_many(self, model: str, texts: List[str], embeddings: List[List[float]]):
+        """Cache the embeddings of texts."""
+        entries = {
+            self.key(model, text): np.asarray(embedding, dtype=np.float32)
+            for text, embedding in zip(texts, embeddings)
+        }
+        with self._lock:
+            for key, embedding in entries.items():
+                self._remember(key, embedding)
+
+        if self.path:
+            with self._connect() as conn:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO embeddings VALUES (?, ?)",
+                    [(key, embedding.tobytes()) for key, embedding in entries.items()],
+                )
+
+
+_embedding_cache: Optional[EmbeddingCache] = None
+_embedding_cache_lock = threading.Lock()
+
+
+def get_embedding_cache(config) -> Optional[EmbeddingCache]:
+    """Get the process-wide embedding cache for a configuration, or None if disabled."""
+    global _embedding_cache
+
+    settings = config.get("embedding_cache", {})
+    if not settings.get("enabled", True):
+        return None
+
+    path = None
+    if settings.get("persist", False):
+        path = settings.get("path") or os.path.join(
+            config["data_cache_dir"], "embedding_cache.sqlite"
+        )
+
+    with _embedding_cache_lock:
+        if _embedding_cache is None or _embedding_cache.path != path:
+            _embedding_cache = EmbeddingCache(settings.get("max_entries", 4096), path)
+        _embedding_cache.max_entries = settings.get("max_entries", 4096)
+        return _embedding_cache
@@ -0,0 +1,106 @@
+import re
+import threading
+import zlib
+from typing import List
+
+import numpy as np
+from openai import OpenAI
+
+
+class OpenAIEmbeddings:
+    """Embeddings from an OpenAI-compatible API (OpenAI, or Ollama locally)."""
+
+    def __init__(self, config):
+        if config["backend_url"] == "http://localhost:11434/v1":
+            self.name = "nomic-embed-text"
+            self.dimensions = 768
+        else:
+            self.name = "text-embedding-3-small"
+            self.dimensions = 1536
+        self.backend_url = config["backend_url"]
+        self._client = None
+
+    @property
+    def client(self) -> OpenAI:
+        # Created on first use, so runs that never embed need no API key
+        if self._client is None:
+            self._client = OpenAI(base_url=self.backend_url)
+        return self._client
+
+    def embed(self, texts: List[str]) -> List[List[float]]:
+        response = self.client.embeddings.create(model=self.name, input=texts)
+        return [item.embedding for item in sorted(response.data, key=lambda d: d.index)]
+
+
+class HashingEmbeddings:
+    """In-process bag-of-words embeddings via the hashing trick.
+
+    Word unigrams and bigrams are hashed into a fixed number of signed
+    buckets with sublinear term frequency and L2-normalized. No model,
+    no vocabulary to fit and no network, so results are deterministic and
+    work offline; similarity is lexical rather than semantic.
+    """
+
+    _token_pattern = re.compile(r"\w+", re.UNICODE)
+
+    def __init__(self, dimensions: int = 1024):
+        self.dimensions = dimensions
+        self.name = "hashing"
+
+    def _features(self, text: str) -> List[str]:
+        tokens = self._token_pattern.findall(text.lower())
+        return tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+
+    def embed(self, texts: List[str]) -> List[List[float]]:
+        matrix = np.zeros((len(texts), self.dimensions), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for feature in self._features(text):
+                # crc32 rather than hash(), which is salted per process
+                digest = zlib.crc32(feature.encode("utf-8"))
+                sign = 1.0 if digest & 0x80000000 else -1.0
+                matrix[row, digest % self.dimensions] += sign
+
+        matrix = np.sign(matrix) * np.log1p(np.abs(matrix))
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        return (matrix / np.where(norms == 0, 1, norms)).tolist()
+
+
+class OnnxMiniLMEmbeddings:
+    """all-MiniLM-L6-v2 sentence embeddings run on CPU with onnxruntime.
+
+    Uses the model bundled with chromadb, downloaded once to
+    ~/.cache/chroma/onnx_models; copy that directory to use it offline.
+    """
+
+    name = "onnx-all-MiniLM-L6-v2"
+    dimensions = 384
+
+    def __init__(self):
+        from chromadb.utils.embedding_functions import ONNXMiniLM_L6_V2
+
+        self.model = ONNXMiniLM_L6_V2(preferred_providers=["CPUExecutionProvider"])
+
+    def embed(self, texts: List[str]) -> List[List[float]]:
+        return [np.asarray(e, dtype=np.float32).tolist() for e in self.model(texts)]
+
+
+_backends = {}
+_backends_lock = threading.Lock()
+
+
+def get_embedding_backend(config):
+    """Get the embedding backend selected by config["embedding_backend"],
+    shared by every memory with the same settings."""
+    backend = config.get("embedding_backend", "openai")
+    key = (backend, config["backend_url"], config.get("embedding_dimensions", 1024))
+    with _backends_lock:
+        if key not in _backends:
+            if backend == "openai":
+                _backends[key] = OpenAIEmbeddings(config)
+            elif backend == "hashing":
+                _backends[key] = HashingEmbeddings(config.get("embedding_dimensions", 1024))
+            elif backend == "onnx":
+                _backends[key] = OnnxMiniLMEmbeddings()
+            else:
+                raise ValueError(f"Unsupported embedding backend: {backend}")
+        return _backends[key]
@@ -1,48 +1,97 @@
+import asyncio
+import hashlib
+import os
+
 import chromadb
 from chromadb.config import Settings
-from openai import OpenAI
+
+from .embedding_cache import get_embedding_cache
+from .embeddings import get_embedding_backend
 
 
 class FinancialSituationMemory:
     def __init__(self, name, config):
-        if config["backend_url"] == "http://localhost:11434/v1":
-            self.embedding = "nomic-embed-text"
-        else:
-            self.embedding = "text-embedding-3-small"
-        self.client = OpenAI(base_url=config["backend_url"])
-        self.chroma_client = chromadb.Client(Settings(allow_reset=True))
-        
-        # Try to get existing collection, create if it doesn't exist
-        try:
-            self.situation_collection = self.chroma_client.get_collection(name=name)
-        except:
-            self.situation_collection = self.chroma_client.create_collection(name=name)
-
-    def get_embedding(self, text):
-        """Get OpenAI embedding for a text"""
-        
-        response = self.client.embeddings.create(
-            model=self.embedding, input=text
+        self.embedding_backend = get_embedding_backend(config)
+        # Model and vector size identify embeddings in the cache and collections
+        self.embedding = (
+            f"{self.embedding_backend.name}-{self.embedding_backend.dimensions}"
         )
-        return response.data[0].embedding
+        self.embedding_cache = get_embedding_cache(config)
 
-    def add_situations(self, situations_and_advice):
-        """Add financial situations and their corresponding advice. Parameter is a list of tuples (situation, rec)"""
+        if config.get("persistent_memory", False):
+            # Memories survive the process, so reflections carry over between runs
+            memory_dir = config.get("memory_dir") or os.path.join(
+                config["data_cache_dir"], "memory"
+            )
+            self.chroma_client = chromadb.PersistentClient(
+                path=memory_dir, settings=Settings(allow_reset=True)
+            )
+        else:
+            self.chroma_client = chromadb.Client(Settings(allow_reset=True))
 
-        situations = []
-        advice = []
-        ids = []
-        embeddings = []
+        # Vector sizes differ between embedding models (the backend_url can
+        # switch between them), so each model gets its own collection
+        self.situation_collection = self.chroma_client.get_or_create_collection(
+            name=f"{name}-{self.embedding}"
+        )
 
-        offset = self.situation_collection.count()
+    def get_embedding(self, text):
+        """Get the embedding of a text"""
+        return self.get_embeddings([text])[0]
+
+    def get_embeddings(self, texts):
+        """Get embeddings for several texts in one backend call.
+
+        Texts already embedded by any memory are served from the shared
+        embedding cache; only the rest are sent, each distinct text once.
+        """
+        texts = list(texts)
+        cached = (
+            self.embedding_cache.get_many(self.embedding, texts)
+            if self.embedding_cache
+            else [None] * len(texts)
+        )
 
-        for i, (situation, recommendation) in enumerate(situations_and_advice):
-            situations.append(situation)
-            advice.append(recommendation)
-            ids.append(str(offset + i))
-            embeddings.append(self.get_embedding(situation))
+        missing = list(dict.fromkeys(t for t, e in zip(texts, cached) if e is None))
+        if missing:
+            embeddings = self.embedding_backend.embed(missing)
+            if self.embedding_cache:
+                self.embedding_cache.set_many(self.embedding, missing, embeddings)
+            fetched = dict(zip(missing, embeddings))
+            cached = [e if e is not None else fetched[t] for t, e in zip(texts, cached)]
+
+        return cached
+
+    @staticmethod
+    def situation_id(situation, recommendation):
+        """Stable id derived from the content, so concurrent writers never collide"""
+        content = f"{situation}\n\n{recommendation}".encode("utf-8")
+        return hashlib.sha256(content).hexdigest()
+
+    def add_situations(self, situations_and_advice, embeddings=None):
+        """Add financial situations and their corresponding advice. Parameter is a list of tuples (situation, rec),
+        optionally with the precomputed embeddings of the situations"""
+
+        if embeddings is None:
+            embeddings = [None] * len(situations_and_advice)
+
+        # Identical (situation, rec) pairs map to the same id; keep one of each
+        unique = {
+            self.situation_id(situation, recommendation): (situation, recommendation, embedding)
+            for (situation, recommendation), embedding in zip(situations_and_advice, embeddings)
+        }
+        if not unique:
+            return
+
+        ids = list(unique)
+        situations = [unique[i][0] for i in ids]
+        advice = [unique[i][1] for i in ids]
+        if any(unique[i][2] is None for i in ids):
+            embeddings = self.get_embeddings(situations)
+        else:
+            embeddings = [unique[i][2] for i in ids]
 
-        self.situation_collection.add(
+        self.situation_collection.upsert(
             documents=situations,
             metadatas=[{"recommendation": rec} for rec in advice],
             embeddings=embeddings,
@@ -50,7 +99,11 @@ class FinancialSituationMemory:
         )
 
     def get_memories(self, current_situation, n_matches=1):
-        """Find matching recommendations using OpenAI embeddings"""
+        """Find matching recommendations by embedding similarity"""
+        if self.situation_collection.count() == 0:
+            # Nothing to match, so skip embedding the situation
+            return []
+
         query_embedding = self.get_embedding(current_situation)
 
         results = self.situation_collection.query(
@@ -71,6 +124,12 @@ class FinancialSituationMemory:
 
         return matched_results
 
+    async def aget_memories(self, current_situation, n_matches=1):
+        """Async variant of get_memories that keeps the event loop free during lookup"""
+        return await asyncio.to_thread(
+            self.get_memories, current_situation, n_matches
+        )
+
 
 if __name__ == "__main__":
     # Example usage
@@ -0,0 +1,61 @@
+from langchain_core.runnables import RunnableLambda
+
+REPORTS = {
+    "market": "Marktforschungsbericht",
+    "sentiment": "Social-Media-Sentiment-Bericht",
+    "news": "Nachrichtenbericht",
+    "fundamentals": "Unternehmensfundamentalbericht",
+}
+
+
+def report_for_prompt(state, report: str) -> str:
+    """The digest of an analyst report if the distiller produced one, else the full report."""
+    return state.get(f"{report}_digest") or state[f"{report}_report"]
+
+
+def create_report_distiller(llm, max_words: int = 250):
+    """Node that condenses the analyst reports into compact digests.
+
+    Researchers and risk debaters read all reports again on every turn; with
+    digests in state they get these instead of the full reports.
+    The full reports stay in state for memory lookups, reflection and logs.
+    """
+
+    def build_messages(report: str, content: str) -> list:
+        return [
+            (
+                "system",
+                f"""Sie verdichten den {REPORTS[report]} eines Analystenteams für die nachfolgende Investmentdebatte. Erstellen Sie eine strukturierte Zusammenfassung mit höchstens {max_words} Wörtern und genau diesen Abschnitten:
+Kernaussagen: die wichtigsten Schlussfolgerungen
+Kennzahlen: konkrete Zahlen, Kursniveaus und Indikatorwerte mit Datum
+Signale: bullische und bärische Signale
+Risiken: genannte Risiken und Unsicherheiten
+Übernehmen Sie nur Informationen aus dem Bericht, erfinden Sie nichts und behalten Sie eine eventuelle Empfehlung des Analysten bei.""",
+            ),
+            ("human", content),
+        ]
+
+    def pending(state):
+        return [report for report in REPORTS if state.get(f"{report}_report")]
+
+    def build_update(reports, responses) -> dict:
+        return {
+            f"{report}_digest": response.content
+            for report, response in zip(reports, responses)
+        }
+
+    def distiller_node(state) -> dict:
+        reports = pending(state)
+        responses = llm.batch(
+            [build_messages(report, state[f"{report}_report"]) for report in reports]
+        )
+        return build_update(reports, responses)
+
+    async def adistiller_node(state) -> dict:
+        reports = pending(state)
+        responses = await llm.abatch(
+            [build_messages(report, state[f"{report}_report"]) for report in reports]
+        )
+        return build_update(reports, responses)
+
+    return RunnableLambda(distiller_node, afunc=adistiller_node)
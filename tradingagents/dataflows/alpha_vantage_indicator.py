@@ -27,6 +27,14 @@ def get_indicator(
     from datetime import datetime
     from dateutil.relativedelta import relativedelta
 
+    # Several comma-separated indicators are fetched one by one
+    if "," in indicator:
+        return "\n\n".join(
+            get_indicator(symbol, ind.strip(), curr_date, look_back_days, interval, time_period, series_type)
+            for ind in indicator.split(",")
+            if ind.strip()
+        )
+
     supported_indicators = {
         "close_50_sma": ("50 SMA", "close"),
         "close_200_sma": ("200 SMA", "close"),
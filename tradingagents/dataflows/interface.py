@@ -1,4 +1,7 @@
 from typing import Annotated
+import re
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 
 # Import from vendor-specific modules
 from .local import get_YFin_data, get_finnhub_news, get_finnhub_company_insider_sentiment, get_finnhub_company_insider_transactions, get_simfin_balance_sheet, get_simfin_cashflow, get_simfin_income_statements, get_reddit_global_news, get_reddit_company_news
@@ -19,6 +22,7 @@ from .alpha_vantage_common import AlphaVantageRateLimitError
 
 # Configuration and routing logic
 from .config import get_config
+from .vendor_cache import get_vendor_cache
 
 # Tools organized by category
 TOOLS_CATEGORIES = {
@@ -116,6 +120,23 @@ VENDOR_METHODS = {
     },
 }
 
+# Implementations listed under "local" that fetch live data; local_only
+# routing never calls them
+LIVE_LOCAL_IMPLEMENTATIONS = [get_google_news]
+
+def get_local_implementations(method: str) -> list:
+    """Implementations of a method that only read data on disk."""
+    vendor_impl = VENDOR_METHODS.get(method, {}).get("local", [])
+    impls = vendor_impl if isinstance(vendor_impl, list) else [vendor_impl]
+    return [impl for impl in impls if impl not in LIVE_LOCAL_IMPLEMENTATIONS]
+
+def has_data_source(method: str) -> bool:
+    """Whether a method can be routed under the current config; with
+    local_only routing only methods with a local implementation can."""
+    if method not in VENDOR_METHODS:
+        return False
+    return not get_config().get("local_only", False) or bool(get_local_implementations(method))
+
 def get_category_for_method(method: str) -> str:
     """Get the category that contains the specified method."""
     for category, info in TOOLS_CATEGORIES.items():
@@ -138,9 +159,168 @@ def get_vendor(category: str, method: str = None) -> str:
     # Fall back to category-level configuration
     return config.get("data_vendors", {}).get(category, "default")
 
+# Many vendor functions report failures in their return value instead of raising:
+# "Error retrieving ...", "No balance sheet data found ...", or Alpha Vantage JSON errors
+ERROR_RESULT_PATTERN = re.compile(
+    r'^\s*(Error\b|No\b.*\bdata found\b|\{\s*"(Error Message|Note|Information)")'
+)
+
+def is_error_result(result) -> bool:
+    """Check whether a vendor result is empty or an error message."""
+    if result is None:
+        return True
+    if isinstance(result, str):
+        return not result.strip() or bool(ERROR_RESULT_PATTERN.match(result))
+    return False
+
+def call_vendor_impl(method: str, category: str, vendor: str, impl_func, *args, **kwargs):
+    """Call one vendor implementation, serving and storing results through the vendor cache.
+
+    Empty and error results are returned but not cached, so the next call retries.
+    """
+    cache = get_vendor_cache()
+    if cache is None:
+        return impl_func(*args, **kwargs)
+
+    cache_key = cache.make_key(method, f"{vendor}:{impl_func.__name__}", impl_func, args, kwargs)
+    hit, result = cache.get(cache_key, method)
+    if hit:
+        print(f"CACHE HIT: {impl_func.__name__} from vendor '{vendor}'")
+        return result
+
+    result = impl_func(*args, **kwargs)
+    if not is_error_result(result):
+        cache.set(cache_key, method, vendor, category, result)
+    return result
+
+def run_vendors_concurrently(method: str, category: str, vendors: list, policy: str, timeout: float, *args, **kwargs):
+    """Run the implementations of several vendors in parallel on a thread pool.
+
+    With policy "race" the first successful result is returned; a result that
+    reports an error (see is_error_result) counts as a failure and does not win.
+    With "gather" every result of a call that did not raise is kept.
+
+    `timeout` applies to each vendor call on its own, counted from when that
+    call started: a call still running after `timeout` seconds is skipped,
+    while the other vendors keep their full time. Skipped and losing calls are
+    abandoned rather than interrupted, since threads cannot be cancelled; they
+    finish in the background on this call's own pool and their results are
+    discarded. Results are returned in vendor order.
+    """
+    calls = []
+    for vendor in vendors:
+        if vendor not in VENDOR_METHODS[method]:
+            continue
+        vendor_impl = VENDOR_METHODS[method][vendor]
+        impls = vendor_impl if isinstance(vendor_impl, list) else [vendor_impl]
+        calls.extend((vendor, impl) for impl in impls)
+
+    if not calls:
+        return []
+
+    print(f"DEBUG: {method} - Running {len(calls)} vendor implementation(s) concurrently (policy: {policy}, timeout: {timeout}s per vendor)")
+
+    started = {}  # call index -> monotonic start time
+
+    def run_call(i, vendor, impl_func):
+        started[i] = time.monotonic()
+        return call_vendor_impl(method, category, vendor, impl_func, *args, **kwargs)
+
+    executor = ThreadPoolExecutor(max_workers=len(calls))
+    futures = {
+        executor.submit(run_call, i, vendor, impl): i
+        for i, (vendor, impl) in enumerate(calls)
+    }
+
+    results = {}
+    pending = set(futures)
+    try:
+        while pending:
+            # Skip calls past their own deadline; calls not started yet have none
+            now = time.monotonic()
+            expired = [f for f in pending if futures[f] in started and now - started[futures[f]] >= timeout]
+            for future in expired:
+                vendor, impl_func = calls[futures[future]]
+                print(f"TIMEOUT: {impl_func.__name__} from vendor '{vendor}' exceeded {timeout}s, skipping")
+                pending.discard(future)
+            if not pending:
+                break
+
+            deadlines = [started[futures[f]] + timeout for f in pending if futures[f] in started]
+            wait_for = max(min(deadlines) - now, 0) if deadlines else timeout
+            done, _ = wait(pending, timeout=wait_for, return_when=FIRST_COMPLETED)
+
+            for future in sorted(done, key=futures.get):
+                pending.discard(future)
+                vendor, impl_func = calls[futures[future]]
+                try:
+                    result = future.result()
+                except AlphaVantageRateLimitError as e:
+                    print(f"RATE_LIMIT: Alpha Vantage rate limit exceeded for {impl_func.__name__}")
+                    print(f"DEBUG: Rate limit details: {e}")
+                    continue
+                except Exception as e:
+                    print(f"FAILED: {impl_func.__name__} from vendor '{vendor}' failed: {e}")
+                    continue
+
+                if policy == "race" and is_error_result(result):
+                    print(f"FAILED: {impl_func.__name__} from vendor '{vendor}' returned no data: {str(result)[:200]}")
+                    continue
+                results[futures[future]] = result
+                print(f"SUCCESS: {impl_func.__name__} from vendor '{vendor}' completed successfully")
+
+                if policy == "race":
+                    print(f"DEBUG: Vendor '{vendor}' won the race for {method}, abandoning remaining calls")
+                    pending.clear()
+                    break
+    finally:
+        # Do not wait for abandoned calls; queued ones are cancelled
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    return [results[i] for i in sorted(results)]
+
+def combine_vendor_results(method: str, results: list, vendor_attempt_count: int):
+    """Return a single result, or concatenate several results as a string."""
+    if not results:
+        print(f"FAILURE: All {vendor_attempt_count} vendor attempts failed for method '{method}'")
+        raise RuntimeError(f"All vendor implementations failed for method '{method}'")
+    else:
+        print(f"FINAL: Method '{method}' completed with {len(results)} result(s) from {vendor_attempt_count} vendor attempt(s)")
+
+    # Return single result if only one, otherwise concatenate as string
+    if len(results) == 1:
+        return results[0]
+    else:
+        # Convert all results to strings and concatenate
+        return '\n'.join(str(result) for result in results)
+
+def route_to_local(method: str, category: str, *args, **kwargs):
+    """Call only the local implementations of a method, without any fallback.
+
+    Raises if the method has no local implementation or all of them fail, so
+    a backtest never sees live data.
+    """
+    impls = get_local_implementations(method)
+    if not impls:
+        raise RuntimeError(f"No local data source for method '{method}' (local_only routing)")
+
+    results = []
+    for impl_func in impls:
+        try:
+            print(f"DEBUG: Calling {impl_func.__name__} from vendor 'local' (local_only)...")
+            results.append(call_vendor_impl(method, category, "local", impl_func, *args, **kwargs))
+        except Exception as e:
+            print(f"FAILED: {impl_func.__name__} from vendor 'local' failed: {e}")
+    return combine_vendor_results(method, results, len(impls))
+
 def route_to_vendor(method: str, *args, **kwargs):
-    """Route method calls to appropriate vendor implementation with fallback support."""
+    """Route method calls to appropriate vendor implementation with fallback support.
+
+    With config["local_only"] only local data is read (see route_to_local).
+    """
     category = get_category_for_method(method)
+    if get_config().get("local_only", False):
+        return route_to_local(method, category, *args, **kwargs)
     vendor_config = get_vendor(category, method)
 
     # Handle comma-separated vendors
@@ -163,6 +343,22 @@ def route_to_vendor(method: str, *args, **kwargs):
     fallback_str = " → ".join(fallback_vendors)
     print(f"DEBUG: {method} - Primary: [{primary_str}] | Full fallback order: [{fallback_str}]")
 
+    # Concurrent fan-out across the primary vendors, then the fallbacks
+    config = get_config()
+    policy = config.get("vendor_policy", "sequential")
+    if policy in ("race", "gather"):
+        timeout = config.get("vendor_timeout", 30)
+        results = run_vendors_concurrently(method, category, primary_vendors, policy, timeout, *args, **kwargs)
+        vendor_attempt_count = len(primary_vendors)
+        if not results:
+            remaining_vendors = [v for v in fallback_vendors if v not in primary_vendors]
+            print(f"INFO: Primary vendors failed for {method}, racing fallback vendors: {remaining_vendors}")
+            results = run_vendors_concurrently(method, category, remaining_vendors, "race", timeout, *args, **kwargs)
+            vendor_attempt_count += len(remaining_vendors)
+        return combine_vendor_results(method, results, vendor_attempt_count)
+    elif policy != "sequential":
+        raise ValueError(f"Unsupported vendor policy: {policy}")
+
     # Track results and execution state
     results = []
     vendor_attempt_count = 0
@@ -199,7 +395,7 @@ def route_to_vendor(method: str, *args, **kwargs):
         for impl_func, vendor_name in vendor_methods:
             try:
                 print(f"DEBUG: Calling {impl_func.__name__} from vendor '{vendor_name}'...")
-                result = impl_func(*args, **kwargs)
+                result = call_vendor_impl(method, category, vendor_name, impl_func, *args, **kwargs)
                 vendor_results.append(result)
                 print(f"SUCCESS: {impl_func.__name__} from vendor '{vendor_name}' completed successfully")
                     
@@ -229,16 +425,4 @@ def route_to_vendor(method: str, *args, **kwargs):
         else:
             print(f"FAILED: Vendor '{vendor}' produced no results")
 
-    # Final result summary
-    if not results:
-        print(f"FAILURE: All {vendor_attempt_count} vendor attempts failed for method '{method}'")
-        raise RuntimeError(f"All vendor implementations failed for method '{method}'")
-    else:
-        print(f"FINAL: Method '{method}' completed with {len(results)} result(s) from {vendor_attempt_count} vendor attempt(s)")
-
-    # Return single result if only one, otherwise concatenate as string
-    if len(results) == 1:
-        return results[0]
-    else:
-        # Convert all results to strings and concatenate
-        return '\n'.join(str(result) for result in results)
\ No newline at end of file
+    return combine_vendor_results(method, results, vendor_attempt_count)
@@ -5,8 +5,12 @@ from .config import DATA_DIR
 from datetime import datetime
 from dateutil.relativedelta import relativedelta
 import json
-from .reddit_utils import fetch_top_from_category
-from tqdm import tqdm
+import bisect
+import threading
+from collections import OrderedDict
+from .reddit_utils import fetch_top_from_category_range
+from .price_store import load_prices
+from .simfin_store import get_simfin_statements
 
 def get_YFin_data_window(
     symbol: Annotated[str, "ticker symbol of the company"],
@@ -18,25 +22,17 @@ def get_YFin_data_window(
     before = date_obj - relativedelta(days=look_back_days)
     start_date = before.strftime("%Y-%m-%d")
 
-    # read in data
-    data = pd.read_csv(
+    # read in data between the start and end dates (inclusive)
+    filtered_data = load_prices(
+        symbol,
         os.path.join(
             DATA_DIR,
             f"market_data/price_data/{symbol}-YFin-data-2015-01-01-2025-03-25.csv",
-        )
+        ),
+        start_date,
+        curr_date,
     )
 
-    # Extract just the date part for comparison
-    data["DateOnly"] = data["Date"].str[:10]
-
-    # Filter data between the start and end dates (inclusive)
-    filtered_data = data[
-        (data["DateOnly"] >= start_date) & (data["DateOnly"] <= curr_date)
-    ]
-
-    # Drop the temporary column we created
-    filtered_data = filtered_data.drop("DateOnly", axis=1)
-
     # Set pandas display options to show the full DataFrame
     with pd.option_context(
         "display.max_rows", None, "display.max_columns", None, "display.width", None
@@ -53,32 +49,21 @@ def get_YFin_data(
     start_date: Annotated[str, "Start date in yyyy-mm-dd format"],
     end_date: Annotated[str, "End date in yyyy-mm-dd format"],
 ) -> str:
-    # read in data
-    data = pd.read_csv(
-        os.path.join(
-            DATA_DIR,
-            f"market_data/price_data/{symbol}-YFin-data-2015-01-01-2025-03-25.csv",
-        )
-    )
-
     if end_date > "2025-03-25":
         raise Exception(
             f"Get_YFin_Data: {end_date} is outside of the data range of 2015-01-01 to 2025-03-25"
         )
 
-    # Extract just the date part for comparison
-    data["DateOnly"] = data["Date"].str[:10]
-
-    # Filter data between the start and end dates (inclusive)
-    filtered_data = data[
-        (data["DateOnly"] >= start_date) & (data["DateOnly"] <= end_date)
-    ]
-
-    # Drop the temporary column we created
-    filtered_data = filtered_data.drop("DateOnly", axis=1)
-
-    # remove the index from the dataframe
-    filtered_data = filtered_data.reset_index(drop=True)
+    # read in data between the start and end dates (inclusive)
+    filtered_data = load_prices(
+        symbol,
+        os.path.join(
+            DATA_DIR,
+            f"market_data/price_data/{symbol}-YFin-data-2015-01-01-2025-03-25.csv",
+        ),
+        start_date,
+        end_date,
+    )
 
     return filtered_data
 
@@ -140,12 +125,8 @@ def get_finnhub_company_insider_sentiment(
         return ""
 
     result_str = ""
-    seen_dicts = []
-    for date, senti_list in data.items():
-        for entry in senti_list:
-            if entry not in seen_dicts:
-                result_str += f"### {entry['year']}-{entry['month']}:\nChange: {entry['change']}\nMonthly Share Purchase Ratio: {entry['mspr']}\n\n"
-                seen_dicts.append(entry)
+    for entry in _unique_entries(data):
+        result_str += f"### {entry['year']}-{entry['month']}:\nChange: {entry['change']}\nMonthly Share Purchase Ratio: {entry['mspr']}\n\n"
 
     return (
         f"## {ticker} Insider Sentiment Data for {before} to {curr_date}:\n"
@@ -178,12 +159,8 @@ def get_finnhub_company_insider_transactions(
 
     result_str = ""
 
-    seen_dicts = []
-    for date, senti_list in data.items():
-        for entry in senti_list:
-            if entry not in seen_dicts:
-                result_str += f"### Filing Date: {entry['filingDate']}, {entry['name']}:\nChange:{entry['change']}\nShares: {entry['share']}\nTransaction Price: {entry['transactionPrice']}\nTransaction Code: {entry['transactionCode']}\n\n"
-                seen_dicts.append(entry)
+    for entry in _unique_entries(data):
+        result_str += f"### Filing Date: {entry['filingDate']}, {entry['name']}:\nChange:{entry['change']}\nShares: {entry['share']}\nTransaction Price: {entry['transactionPrice']}\nTransaction Code: {entry['transactionCode']}\n\n"
 
     return (
         f"## {ticker} insider transactions from {before} to {curr_date}:\n"
@@ -214,15 +191,63 @@ def get_data_in_range(ticker, start_date, end_date, data_type, data_dir, period=
             data_dir, "finnhub_data", data_type, f"{ticker}_data_formatted.json"
         )
 
-    data = open(data_path, "r")
-    data = json.load(data)
+    return _load_finnhub_dataset(data_path).in_range(start_date, end_date)
 
-    # filter keys (date, str in format YYYY-MM-DD) by the date range (str, str in format YYYY-MM-DD)
-    filtered_data = {}
-    for key, value in data.items():
-        if start_date <= key <= end_date and len(value) > 0:
-            filtered_data[key] = value
-    return filtered_data
+
+class _FinnhubDataset:
+    """A parsed finnhub json file with its date keys kept sorted for bisect."""
+
+    def __init__(self, data: dict):
+        self.data = data
+        self.keys = sorted(data)
+        self.position = {key: i for i, key in enumerate(data)}
+
+    def in_range(self, start_date, end_date):
+        # filter keys (date, str in format YYYY-MM-DD) by the date range (str, str in format YYYY-MM-DD)
+        keys = self.keys[
+            bisect.bisect_left(self.keys, start_date) : bisect.bisect_right(
+                self.keys, end_date
+            )
+        ]
+        # keep the file's key order
+        keys.sort(key=self.position.__getitem__)
+        return {key: self.data[key] for key in keys if len(self.data[key]) > 0}
+
+
+_FINNHUB_CACHE_SIZE = 64  # parsed (ticker, data_type) files kept in memory
+_finnhub_cache = OrderedDict()  # data_path -> (mtime, _FinnhubDataset)
+_finnhub_cache_lock = threading.Lock()
+
+
+def _load_finnhub_dataset(data_path):
+    """Parse a finnhub json file once, reusing it until the file changes."""
+    mtime = os.path.getmtime(data_path)
+    with _finnhub_cache_lock:
+        cached = _finnhub_cache.get(data_path)
+        if cached is not None and cached[0] == mtime:
+            _finnhub_cache.move_to_end(data_path)
+            return cached[1]
+
+    with open(data_path, "r") as f:
+        dataset = _FinnhubDataset(json.load(f))
+
+    with _finnhub_cache_lock:
+        _finnhub_cache[data_path] = (mtime, dataset)
+        _finnhub_cache.move_to_end(data_path)
+        while len(_finnhub_cache) > _FINNHUB_CACHE_SIZE:
+            _finnhub_cache.popitem(last=False)
+    return dataset
+
+
+def _unique_entries(data):
+    """Entries of a date -> entries mapping, dropping exact duplicates."""
+    seen = set()
+    for entries in data.values():
+        for entry in entries:
+            entry_key = json.dumps(entry, sort_keys=True, default=str)
+            if entry_key not in seen:
+                seen.add(entry_key)
+                yield entry
 
 def get_simfin_balance_sheet(
     ticker: Annotated[str, "ticker symbol"],
@@ -241,26 +266,17 @@ def get_simfin_balance_sheet(
         "us",
         f"us-balance-{freq}.csv",
     )
-    df = pd.read_csv(data_path, sep=";")
-
-    # Convert date strings to datetime objects and remove any time components
-    df["Report Date"] = pd.to_datetime(df["Report Date"], utc=True).dt.normalize()
-    df["Publish Date"] = pd.to_datetime(df["Publish Date"], utc=True).dt.normalize()
-
-    # Convert the current date to datetime and normalize
-    curr_date_dt = pd.to_datetime(curr_date, utc=True).normalize()
+    # Parsed once per process and partitioned by ticker
+    statements = get_simfin_statements(data_path)
 
-    # Filter the DataFrame for the given ticker and for reports that were published on or before the current date
-    filtered_df = df[(df["Ticker"] == ticker) & (df["Publish Date"] <= curr_date_dt)]
+    # Get the most recent balance sheet published on or before the current date
+    latest_balance_sheet = statements.latest(ticker, curr_date)
 
     # Check if there are any available reports; if not, return a notification
-    if filtered_df.empty:
+    if latest_balance_sheet is None:
         print("No balance sheet available before the given current date.")
         return ""
 
-    # Get the most recent balance sheet by selecting the row with the latest Publish Date
-    latest_balance_sheet = filtered_df.loc[filtered_df["Publish Date"].idxmax()]
-
     # drop the SimFinID column
     latest_balance_sheet = latest_balance_sheet.drop("SimFinId")
 
@@ -288,26 +304,17 @@ def get_simfin_cashflow(
         "us",
         f"us-cashflow-{freq}.csv",
     )
-    df = pd.read_csv(data_path, sep=";")
-
-    # Convert date strings to datetime objects and remove any time components
-    df["Report Date"] = pd.to_datetime(df["Report Date"], utc=True).dt.normalize()
-    df["Publish Date"] = pd.to_datetime(df["Publish Date"], utc=True).dt.normalize()
+    # Parsed once per process and partitioned by ticker
+    statements = get_simfin_statements(data_path)
 
-    # Convert the current date to datetime and normalize
-    curr_date_dt = pd.to_datetime(curr_date, utc=True).normalize()
-
-    # Filter the DataFrame for the given ticker and for reports that were published on or before the current date
-    filtered_df = df[(df["Ticker"] == ticker) & (df["Publish Date"] <= curr_date_dt)]
+    # Get the most recent cash flow statement published on or before the current date
+    latest_cash_flow = statements.latest(ticker, curr_date)
 
     # Check if there are any available reports; if not, return a notification
-    if filtered_df.empty:
+    if latest_cash_flow is None:
         print("No cash flow statement available before the given current date.")
         return ""
 
-    # Get the most recent cash flow statement by selecting the row with the latest Publish Date
-    latest_cash_flow = filtered_df.loc[filtered_df["Publish Date"].idxmax()]
-
     # drop the SimFinID column
     latest_cash_flow = latest_cash_flow.drop("SimFinId")
 
@@ -335,26 +342,17 @@ def get_simfin_income_statements(
         "us",
         f"us-income-{freq}.csv",
     )
-    df = pd.read_csv(data_path, sep=";")
-
-    # Convert date strings to datetime objects and remove any time components
-    df["Report Date"] = pd.to_datetime(df["Report Date"], utc=True).dt.normalize()
-    df["Publish Date"] = pd.to_datetime(df["Publish Date"], utc=True).dt.normalize()
+    # Parsed once per process and partitioned by ticker
+    statements = get_simfin_statements(data_path)
 
-    # Convert the current date to datetime and normalize
-    curr_date_dt = pd.to_datetime(curr_date, utc=True).normalize()
-
-    # Filter the DataFrame for the given ticker and for reports that were published on or before the current date
-    filtered_df = df[(df["Ticker"] == ticker) & (df["Publish Date"] <= curr_date_dt)]
+    # Get the most recent income statement published on or before the current date
+    latest_income = statements.latest(ticker, curr_date)
 
     # Check if there are any available reports; if not, return a notification
-    if filtered_df.empty:
+    if latest_income is None:
         print("No income statement available before the given current date.")
         return ""
 
-    # Get the most recent income statement by selecting the row with the latest Publish Date
-    latest_income = filtered_df.loc[filtered_df["Publish Date"].idxmax()]
-
     # drop the SimFinID column
     latest_income = latest_income.drop("SimFinId")
 
@@ -384,26 +382,14 @@ def get_reddit_global_news(
     before = curr_date_dt - relativedelta(days=look_back_days)
     before = before.strftime("%Y-%m-%d")
 
-    posts = []
-    # iterate from before to curr_date
-    curr_iter_date = datetime.strptime(before, "%Y-%m-%d")
-
-    total_iterations = (curr_date_dt - curr_iter_date).days + 1
-    pbar = tqdm(desc=f"Getting Global News on {curr_date}", total=total_iterations)
-
-    while curr_iter_date <= curr_date_dt:
-        curr_date_str = curr_iter_date.strftime("%Y-%m-%d")
-        fetch_result = fetch_top_from_category(
-            "global_news",
-            curr_date_str,
-            limit,
-            data_path=os.path.join(DATA_DIR, "reddit_data"),
-        )
-        posts.extend(fetch_result)
-        curr_iter_date += relativedelta(days=1)
-        pbar.update(1)
-
-    pbar.close()
+    # One indexed range query instead of rescanning every file once per day
+    posts = fetch_top_from_category_range(
+        "global_news",
+        before,
+        curr_date,
+        limit,
+        data_path=os.path.join(DATA_DIR, "reddit_data"),
+    )
 
     if len(posts) == 0:
         return ""
@@ -433,35 +419,18 @@ def get_reddit_company_news(
         str: A formatted string containing news articles posts on reddit
     """
 
-    start_date_dt = datetime.strptime(start_date, "%Y-%m-%d")
-    end_date_dt = datetime.strptime(end_date, "%Y-%m-%d")
+    datetime.strptime(start_date, "%Y-%m-%d")
+    datetime.strptime(end_date, "%Y-%m-%d")
 
-    posts = []
-    # iterate from start_date to end_date
-    curr_date = start_date_dt
-
-    total_iterations = (end_date_dt - curr_date).days + 1
-    pbar = tqdm(
-        desc=f"Getting Company News for {query} from {start_date} to {end_date}",
-        total=total_iterations,
+    posts = fetch_top_from_category_range(
+        "company_news",
+        start_date,
+        end_date,
+        10,  # max limit per day
+        query,
+        data_path=os.path.join(DATA_DIR, "reddit_data"),
     )
 
-    while curr_date <= end_date_dt:
-        curr_date_str = curr_date.strftime("%Y-%m-%d")
-        fetch_result = fetch_top_from_category(
-            "company_news",
-            curr_date_str,
-            10,  # max limit per day
-            query,
-            data_path=os.path.join(DATA_DIR, "reddit_data"),
-        )
-        posts.extend(fetch_result)
-        curr_date += relativedelta(days=1)
-
-        pbar.update(1)
-
-    pbar.close()
-
     if len(posts) == 0:
         return ""
 
@@ -0,0 +1,270 @@
+import glob
+import os
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+import yfinance as yf
+
+from .config import get_config
+
+HISTORY_YEARS = 15
+
+# Column order of yf.Ticker.history, which cached reads must reproduce
+HISTORY_COLUMNS = ["Date", "Open", "High", "Low", "Close", "Volume", "Dividends", "Stock Splits"]
+
+_symbol_locks = {}
+_symbol_locks_lock = threading.Lock()
+
+
+def _symbol_lock(symbol: str) -> threading.Lock:
+    with _symbol_locks_lock:
+        return _symbol_locks.setdefault(symbol, threading.Lock())
+
+
+def price_cache_path(symbol: str, cache_dir: Optional[str] = None) -> str:
+    """Path of a symbol's append-only daily price cache."""
+    cache_dir = cache_dir or get_config()["data_cache_dir"]
+    return os.path.join(cache_dir, f"{symbol.upper()}-YFin-data.csv")
+
+
+def _history_order(data: pd.DataFrame) -> pd.DataFrame:
+    """Columns in yf.Ticker.history order, extra ones (e.g. Capital Gains) last."""
+    columns = [column for column in HISTORY_COLUMNS if column in data.columns]
+    return data[columns + [column for column in data.columns if column not in columns]]
+
+
+def _download(symbol: str, start_date: str, end_date: str) -> pd.DataFrame:
+    data = yf.download(
+        symbol,
+        start=start_date,
+        end=end_date,
+        actions=True,
+        multi_level_index=False,
+        progress=False,
+        auto_adjust=True,
+    )
+    data = data.reset_index()
+    if not data.empty:
+        data["Date"] = pd.to_datetime(data["Date"]).dt.strftime("%Y-%m-%d")
+    return _history_order(data)
+
+
+def _has_actions(path: str) -> bool:
+    """Caches written before dividends and splits were stored lack these columns."""
+    return "Dividends" in pd.read_csv(path, nrows=0).columns
+
+
+def _drop_outdated(path: str):
+    """Remove a cache without dividend and split columns so it is downloaded again."""
+    if os.path.exists(path) and not _has_actions(path):
+        os.remove(path)
+
+
+def _checked_today(path: str) -> bool:
+    """The cache file is touched on every refresh, so its mtime is the last check."""
+    return (
+        os.path.exists(path)
+        and datetime.fromtimestamp(os.path.getmtime(path)).date()
+        == datetime.now().date()
+    )
+
+
+def remove_stale_files(symbol: str, cache_dir: Optional[str] = None):
+    """Delete the old rolling `{symbol}-YFin-data-{today-15y}-{today}.csv` files.
+
+    Only files spanning exactly the rolling window are removed, so fixed-range
+    offline files (e.g. 2015-01-01-2025-03-25) are kept.
+    """
+    cache_dir = cache_dir or get_config()["data_cache_dir"]
+    prefix = f"{symbol}-YFin-data-"
+    for path in glob.glob(os.path.join(cache_dir, f"{glob.escape(prefix)}*.csv")):
+        date_range = os.path.basename(path)[len(prefix) : -len(".csv")]
+        try:
+            start_date = pd.Timestamp(date_range[:10])
+            end_date = pd.Timestamp(date_range[11:])
+        except ValueError:
+            continue
+        if start_date == end_date - pd.DateOffset(years=HISTORY_YEARS):
+            os.remove(path)
+
+
+def _append_tail(symbol: str, path: str, tail: pd.DataFrame) -> bool:
+    """Append the bars after the last cached one.
+
+    The tail starts at the last cached bar, so a successful download is never
+    empty. An empty tail means the download failed (network error or rate
+    limit); the cache is then left untouched, so it is not marked as checked
+    today and the next call retries.
+
+    Returns False (and removes the cache) when the overlapping bar shows that
+    the adjusted history changed and must be downloaded again.
+    """
+    if tail.empty:
+        print(f"DEBUG: {symbol} price tail download failed, keeping the cached bars")
+        return True
+
+    cached = pd.read_csv(path)
+    last_bar = cached.iloc[-1]
+
+    overlap = tail[tail["Date"] == last_bar["Date"]]
+    new_bars = tail[tail["Date"] > last_bar["Date"]]
+    if not overlap.empty and not np.isclose(
+        overlap["Close"].iloc[0], last_bar["Close"], rtol=1e-4
+    ):
+        print(f"DEBUG: {symbol} history was re-adjusted, downloading it again")
+        os.remove(path)
+        return False
+
+    if not new_bars.empty:
+        new_bars[cached.columns].to_csv(path, mode="a", header=False, index=False)
+    else:
+        # Nothing new (weekend or holiday), just record the check
+        os.utime(path)
+    return True
+
+
+def _write_history(symbol: str, path: str, data: pd.DataFrame):
+    if data.empty:
+        raise Exception(f"No price data found for symbol '{symbol}'")
+    data.to_csv(path, index=False)
+
+
+def _last_cached_date(path: str) -> str:
+    return pd.read_csv(path, usecols=["Date"])["Date"].iloc[-1]
+
+
+def _history_start(today: pd.Timestamp) -> str:
+    return (today - pd.DateOffset(years=HISTORY_YEARS)).strftime("%Y-%m-%d")
+
+
+def refresh_price_cache(symbol: str, cache_dir: Optional[str] = None) -> str:
+    """Bring a symbol's daily price cache up to date and return its path.
+
+    The cache has the columns of yf.Ticker.history, including dividends and
+    stock splits. The first call downloads the last 15 years. Later calls download only the
+    bars after the last cached one and append them. The tail request overlaps
+    the last cached bar; if its adjusted close moved (a split or dividend
+    re-adjusted the history) the full history is downloaded again instead.
+    """
+    cache_dir = cache_dir or get_config()["data_cache_dir"]
+    os.makedirs(cache_dir, exist_ok=True)
+    path = price_cache_path(symbol, cache_dir)
+
+    with _symbol_lock(symbol.upper()):
+        _drop_outdated(path)
+        if _checked_today(path):
+            return path
+
+        # yfinance treats the end date as exclusive
+        today = pd.Timestamp.today().normalize()
+        end_date = today.strftime("%Y-%m-%d")
+
+        if os.path.exists(path):
+            tail = _download(symbol, _last_cached_date(path), end_date)
+            _append_tail(symbol, path, tail)
+
+        if not os.path.exists(path):
+            _write_history(symbol, path, _download(symbol, _history_start(today), end_date))
+
+        remove_stale_files(symbol, cache_dir)
+
+    return path
+
+
+def _download_many(symbols: List[str], start_date: str, end_date: str) -> Dict[str, pd.DataFrame]:
+    """Download several symbols in one batched, threaded yf.download call."""
+    data = yf.download(
+        symbols,
+        start=start_date,
+        end=end_date,
+        actions=True,
+        group_by="ticker",
+        progress=False,
+        auto_adjust=True,
+        threads=True,
+    )
+
+    frames = {}
+    for symbol in symbols:
+        if data.empty or symbol not in data.columns.get_level_values(0):
+            frames[symbol] = pd.DataFrame()
+            continue
+        frame = data[symbol].dropna(how="all").reset_index()
+        frame.columns.name = None
+        if not frame.empty:
+            frame["Date"] = pd.to_datetime(frame["Date"]).dt.strftime("%Y-%m-%d")
+        frames[symbol] = _history_order(frame)
+    return frames
+
+
+def prefetch_prices(symbols: List[str], cache_dir: Optional[str] = None) -> List[str]:
+    """Fill the price cache for many symbols ahead of a batch run.
+
+    Symbols already cached get their missing tails in one batched download
+    starting at the oldest last-cached bar; new (or re-adjusted) symbols get
+    their full history in a second batched download. Symbols refreshed today
+    are skipped. Cached symbols whose tail download failed are left untouched
+    and refreshed on first use. Returns the new symbols that could not be
+    fetched.
+    """
+    cache_dir = cache_dir or get_config()["data_cache_dir"]
+    os.makedirs(cache_dir, exist_ok=True)
+
+    today = pd.Timestamp.today().normalize()
+    end_date = today.strftime("%Y-%m-%d")
+
+    symbols = sorted({symbol.upper() for symbol in symbols})
+    paths = {symbol: price_cache_path(symbol, cache_dir) for symbol in symbols}
+    for symbol in symbols:
+        with _symbol_lock(symbol):
+            _drop_outdated(paths[symbol])
+    pending = [symbol for symbol in symbols if not _checked_today(paths[symbol])]
+    if not pending:
+        return []
+
+    retry = []
+    stale = [symbol for symbol in pending if os.path.exists(paths[symbol])]
+    if stale:
+        start_date = min(_last_cached_date(paths[symbol]) for symbol in stale)
+        tails = _download_many(stale, start_date, end_date)
+        for symbol in stale:
+            if tails[symbol].empty:
+                # Failed download: leave the file unchecked, refresh_price_cache retries
+                retry.append(symbol)
+                continue
+            with _symbol_lock(symbol):
+                # The batch starts at the oldest symbol's last bar
+                tail = tails[symbol]
+                tail = tail[tail["Date"] >= _last_cached_date(paths[symbol])]
+                _append_tail(symbol, paths[symbol], tail)
+
+    failed = []
+    missing = [symbol for symbol in pending if not os.path.exists(paths[symbol])]
+    if missing:
+        histories = _download_many(missing, _history_start(today), end_date)
+        for symbol in missing:
+            with _symbol_lock(symbol):
+                try:
+                    _write_history(symbol, paths[symbol], histories[symbol])
+                except Exception as e:
+                    print(f"FAILED: price prefetch for {symbol}: {e}")
+                    failed.append(symbol)
+
+    for symbol in pending:
+        remove_stale_files(symbol, cache_dir)
+
+    if retry:
+        print(f"FAILED: price prefetch for {', '.join(retry)}, refreshed on first use instead")
+
+    print(
+        f"SUCCESS: prefetched prices for {len(pending) - len(failed) - len(retry)} of {len(pending)} symbols"
+    )
+    return failed
+
+
+def load_price_cache(symbol: str, cache_dir: Optional[str] = None) -> pd.DataFrame:
+    """Refresh a symbol's price cache and load it (Date as yyyy-mm-dd strings)."""
+    return pd.read_csv(refresh_price_cache(symbol, cache_dir))
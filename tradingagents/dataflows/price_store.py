@@ -0,0 +1,229 @@
+import glob
+import hashlib
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+
+from .config import get_config
+
+_partition_locks = {}  # partition directory -> lock
+_partition_locks_guard = threading.Lock()
+
+
+def _partition_lock(symbol_dir: str) -> threading.RLock:
+    """Lock serializing imports and swaps of one partition within the process."""
+    with _partition_locks_guard:
+        return _partition_locks.setdefault(symbol_dir, threading.RLock())
+
+
+class PriceStore:
+    """Columnar OHLCV store backed by memory-mapped NumPy arrays.
+
+    Each partition is a directory holding one `.npy` file per column plus a
+    sorted `Date.npy` index (datetime64[D]). Range lookups binary-search the
+    date index and only touch the requested slice of each column, instead of
+    parsing the whole CSV history on every call.
+
+    Partitions imported from a CSV are keyed by symbol and source file, and the
+    manifest records the source's mtime and size so a rewritten CSV is
+    re-imported.
+    """
+
+    MANIFEST = "columns.json"
+
+    def __init__(self, root: str):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+
+    def _symbol_dir(self, symbol: str, source: Optional[str] = None) -> str:
+        name = symbol.upper()
+        if source:
+            digest = hashlib.sha1(os.path.abspath(source).encode("utf-8")).hexdigest()
+            name = f"{name}-{digest[:12]}"
+        return os.path.join(self.root, name)
+
+    def _manifest(self, symbol: str, source: Optional[str] = None) -> dict:
+        with open(os.path.join(self._symbol_dir(symbol, source), self.MANIFEST)) as f:
+            manifest = json.load(f)
+        # Partitions written before sources were tracked only list their columns
+        return {"columns": manifest} if isinstance(manifest, list) else manifest
+
+    @staticmethod
+    def _source_stamp(source: str) -> dict:
+        stat = os.stat(source)
+        return {"source_mtime": stat.st_mtime, "source_size": stat.st_size}
+
+    def has(self, symbol: str, source: Optional[str] = None) -> bool:
+        """Check whether a symbol has been imported."""
+        return os.path.exists(
+            os.path.join(self._symbol_dir(symbol, source), self.MANIFEST)
+        )
+
+    def is_current(self, symbol: str, source: str) -> bool:
+        """Check whether a symbol was imported from the current version of source."""
+        if not self.has(symbol, source):
+            return False
+        manifest = self._manifest(symbol, source)
+        return all(
+            manifest.get(key) == value
+            for key, value in self._source_stamp(source).items()
+        )
+
+    def write(
+        self,
+        symbol: str,
+        data: pd.DataFrame,
+        source: Optional[str] = None,
+        stamp: Optional[dict] = None,
+    ):
+        """Replace a symbol's history with a DataFrame that has a Date column.
+
+        `stamp` holds the source file's mtime and size at the time it was read.
+        """
+        data = data.copy()
+        data["Date"] = pd.to_datetime(data["Date"].astype(str).str[:10])
+        data = data.sort_values("Date").drop_duplicates("Date", keep="last")
+
+        columns = [column for column in data.columns if column != "Date"]
+
+        symbol_dir = self._symbol_dir(symbol, source)
+        # Unique per call, so concurrent writers never share a temp dir
+        tmp_dir = tempfile.mkdtemp(
+            dir=self.root, prefix=f".{os.path.basename(symbol_dir)}.tmp-"
+        )
+
+        np.save(
+            os.path.join(tmp_dir, "Date.npy"),
+            data["Date"].values.astype("datetime64[D]"),
+        )
+        for column in columns:
+            values = pd.to_numeric(data[column], errors="coerce").to_numpy()
+            np.save(os.path.join(tmp_dir, f"{column}.npy"), values)
+        with open(os.path.join(tmp_dir, self.MANIFEST), "w") as f:
+            json.dump(
+                {
+                    "columns": columns,
+                    "source": os.path.abspath(source) if source else None,
+                    **(stamp or {}),
+                },
+                f,
+            )
+
+        # Swap the new partition in place of the old one
+        with _partition_lock(symbol_dir):
+            old_dir = f"{tmp_dir}.old"
+            if os.path.exists(symbol_dir):
+                os.rename(symbol_dir, old_dir)
+            os.rename(tmp_dir, symbol_dir)
+        shutil.rmtree(old_dir, ignore_errors=True)
+
+    def load(
+        self,
+        symbol: str,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        source: Optional[str] = None,
+    ) -> pd.DataFrame:
+        """Load the rows between start_date and end_date (inclusive, yyyy-mm-dd).
+
+        Dates are returned as yyyy-mm-dd strings in the Date column.
+        """
+        symbol_dir = self._symbol_dir(symbol, source)
+        columns = self._manifest(symbol, source)["columns"]
+
+        dates = np.load(os.path.join(symbol_dir, "Date.npy"), mmap_mode="r")
+        lo = (
+            np.searchsorted(dates, np.datetime64(start_date, "D"), side="left")
+            if start_date
+            else 0
+        )
+        hi = (
+            np.searchsorted(dates, np.datetime64(end_date, "D"), side="right")
+            if end_date
+            else len(dates)
+        )
+
+        data = {"Date": pd.DatetimeIndex(dates[lo:hi]).strftime("%Y-%m-%d")}
+        for column in columns:
+            values = np.load(os.path.join(symbol_dir, f"{column}.npy"), mmap_mode="r")
+            data[column] = np.array(values[lo:hi])
+
+        return pd.DataFrame(data)
+
+    def last_date(self, symbol: str, source: Optional[str] = None) -> Optional[str]:
+        """Date of the most recent stored bar, or None if the symbol is empty."""
+        dates = np.load(
+            os.path.join(self._symbol_dir(symbol, source), "Date.npy"), mmap_mode="r"
+        )
+        if len(dates) == 0:
+            return None
+        return str(dates[-1])
+
+    def import_csv(self, symbol: str, csv_path: str):
+        """Import a `{symbol}-YFin-data-*.csv` file into the store."""
+        # Stamp before reading, so a rewrite during the import triggers another
+        stamp = self._source_stamp(csv_path)
+        self.write(symbol, pd.read_csv(csv_path), source=csv_path, stamp=stamp)
+
+
+def get_price_store() -> PriceStore:
+    """Get the price store for the current configuration."""
+    config = get_config()
+    return PriceStore(
+        config.get("price_store_dir")
+        or os.path.join(config["data_cache_dir"], "price_store")
+    )
+
+
+def load_prices(
+    symbol: str,
+    csv_path: str,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+) -> pd.DataFrame:
+    """Load a date range from the price store.
+
+    `csv_path` is imported on first use and re-imported whenever it changed.
+    """
+    store = get_price_store()
+    # Concurrent first use imports once; reads never see a half-swapped partition
+    with _partition_lock(store._symbol_dir(symbol, csv_path)):
+        if not store.is_current(symbol, csv_path):
+            store.import_csv(symbol, csv_path)
+        return store.load(symbol, start_date, end_date, source=csv_path)
+
+
+def import_csv_cache(csv_dir: str, store: Optional[PriceStore] = None) -> List[str]:
+    """Convert every `{symbol}-YFin-data-*.csv` in csv_dir into the price store.
+
+    When a symbol has several CSV files the most recently modified one is used.
+    Returns the imported symbols.
+    """
+    store = store or get_price_store()
+
+    latest_files = {}
+    for csv_path in glob.glob(os.path.join(csv_dir, "*-YFin-data-*.csv")):
+        symbol = os.path.basename(csv_path).split("-YFin-data-")[0]
+        if symbol not in latest_files or os.path.getmtime(csv_path) > os.path.getmtime(
+            latest_files[symbol]
+        ):
+            latest_files[symbol] = csv_path
+
+    for symbol, csv_path in sorted(latest_files.items()):
+        store.import_csv(symbol, csv_path)
+        print(f"Imported {symbol} from {os.path.basename(csv_path)}")
+
+    return sorted(latest_files)
+
+
+if __name__ == "__main__":
+    # Usage: python -m tradingagents.dataflows.price_store <csv_dir> [<csv_dir> ...]
+    for directory in sys.argv[1:] or [get_config()["data_cache_dir"]]:
+        import_csv_cache(directory)
@@ -1,11 +1,16 @@
 import requests
 import time
 import json
+import sqlite3
+import threading
+from collections import defaultdict
+from functools import lru_cache
 from datetime import datetime, timedelta
 from contextlib import contextmanager
-from typing import Annotated
+from typing import Annotated, Dict, Iterator, List, Optional, Tuple
 import os
 import re
+from .config import get_config
 
 ticker_to_company = {
     "AAPL": "Apple",
@@ -49,87 +54,337 @@ ticker_to_company = {
 }
 
 
-def fetch_top_from_category(
+def company_names() -> Dict[str, str]:
+    """Ticker -> company names ("Name OR Alias"), extended by the
+    "reddit_company_names" config entry."""
+    return {**ticker_to_company, **get_config().get("reddit_company_names", {})}
+
+
+def company_search_terms(query: str) -> str:
+    """Search terms for a ticker as one " OR "-separated string.
+
+    Tickers without a known company name are searched by the ticker alone.
+    """
+    names = company_names().get(query)
+    return f"{names} OR {query}" if names else query
+
+
+# Terms this short (tickers like V or X) match inside almost any post, so they
+# only match as uppercase words ("V", "$V"), not within "Visa" or as "v"
+SHORT_TERM_LENGTH = 2
+
+
+def _term_pattern(term: str) -> str:
+    if len(term.strip()) <= SHORT_TERM_LENGTH:
+        return rf"(?-i:\b{re.escape(term.strip())}\b)"
+    return f"(?:{term})"
+
+
+@lru_cache(maxsize=None)
+def _compile_terms(terms: str) -> re.Pattern:
+    """One case-insensitive pattern matching any of the search terms."""
+    return re.compile(
+        "|".join(_term_pattern(term) for term in terms.split(" OR ")), re.IGNORECASE
+    )
+
+
+def _mentions(parsed_line: dict, pattern: re.Pattern) -> bool:
+    return bool(
+        pattern.search(parsed_line["title"]) or pattern.search(parsed_line["selftext"])
+    )
+
+
+class RedditIndex:
+    """SQLite index of the posts in the reddit `.jsonl` files.
+
+    Each post is stored as (subreddit file, date, upvotes, byte offset), so a
+    date range query only seeks to and parses matching posts. For company
+    news, a mentions table maps posts to the tickers whose search terms they
+    match; a ticker's mentions in a file are matched when it is first
+    queried. Files are re-indexed when their size or modification time
+    changes.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS files (
+                    path TEXT PRIMARY KEY,
+                    size INTEGER NOT NULL,
+                    mtime REAL NOT NULL
+                )
+                """
+            )
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS posts (
+                    path TEXT NOT NULL,
+                    post_date TEXT NOT NULL,
+                    created_utc REAL NOT NULL,
+                    ups INTEGER NOT NULL,
+                    offset INTEGER NOT NULL,
+                    length INTEGER NOT NULL
+                )
+                """
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_posts_path_date ON posts (path, post_date, ups DESC)"
+            )
+            # Which tickers (with which compiled search pattern) have been
+            # matched per file
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS mention_terms (
+                    path TEXT NOT NULL,
+                    ticker TEXT NOT NULL,
+                    terms TEXT NOT NULL,
+                    PRIMARY KEY (path, ticker)
+                )
+                """
+            )
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS mentions (
+                    path TEXT NOT NULL,
+                    ticker TEXT NOT NULL,
+                    offset INTEGER NOT NULL
+                )
+                """
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_mentions ON mentions (path, ticker, offset)"
+            )
+
+    @contextmanager
+    def _connect(self):
+        """Open a connection that commits on success and is always closed."""
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def sync(self, paths: List[str], tickers: Optional[Dict[str, str]] = None):
+        """Index new or changed files.
+
+        tickers maps ticker -> search terms of the tickers being queried;
+        their mentions are matched in any file not yet matched with them.
+        """
+        tickers = tickers or {}
+        with self._lock, self._connect() as conn:
+            for path in paths:
+                stat = os.stat(path)
+                row = conn.execute(
+                    "SELECT size, mtime FROM files WHERE path = ?", (path,)
+                ).fetchone()
+                if row != (stat.st_size, stat.st_mtime):
+                    print(f"DEBUG: Indexing reddit posts in {path}")
+                    for table in ("posts", "mentions", "mention_terms"):
+                        conn.execute(f"DELETE FROM {table} WHERE path = ?", (path,))
+                    conn.executemany(
+                        "INSERT INTO posts VALUES (?, ?, ?, ?, ?, ?)",
+                        (
+                            (
+                                path,
+                                datetime.utcfromtimestamp(
+                                    parsed_line["created_utc"]
+                                ).strftime("%Y-%m-%d"),
+                                parsed_line["created_utc"],
+                                parsed_line["ups"],
+                                offset,
+                                length,
+                            )
+                            for offset, length, parsed_line in self._scan(path)
+                        ),
+                    )
+                    conn.execute(
+                        "INSERT OR REPLACE INTO files VALUES (?, ?, ?)",
+                        (path, stat.st_size, stat.st_mtime),
+                    )
+
+                indexed = dict(
+                    conn.execute(
+                        "SELECT ticker, terms FROM mention_terms WHERE path = ?",
+                        (path,),
+                    ).fetchall()
+                )
+                # Comparing the compiled patterns also re-matches mentions
+                # after the matching rules change
+                missing = {
+                    ticker: terms
+                    for ticker, terms in tickers.items()
+                    if indexed.get(ticker) != _compile_terms(terms).pattern
+                }
+                if missing:
+                    self._index_mentions(conn, path, missing)
+
+    def _index_mentions(self, conn, path: str, tickers: Dict[str, str]):
+        patterns = {ticker: _compile_terms(terms) for ticker, terms in tickers.items()}
+        conn.executemany(
+            "DELETE FROM mentions WHERE path = ? AND ticker = ?",
+            [(path, ticker) for ticker in tickers],
+        )
+        conn.executemany(
+            "INSERT INTO mentions VALUES (?, ?, ?)",
+            (
+                (path, ticker, offset)
+                for offset, _, parsed_line in self._scan(path)
+                for ticker, pattern in patterns.items()
+                if _mentions(parsed_line, pattern)
+            ),
+        )
+        conn.executemany(
+            "INSERT OR REPLACE INTO mention_terms VALUES (?, ?, ?)",
+            [(path, ticker, pattern.pattern) for ticker, pattern in patterns.items()],
+        )
+
+    @staticmethod
+    def _scan(path: str) -> Iterator[Tuple[int, int, dict]]:
+        """(offset, length, parsed post) for every non-empty line."""
+        offset = 0
+        with open(path, "rb") as f:
+            for line in f:
+                if line.strip():
+                    yield offset, len(line), json.loads(line)
+                offset += len(line)
+
+    def query(
+        self, path: str, start_date: str, end_date: str, ticker: Optional[str] = None
+    ) -> List[Tuple[str, int, int]]:
+        """(post_date, offset, length) of a file's posts between two dates
+        (inclusive), ordered by date and then by upvotes, highest first.
+
+        With a ticker, only posts mentioning it are returned (the file must
+        have been synced with that ticker).
+        """
+        with self._connect() as conn:
+            if ticker is None:
+                return conn.execute(
+                    """
+                    SELECT post_date, offset, length FROM posts
+                    WHERE path = ? AND post_date BETWEEN ? AND ?
+                    ORDER BY post_date, ups DESC, offset
+                    """,
+                    (path, start_date, end_date),
+                ).fetchall()
+            return conn.execute(
+                """
+                SELECT p.post_date, p.offset, p.length FROM posts p
+                JOIN mentions m ON m.path = p.path AND m.offset = p.offset
+                WHERE p.path = ? AND m.ticker = ? AND p.post_date BETWEEN ? AND ?
+                ORDER BY p.post_date, p.ups DESC, p.offset
+                """,
+                (path, ticker, start_date, end_date),
+            ).fetchall()
+
+
+_reddit_index: Optional[RedditIndex] = None
+_reddit_index_lock = threading.Lock()
+
+
+def get_reddit_index() -> RedditIndex:
+    """Get the reddit index stored in the configured data cache directory."""
+    global _reddit_index
+
+    path = os.path.join(get_config()["data_cache_dir"], "reddit_index.sqlite")
+    with _reddit_index_lock:
+        if _reddit_index is None or _reddit_index.path != path:
+            _reddit_index = RedditIndex(path)
+        return _reddit_index
+
+
+def fetch_top_from_category_range(
     category: Annotated[
         str, "Category to fetch top post from. Collection of subreddits."
     ],
-    date: Annotated[str, "Date to fetch top posts from."],
-    max_limit: Annotated[int, "Maximum number of posts to fetch."],
+    start_date: Annotated[str, "First date to fetch top posts from, yyyy-mm-dd."],
+    end_date: Annotated[str, "Last date to fetch top posts from, yyyy-mm-dd."],
+    max_limit: Annotated[int, "Maximum number of posts to fetch per day."],
     query: Annotated[str, "Optional query to search for in the subreddit."] = None,
     data_path: Annotated[
         str,
         "Path to the data folder. Default is 'reddit_data'.",
     ] = "reddit_data",
 ):
-    base_path = data_path
+    """Top posts of every day in a date range, in one pass over the index.
 
-    all_content = []
+    Returns the same posts, in the same order, as calling
+    fetch_top_from_category for each day in turn.
+    """
+    base_path = data_path
+    category_path = os.path.join(base_path, category)
+    data_files = os.listdir(category_path)
 
-    if max_limit < len(os.listdir(os.path.join(base_path, category))):
+    if max_limit < len(data_files):
         raise ValueError(
             "REDDIT FETCHING ERROR: max limit is less than the number of files in the category. Will not be able to fetch any posts"
         )
 
-    limit_per_subreddit = max_limit // len(
-        os.listdir(os.path.join(base_path, category))
-    )
-
-    for data_file in os.listdir(os.path.join(base_path, category)):
-        # check if data_file is a .jsonl file
-        if not data_file.endswith(".jsonl"):
-            continue
+    limit_per_subreddit = max_limit // len(data_files)
 
-        all_content_curr_subreddit = []
+    # check if data_file is a .jsonl file
+    paths = [
+        os.path.join(category_path, data_file)
+        for data_file in data_files
+        if data_file.endswith(".jsonl")
+    ]
 
-        with open(os.path.join(base_path, category, data_file), "rb") as f:
-            for i, line in enumerate(f):
-                # skip empty lines
-                if not line.strip():
-                    continue
+    # if is company_news, only keep posts whose title or content mention the company (query)
+    ticker = query if "company" in category and query else None
+    tickers = {ticker: company_search_terms(ticker)} if ticker else {}
 
-                parsed_line = json.loads(line)
+    index = get_reddit_index()
+    index.sync(paths, tickers)
 
-                # select only lines that are from the date
-                post_date = datetime.utcfromtimestamp(
-                    parsed_line["created_utc"]
-                ).strftime("%Y-%m-%d")
-                if post_date != date:
+    posts_by_date = defaultdict(list)
+    for path in paths:
+        taken = defaultdict(int)
+        with open(path, "rb") as f:
+            for post_date, offset, length in index.query(
+                path, start_date, end_date, ticker
+            ):
+                if taken[post_date] >= limit_per_subreddit:
                     continue
 
-                # if is company_news, check that the title or the content has the company's name (query) mentioned
-                if "company" in category and query:
-                    search_terms = []
-                    if "OR" in ticker_to_company[query]:
-                        search_terms = ticker_to_company[query].split(" OR ")
-                    else:
-                        search_terms = [ticker_to_company[query]]
-
-                    search_terms.append(query)
-
-                    found = False
-                    for term in search_terms:
-                        if re.search(
-                            term, parsed_line["title"], re.IGNORECASE
-                        ) or re.search(term, parsed_line["selftext"], re.IGNORECASE):
-                            found = True
-                            break
-
-                    if not found:
-                        continue
-
-                post = {
-                    "title": parsed_line["title"],
-                    "content": parsed_line["selftext"],
-                    "url": parsed_line["url"],
-                    "upvotes": parsed_line["ups"],
-                    "posted_date": post_date,
-                }
-
-                all_content_curr_subreddit.append(post)
+                f.seek(offset)
+                parsed_line = json.loads(f.read(length))
 
-        # sort all_content_curr_subreddit by upvote_ratio in descending order
-        all_content_curr_subreddit.sort(key=lambda x: x["upvotes"], reverse=True)
+                posts_by_date[post_date].append(
+                    {
+                        "title": parsed_line["title"],
+                        "content": parsed_line["selftext"],
+                        "url": parsed_line["url"],
+                        "upvotes": parsed_line["ups"],
+                        "posted_date": post_date,
+                    }
+                )
+                taken[post_date] += 1
 
-        all_content.extend(all_content_curr_subreddit[:limit_per_subreddit])
+    all_content = []
+    for post_date in sorted(posts_by_date):
+        all_content.extend(posts_by_date[post_date])
 
     return all_content
+
+
+def fetch_top_from_category(
+    category: Annotated[
+        str, "Category to fetch top post from. Collection of subreddits."
+    ],
+    date: Annotated[str, "Date to fetch top posts from."],
+    max_limit: Annotated[int, "Maximum number of posts to fetch."],
+    query: Annotated[str, "Optional query to search for in the subreddit."] = None,
+    data_path: Annotated[
+        str,
+        "Path to the data folder. Default is 'reddit_data'.",
+    ] = "reddit_data",
+):
+    return fetch_top_from_category_range(
+        category, date, date, max_limit, query, data_path
+    )
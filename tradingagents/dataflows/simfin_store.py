@@ -0,0 +1,67 @@
+import os
+import threading
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+class SimFinStatements:
+    """A SimFin statement file (e.g. `us-balance-annual.csv`) parsed once and
+    partitioned by ticker.
+
+    Each ticker's rows are sorted by Publish Date, so the latest report
+    published on or before a date is found with a binary search.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+
+        df = pd.read_csv(path, sep=";")
+
+        # Convert date strings to datetime objects and remove any time components
+        df["Report Date"] = pd.to_datetime(df["Report Date"], utc=True).dt.normalize()
+        df["Publish Date"] = pd.to_datetime(df["Publish Date"], utc=True).dt.normalize()
+
+        # Stable sort keeps the file order among reports published the same day
+        df = df.sort_values(["Ticker", "Publish Date"], kind="mergesort")
+
+        self._tickers: Dict[str, Tuple[np.ndarray, pd.DataFrame]] = {
+            ticker: (
+                rows["Publish Date"].dt.tz_localize(None).to_numpy(),
+                rows,
+            )
+            for ticker, rows in df.groupby("Ticker", sort=False)
+        }
+
+    def latest(self, ticker: str, curr_date: str) -> Optional[pd.Series]:
+        """The most recent report published on or before curr_date, or None."""
+        if ticker not in self._tickers:
+            return None
+        publish_dates, rows = self._tickers[ticker]
+
+        curr_date_dt = np.datetime64(
+            pd.to_datetime(curr_date, utc=True).normalize().tz_localize(None)
+        )
+        pos = np.searchsorted(publish_dates, curr_date_dt, side="right")
+        if pos == 0:
+            return None
+
+        # Like idxmax, prefer the first row among those with the latest Publish Date
+        first = np.searchsorted(publish_dates, publish_dates[pos - 1], side="left")
+        return rows.iloc[first]
+
+
+_statements: Dict[str, Tuple[float, SimFinStatements]] = {}
+_statements_lock = threading.Lock()
+
+
+def get_simfin_statements(path: str) -> SimFinStatements:
+    """Load a SimFin statement file, reusing the parsed copy until the file changes."""
+    mtime = os.path.getmtime(path)
+    with _statements_lock:
+        cached = _statements.get(path)
+        if cached is None or cached[0] != mtime:
+            cached = (mtime, SimFinStatements(path))
+            _statements[path] = cached
+        return cached[1]
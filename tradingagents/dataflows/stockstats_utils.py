@@ -1,9 +1,125 @@
 import pandas as pd
-import yfinance as yf
 from stockstats import wrap
-from typing import Annotated
+from typing import Annotated, Callable, List
+from collections import OrderedDict
+import threading
 import os
 from .config import get_config, DATA_DIR
+from .price_store import load_prices
+from .price_cache import refresh_price_cache
+
+
+class _WrappedFrame:
+    """A stockstats-wrapped price history plus the lock guarding it.
+
+    stockstats adds indicator columns to the frame in place, so every
+    indicator computed once stays available to later calls.
+    """
+
+    def __init__(self, df, mtime):
+        self.df = df
+        self.mtime = mtime
+        self.lock = threading.Lock()
+
+
+def _file_mtime(path):
+    return os.path.getmtime(path) if os.path.exists(path) else None
+
+
+class StockstatsFrameCache:
+    """Bounded, thread-safe LRU of wrapped frames keyed by (symbol, data file).
+
+    A frame is reloaded when its data file was rewritten since it was loaded.
+    Frames of the same symbol from different data files (e.g. the offline
+    price data and the online price cache) are cached side by side; old
+    entries only leave by LRU eviction.
+    """
+
+    def __init__(self, max_entries: int = 16):
+        self.max_entries = max_entries
+        self._frames = OrderedDict()  # (symbol, data_file) -> _WrappedFrame
+        self._lock = threading.Lock()
+
+    def get_indicators(
+        self,
+        symbol: str,
+        data_file: str,
+        loader: Callable[[], pd.DataFrame],
+        indicators: List[str],
+    ) -> pd.DataFrame:
+        """Return the Date column plus the requested indicator columns, one
+        column per distinct indicator in the order first requested.
+
+        `loader` is only called when the frame is not cached or is stale.
+        """
+        key = (symbol.upper(), data_file)
+
+        with self._lock:
+            entry = self._frames.get(key)
+            if entry is not None and entry.mtime != _file_mtime(data_file):
+                entry = None
+            if entry is not None:
+                self._frames.move_to_end(key)
+
+        if entry is None:
+            # Load outside the cache lock so other symbols are not blocked
+            data = loader()
+            entry = _WrappedFrame(wrap(data), _file_mtime(data_file))
+            with self._lock:
+                self._frames[key] = entry
+                self._frames.move_to_end(key)
+                while len(self._frames) > self.max_entries:
+                    self._frames.popitem(last=False)
+
+        with entry.lock:
+            # Calculates missing indicator columns once; cached ones are reused
+            columns = ["Date"] + list(dict.fromkeys(indicators))
+            return pd.DataFrame(entry.df[columns]).copy()
+
+    def clear(self):
+        """Drop every cached frame."""
+        with self._lock:
+            self._frames.clear()
+
+
+_frame_cache = StockstatsFrameCache()
+
+
+def load_indicator_frame(
+    symbol: Annotated[str, "ticker symbol for the company"],
+    indicators: Annotated[List[str], "stockstats indicator names"],
+    local_data_dir: Annotated[str, "directory holding the offline price csv"] = DATA_DIR,
+) -> pd.DataFrame:
+    """Calculate indicators over a symbol's full price history.
+
+    Returns a DataFrame with a yyyy-mm-dd Date column and one column per
+    indicator. Wrapped frames are memoized in-process, so repeated calls for
+    the same symbol only calculate indicators that were not requested before.
+    """
+    config = get_config()
+    online = config["data_vendors"]["technical_indicators"] != "local"
+    _frame_cache.max_entries = config.get("stockstats_cache_size", 16)
+
+    if not online:
+        data_file = os.path.join(
+            local_data_dir,
+            f"{symbol}-YFin-data-2015-01-01-2025-03-25.csv",
+        )
+
+        def loader():
+            try:
+                return load_prices(symbol, data_file)
+            except FileNotFoundError:
+                raise Exception("Stockstats fail: Yahoo Finance data not fetched yet!")
+
+    else:
+        # Append-only cache: only bars since the last refresh are downloaded
+        data_file = refresh_price_cache(symbol)
+
+        def loader():
+            return pd.read_csv(data_file)
+
+    return _frame_cache.get_indicators(symbol, data_file, loader, indicators)
 
 
 class StockstatsUtils:
@@ -17,62 +133,8 @@ class StockstatsUtils:
             str, "curr date for retrieving stock price data, YYYY-mm-dd"
         ],
     ):
-        # Get config and set up data directory path
-        config = get_config()
-        online = config["data_vendors"]["technical_indicators"] != "local"
-
-        df = None
-        data = None
-
-        if not online:
-            try:
-                data = pd.read_csv(
-                    os.path.join(
-                        DATA_DIR,
-                        f"{symbol}-YFin-data-2015-01-01-2025-03-25.csv",
-                    )
-                )
-                df = wrap(data)
-            except FileNotFoundError:
-                raise Exception("Stockstats fail: Yahoo Finance data not fetched yet!")
-        else:
-            # Get today's date as YYYY-mm-dd to add to cache
-            today_date = pd.Timestamp.today()
-            curr_date = pd.to_datetime(curr_date)
-
-            end_date = today_date
-            start_date = today_date - pd.DateOffset(years=15)
-            start_date = start_date.strftime("%Y-%m-%d")
-            end_date = end_date.strftime("%Y-%m-%d")
-
-            # Get config and ensure cache directory exists
-            os.makedirs(config["data_cache_dir"], exist_ok=True)
-
-            data_file = os.path.join(
-                config["data_cache_dir"],
-                f"{symbol}-YFin-data-{start_date}-{end_date}.csv",
-            )
-
-            if os.path.exists(data_file):
-                data = pd.read_csv(data_file)
-                data["Date"] = pd.to_datetime(data["Date"])
-            else:
-                data = yf.download(
-                    symbol,
-                    start=start_date,
-                    end=end_date,
-                    multi_level_index=False,
-                    progress=False,
-                    auto_adjust=True,
-                )
-                data = data.reset_index()
-                data.to_csv(data_file, index=False)
-
-            df = wrap(data)
-            df["Date"] = df["Date"].dt.strftime("%Y-%m-%d")
-            curr_date = curr_date.strftime("%Y-%m-%d")
-
-        df[indicator]  # trigger stockstats to calculate the indicator
+        df = load_indicator_frame(symbol, [indicator])
+        curr_date = pd.to_datetime(curr_date).strftime("%Y-%m-%d")
         matching_rows = df[df["Date"].str.startswith(curr_date)]
 
         if not matching_rows.empty:
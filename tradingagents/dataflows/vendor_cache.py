@@ -0,0 +1,217 @@
+import hashlib
+import inspect
+import json
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from .config import get_config
+
+
+class VendorCache:
+    """Persistent SQLite cache for vendor results.
+
+    Entries are content-addressed by a hash of (method, vendor, normalized args),
+    expire after a per-category TTL and are evicted least-recently-used first
+    once the store grows past its size bound. The store size is tracked as a
+    running total from the last full scan; the scan is repeated when that
+    total passes the bound, and every EVICT_INTERVAL inserts to pick up
+    writes from other processes.
+    """
+
+    EVICT_INTERVAL = 100
+    EVICT_TARGET = 0.9  # share of the size bound left after an eviction
+
+    def __init__(
+        self,
+        path: str,
+        ttl_seconds: Optional[Dict[str, int]] = None,
+        max_size_mb: float = 512,
+    ):
+        self.path = path
+        self.ttl_seconds = ttl_seconds or {}
+        self.max_size_bytes = int(max_size_mb * 1024 * 1024)
+        self._lock = threading.Lock()
+        self._stats = {}  # method -> {"hits": int, "misses": int}
+        self._size_bytes = None  # store size as of the last scan plus later inserts
+        self._inserts_since_scan = 0
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS vendor_cache (
+                    key TEXT PRIMARY KEY,
+                    method TEXT NOT NULL,
+                    vendor TEXT NOT NULL,
+                    value BLOB NOT NULL,
+                    size INTEGER NOT NULL,
+                    created_at REAL NOT NULL,
+                    expires_at REAL,
+                    last_access REAL NOT NULL
+                )
+                """
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_vendor_cache_last_access ON vendor_cache (last_access)"
+            )
+
+    @contextmanager
+    def _connect(self):
+        """Open a connection that commits on success and is always closed."""
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    @staticmethod
+    def make_key(
+        method: str, vendor: str, impl: Callable, args: tuple, kwargs: dict
+    ) -> str:
+        """Hash a vendor call. Arguments are bound to the implementation's
+        signature so positional and keyword calls map to the same key."""
+        try:
+            bound = inspect.signature(impl).bind(*args, **kwargs)
+            bound.apply_defaults()
+            normalized = dict(bound.arguments)
+        except (TypeError, ValueError):
+            normalized = {"args": list(args), "kwargs": kwargs}
+
+        payload = json.dumps(
+            [method, vendor, normalized], sort_keys=True, default=str
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _record(self, method: str, outcome: str):
+        with self._lock:
+            method_stats = self._stats.setdefault(method, {"hits": 0, "misses": 0})
+            method_stats[outcome] += 1
+
+    def get(self, key: str, method: str) -> Tuple[bool, Any]:
+        """Return (hit, value) for a cache key."""
+        now = time.time()
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT value, expires_at FROM vendor_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or (row[1] is not None and row[1] < now):
+                self._record(method, "misses")
+                return False, None
+            conn.execute(
+                "UPDATE vendor_cache SET last_access = ? WHERE key = ?", (now, key)
+            )
+
+        self._record(method, "hits")
+        return True, pickle.loads(row[0])
+
+    def set(self, key: str, method: str, vendor: str, category: str, value: Any):
+        """Store a vendor result under the TTL of its data category."""
+        blob = pickle.dumps(value)
+        now = time.time()
+        ttl = self.ttl_seconds.get(category)
+        expires_at = now + ttl if ttl else None
+
+        with self._connect() as conn:
+            conn.execute(
+                """
+                INSERT OR REPLACE INTO vendor_cache
+                (key, method, vendor, value, size, created_at, expires_at, last_access)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (key, method, vendor, blob, len(blob), now, expires_at, now),
+            )
+
+            with self._lock:
+                self._inserts_since_scan += 1
+                if self._size_bytes is not None:
+                    self._size_bytes += len(blob)
+                scan = (
+                    self._size_bytes is None
+                    or self._size_bytes > self.max_size_bytes
+                    or self._inserts_since_scan >= self.EVICT_INTERVAL
+                )
+            if scan:
+                self._evict(conn, now)
+
+    def _evict(self, conn, now: float):
+        """Drop expired entries, then least recently used ones above the size bound."""
+        conn.execute(
+            "DELETE FROM vendor_cache WHERE expires_at IS NOT NULL AND expires_at < ?",
+            (now,),
+        )
+        total_size = conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM vendor_cache"
+        ).fetchone()[0]
+
+        stale_keys = []
+        if total_size > self.max_size_bytes:
+            # Evict below the bound, so the next inserts do not scan again right away
+            target_size = self.max_size_bytes * self.EVICT_TARGET
+            for key, size in conn.execute(
+                "SELECT key, size FROM vendor_cache ORDER BY last_access ASC"
+            ):
+                if total_size <= target_size:
+                    break
+                stale_keys.append((key,))
+                total_size -= size
+            conn.executemany("DELETE FROM vendor_cache WHERE key = ?", stale_keys)
+
+        with self._lock:
+            self._size_bytes = total_size
+            self._inserts_since_scan = 0
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Hit/miss counters per method for this process."""
+        with self._lock:
+            return {method: dict(counts) for method, counts in self._stats.items()}
+
+    def report(self):
+        """Print the hit/miss counters of this process, in total and per method."""
+        stats = self.stats()
+        hits = sum(counts["hits"] for counts in stats.values())
+        total = hits + sum(counts["misses"] for counts in stats.values())
+        if not total:
+            return
+        per_method = ", ".join(
+            f"{method} {counts['hits']}/{counts['hits'] + counts['misses']}"
+            for method, counts in sorted(stats.items())
+        )
+        print(f"CACHE STATS: vendor cache served {hits} of {total} calls ({per_method})")
+
+    def clear(self):
+        """Remove all cached entries."""
+        with self._connect() as conn:
+            conn.execute("DELETE FROM vendor_cache")
+
+
+_vendor_cache: Optional[VendorCache] = None
+_vendor_cache_lock = threading.Lock()
+
+
+def get_vendor_cache() -> Optional[VendorCache]:
+    """Get the vendor cache for the current configuration, or None if disabled."""
+    global _vendor_cache
+
+    config = get_config()
+    settings = config.get("vendor_cache", {})
+    if not settings.get("enabled", False):
+        return None
+
+    path = settings.get("path") or os.path.join(
+        config["data_cache_dir"], "vendor_cache.sqlite"
+    )
+
+    with _vendor_cache_lock:
+        if _vendor_cache is None or _vendor_cache.path != path:
+            _vendor_cache = VendorCache(path)
+        _vendor_cache.ttl_seconds = settings.get("ttl_seconds", {})
+        _vendor_cache.max_size_bytes = int(
+            settings.get("max_size_mb", 512) * 1024 * 1024
+        )
+        return _vendor_cache
@@ -1,9 +1,11 @@
-from typing import Annotated
+from typing import Annotated, List, Union
 from datetime import datetime
 from dateutil.relativedelta import relativedelta
+import pandas as pd
 import yfinance as yf
 import os
-from .stockstats_utils import StockstatsUtils
+from .stockstats_utils import StockstatsUtils, load_indicator_frame
+from .price_cache import price_cache_path, load_price_cache
 
 def get_YFin_data_online(
     symbol: Annotated[str, "ticker symbol of the company"],
@@ -14,11 +16,27 @@ def get_YFin_data_online(
     datetime.strptime(start_date, "%Y-%m-%d")
     datetime.strptime(end_date, "%Y-%m-%d")
 
-    # Create ticker object
-    ticker = yf.Ticker(symbol.upper())
+    # The daily price cache (e.g. filled by prefetch_prices) holds completed
+    # bars only, with the columns of Ticker.history; like yfinance, the end
+    # date is exclusive. It reaches back 15 years from its first download, so
+    # requests starting before its first bar are downloaded directly instead
+    # of being truncated
+    data = None
+    today = datetime.now().strftime("%Y-%m-%d")
+    if end_date <= today and os.path.exists(price_cache_path(symbol)):
+        cached = load_price_cache(symbol)
+        if not cached.empty and cached["Date"].iloc[0] <= start_date:
+            data = cached[(cached["Date"] >= start_date) & (cached["Date"] < end_date)]
+            data = data.set_index(pd.DatetimeIndex(data["Date"], name="Date")).drop(
+                columns="Date"
+            )
+
+    if data is None:
+        # Create ticker object
+        ticker = yf.Ticker(symbol.upper())
 
-    # Fetch historical data for the specified date range
-    data = ticker.history(start=start_date, end=end_date)
+        # Fetch historical data for the specified date range
+        data = ticker.history(start=start_date, end=end_date)
 
     # Check if data is empty
     if data.empty:
@@ -128,57 +146,59 @@ def get_stock_stats_indicators_window(
         ),
     }
 
-    if indicator not in best_ind_params:
-        raise ValueError(
-            f"Indicator {indicator} is not supported. Please choose from: {list(best_ind_params.keys())}"
-        )
+    # Several indicators may be requested at once, comma-separated
+    indicators = [ind.strip() for ind in indicator.split(",") if ind.strip()]
+    for ind in indicators:
+        if ind not in best_ind_params:
+            raise ValueError(
+                f"Indicator {ind} is not supported. Please choose from: {list(best_ind_params.keys())}"
+            )
 
     end_date = curr_date
     curr_date_dt = datetime.strptime(curr_date, "%Y-%m-%d")
     before = curr_date_dt - relativedelta(days=look_back_days)
 
-    # Optimized: Get stock data once and calculate indicators for all dates
+    # Optimized: Get stock data once and calculate all indicators in one pass
     try:
-        indicator_data = _get_stock_stats_bulk(symbol, indicator, curr_date)
-        
-        # Generate the date range we need
-        current_dt = curr_date_dt
-        date_values = []
-        
-        while current_dt >= before:
-            date_str = current_dt.strftime('%Y-%m-%d')
-            
-            # Look up the indicator value for this date
-            if date_str in indicator_data:
-                indicator_value = indicator_data[date_str]
-            else:
-                indicator_value = "N/A: Not a trading day (weekend or holiday)"
-            
-            date_values.append((date_str, indicator_value))
-            current_dt = current_dt - relativedelta(days=1)
-        
-        # Build the result string
-        ind_string = ""
-        for date_str, value in date_values:
-            ind_string += f"{date_str}: {value}\n"
-        
+        indicator_data = _get_stock_stats_bulk(symbol, indicators, curr_date)
+
+        # Align the indicator values with every calendar day in the window at once
+        calendar = pd.date_range(before, curr_date_dt, freq="D")[::-1].strftime(
+            "%Y-%m-%d"
+        )
+        window = indicator_data.reindex(
+            calendar, fill_value="N/A: Not a trading day (weekend or holiday)"
+        )
+
+        ind_strings = {
+            ind: "".join(
+                f"{date_str}: {value}\n"
+                for date_str, value in zip(calendar, window[ind])
+            )
+            for ind in indicators
+        }
+
     except Exception as e:
         print(f"Error getting bulk stockstats data: {e}")
         # Fallback to original implementation if bulk method fails
-        ind_string = ""
-        curr_date_dt = datetime.strptime(curr_date, "%Y-%m-%d")
-        while curr_date_dt >= before:
-            indicator_value = get_stockstats_indicator(
-                symbol, indicator, curr_date_dt.strftime("%Y-%m-%d")
-            )
-            ind_string += f"{curr_date_dt.strftime('%Y-%m-%d')}: {indicator_value}\n"
-            curr_date_dt = curr_date_dt - relativedelta(days=1)
+        ind_strings = {}
+        for ind in indicators:
+            ind_string = ""
+            curr_date_dt = datetime.strptime(curr_date, "%Y-%m-%d")
+            while curr_date_dt >= before:
+                indicator_value = get_stockstats_indicator(
+                    symbol, ind, curr_date_dt.strftime("%Y-%m-%d")
+                )
+                ind_string += f"{curr_date_dt.strftime('%Y-%m-%d')}: {indicator_value}\n"
+                curr_date_dt = curr_date_dt - relativedelta(days=1)
+            ind_strings[ind] = ind_string
 
-    result_str = (
-        f"## {indicator} values from {before.strftime('%Y-%m-%d')} to {end_date}:\n\n"
-        + ind_string
+    result_str = "\n\n".join(
+        f"## {ind} values from {before.strftime('%Y-%m-%d')} to {end_date}:\n\n"
+        + ind_strings[ind]
         + "\n\n"
-        + best_ind_params.get(indicator, "No description available.")
+        + best_ind_params.get(ind, "No description available.")
+        for ind in indicators
     )
 
     return result_str
@@ -186,85 +206,30 @@ def get_stock_stats_indicators_window(
 
 def _get_stock_stats_bulk(
     symbol: Annotated[str, "ticker symbol of the company"],
-    indicator: Annotated[str, "technical indicator to calculate"],
+    indicator: Annotated[Union[str, List[str]], "technical indicator(s) to calculate"],
     curr_date: Annotated[str, "current date for reference"]
-) -> dict:
+) -> pd.DataFrame:
     """
     Optimized bulk calculation of stock stats indicators.
-    Fetches data once and calculates indicator for all available dates.
-    Returns dict mapping date strings to indicator values.
+    Fetches data once and calculates all indicators for all available dates in one pass.
+    Returns a DataFrame indexed by date string with one column of formatted values per indicator.
     """
     from .config import get_config
-    import pandas as pd
-    from stockstats import wrap
-    import os
     
     config = get_config()
-    online = config["data_vendors"]["technical_indicators"] != "local"
+    indicators = [indicator] if isinstance(indicator, str) else list(indicator)
     
-    if not online:
-        # Local data path
-        try:
-            data = pd.read_csv(
-                os.path.join(
-                    config.get("data_cache_dir", "data"),
-                    f"{symbol}-YFin-data-2015-01-01-2025-03-25.csv",
-                )
-            )
-            df = wrap(data)
-        except FileNotFoundError:
-            raise Exception("Stockstats fail: Yahoo Finance data not fetched yet!")
-    else:
-        # Online data fetching with caching
-        today_date = pd.Timestamp.today()
-        curr_date_dt = pd.to_datetime(curr_date)
-        
-        end_date = today_date
-        start_date = today_date - pd.DateOffset(years=15)
-        start_date_str = start_date.strftime("%Y-%m-%d")
-        end_date_str = end_date.strftime("%Y-%m-%d")
-        
-        os.makedirs(config["data_cache_dir"], exist_ok=True)
-        
-        data_file = os.path.join(
-            config["data_cache_dir"],
-            f"{symbol}-YFin-data-{start_date_str}-{end_date_str}.csv",
-        )
-        
-        if os.path.exists(data_file):
-            data = pd.read_csv(data_file)
-            data["Date"] = pd.to_datetime(data["Date"])
-        else:
-            data = yf.download(
-                symbol,
-                start=start_date_str,
-                end=end_date_str,
-                multi_level_index=False,
-                progress=False,
-                auto_adjust=True,
-            )
-            data = data.reset_index()
-            data.to_csv(data_file, index=False)
-        
-        df = wrap(data)
-        df["Date"] = df["Date"].dt.strftime("%Y-%m-%d")
-    
-    # Calculate the indicator for all rows at once
-    df[indicator]  # This triggers stockstats to calculate the indicator
-    
-    # Create a dictionary mapping date strings to indicator values
-    result_dict = {}
-    for _, row in df.iterrows():
-        date_str = row["Date"]
-        indicator_value = row[indicator]
-        
-        # Handle NaN/None values
-        if pd.isna(indicator_value):
-            result_dict[date_str] = "N/A"
-        else:
-            result_dict[date_str] = str(indicator_value)
+    # Wrapped frames are memoized per symbol, so indicators computed by earlier
+    # calls are reused instead of being recalculated over the whole history
+    df = load_indicator_frame(
+        symbol, indicators, config.get("data_cache_dir", "data")
+    )
     
-    return result_dict
+    values = df[indicators]
+    values.index = pd.Index(df["Date"])
+
+    # Format values, marking missing ones (e.g. during indicator warm-up) as N/A
+    return values.astype(str).where(values.notna(), "N/A")
 
 
 def get_stockstats_indicator(
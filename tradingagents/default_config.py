@@ -8,15 +8,60 @@ DEFAULT_CONFIG = {
         os.path.abspath(os.path.join(os.path.dirname(__file__), ".")),
         "dataflows/data_cache",
     ),
+    # Memory-mapped OHLCV store (defaults to <data_cache_dir>/price_store)
+    "price_store_dir": None,
+    "stockstats_cache_size": 16,  # wrapped indicator frames kept in memory
+    # Persist agent memories in memory_dir (defaults to <data_cache_dir>/memory)
+    "persistent_memory": False,
+    "memory_dir": None,
+    # "openai" (API at backend_url), or in-process "hashing" / "onnx" (MiniLM) for offline runs
+    "embedding_backend": "openai",
+    "embedding_dimensions": 1024,  # hashing backend only
+    # Embeddings shared by all memories, in-process and (if persist) on disk
+    "embedding_cache": {"enabled": True, "max_entries": 4096, "persist": False, "path": None},
+    "prefetch_prices": False,  # batch-download prices before propagate_many runs
+    # Extra ticker -> "Company OR Alias" names for local reddit company news
+    "reddit_company_names": {},
     # LLM settings
     "llm_provider": "openai",
     "deep_think_llm": "o4-mini",
     "quick_think_llm": "gpt-4o-mini",
     "backend_url": "https://api.openai.com/v1",
+    # Record/replay LLM responses: mode None (off), "record", "replay" or "auto"
+    # (replay recorded responses, record misses); path defaults to
+    # <data_cache_dir>/llm_recordings.sqlite
+    "llm_recording": {"mode": None, "path": None},
+    # LLM response cache for the listed graph nodes ("*" caches every call);
+    # set similarity_threshold (e.g. 0.97) to also serve near-identical prompts
+    "llm_cache": {
+        "enabled": False,
+        "path": None,  # defaults to <data_cache_dir>/llm_cache.sqlite
+        "nodes": ["Market Analyst", "Social Analyst", "News Analyst", "Fundamentals Analyst"],
+        "ttl_seconds": 24 * 3600,
+        "max_entries": 10000,
+        "similarity_threshold": None,
+    },
+    # Parse the final decision marker before asking the LLM to extract it
+    "signal_fast_path": True,
+    # Provider-side caching of static prompt prefixes (Anthropic, and OpenAI at
+    # api.openai.com); openai_cache_retention e.g. "24h" keeps OpenAI's cache longer
+    "prompt_caching": {"enabled": False, "openai_cache_retention": None},
     # Debate and discussion settings
     "max_debate_rounds": 1,
     "max_risk_discuss_rounds": 1,
     "max_recur_limit": 100,
+    # Condense the analyst reports into digests that later prompts use instead
+    "report_distillation": {"enabled": False, "max_words": 250},
+    # Rolling debate context: debaters see the last recent_turns turns verbatim
+    # (within max_tokens) plus an incremental summary of earlier turns
+    "debate_context": {
+        "enabled": False,
+        "recent_turns": 2,
+        "max_tokens": 2000,
+        "summary_tokens": 500,
+    },
+    # Graph topology
+    "parallel_analysts": False,  # Run the selected analysts concurrently instead of in sequence
     # Data vendor configuration
     # Category-level configuration (default for all tools in category)
     "data_vendors": {
@@ -30,4 +75,23 @@ DEFAULT_CONFIG = {
         # Example: "get_stock_data": "alpha_vantage",  # Override category default
         # Example: "get_news": "openai",               # Override category default
     },
+    # Only read local data, never falling back to live vendors; tools without a
+    # local source are not offered to the analysts (set by the Backtester)
+    "local_only": False,
+    # Multi-vendor execution: "sequential" tries vendors one after another,
+    # "race" runs them in parallel and keeps the first success, "gather" runs them
+    # in parallel and merges all results
+    "vendor_policy": "sequential",
+    "vendor_timeout": 30,  # Seconds per vendor call in race/gather mode
+    # Persistent cache for vendor results (SQLite file in data_cache_dir)
+    "vendor_cache": {
+        "enabled": False,
+        "max_size_mb": 512,  # Least recently used entries are evicted above this size
+        "ttl_seconds": {
+            "core_stock_apis": 60 * 60,              # Prices move intraday
+            "technical_indicators": 60 * 60,
+            "fundamental_data": 7 * 24 * 60 * 60,    # Statements change quarterly
+            "news_data": 6 * 60 * 60,
+        },
+    },
 }
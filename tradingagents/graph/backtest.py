@@ -0,0 +1,298 @@
+# TradingAgents/graph/backtest.py
+
+import json
+import os
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+import pandas as pd
+
+from tradingagents.default_config import DEFAULT_CONFIG
+from tradingagents.dataflows.price_store import load_prices
+
+from .trading_graph import TradingAgentsGraph
+
+
+class Backtester:
+    """Runs TradingAgentsGraph over a (tickers x trading days) grid.
+
+    Data is routed with local_only: only local implementations are called,
+    never falling back to live vendors, and tools without a local source
+    (e.g. get_fundamentals) are not offered to the analysts. Runs only see
+    data available on disk. For each decision the forward return over
+    `holding_days` trading days is computed from the price store, and the
+    graph reflects on it once the exit day has been reached in the backtest,
+    so later decisions only remember outcomes they could have known.
+
+    Completed runs are appended to a JSONL checkpoint; a resumed backtest
+    skips them. With a checkpoint, memories persist next to it (so a resumed
+    backtest keeps what it learned); without one they live in-process. Either
+    way the backtest never sees memories learned outside of it.
+    """
+
+    def __init__(
+        self,
+        config: Optional[Dict[str, Any]] = None,
+        selected_analysts: Sequence[str] = ("market", "social", "news", "fundamentals"),
+        holding_days: int = 1,
+        step: int = 1,
+        max_workers: int = 4,
+        checkpoint_path: Optional[str] = None,
+        reflect: bool = True,
+        debug: bool = False,
+    ):
+        """Initialize the backtester.
+
+        Args:
+            config: Graph configuration; data is forced to local-only routing
+            selected_analysts: Analysts to include in the graph
+            holding_days: Trading days between a decision and its evaluation
+            step: Run the graph on every step-th trading day
+            max_workers: Tickers analyzed concurrently on the same day
+            checkpoint_path: JSONL file for checkpoint/resume, or None
+            reflect: Feed realized returns to reflect_and_remember
+            debug: Run the graph in debug mode
+        """
+        if holding_days < 1 or step < 1:
+            raise ValueError("Backtester: holding_days and step must be at least 1")
+
+        config = (config or DEFAULT_CONFIG).copy()
+        config["data_vendors"] = {category: "local" for category in config["data_vendors"]}
+        config["tool_vendors"] = {}
+        config["local_only"] = True
+        if checkpoint_path:
+            config["persistent_memory"] = True
+            config["memory_dir"] = os.path.splitext(checkpoint_path)[0] + "_memory"
+        else:
+            config["persistent_memory"] = False
+
+        self.graph = TradingAgentsGraph(list(selected_analysts), debug=debug, config=config)
+        self.config = self.graph.config
+        self.holding_days = holding_days
+        self.step = step
+        self.max_workers = max_workers
+        self.checkpoint_path = checkpoint_path
+        self.reflect = reflect
+
+        self._closes = {}  # ticker -> close prices indexed by yyyy-mm-dd
+        self._checkpoint_lock = threading.Lock()
+
+    def closes(self, ticker: str) -> pd.Series:
+        """Close prices of a ticker from the local price store."""
+        if ticker not in self._closes:
+            prices = load_prices(
+                ticker,
+                os.path.join(
+                    self.config["data_dir"],
+                    f"market_data/price_data/{ticker}-YFin-data-2015-01-01-2025-03-25.csv",
+                ),
+            )
+            self._closes[ticker] = pd.Series(
+                prices["Close"].to_numpy(), index=pd.Index(prices["Date"])
+            )
+        return self._closes[ticker]
+
+    def trading_days(self, ticker: str, start_date: str, end_date: str) -> List[str]:
+        """Every step-th trading day of a ticker between two dates (inclusive)."""
+        dates = self.closes(ticker).index
+        return list(dates[(dates >= start_date) & (dates <= end_date)][:: self.step])
+
+    def forward_return(self, ticker: str, trade_date: str):
+        """(return, exit date) over holding_days, or (None, None) past the data."""
+        closes = self.closes(ticker)
+        entry = closes.index.get_loc(trade_date)
+        exit = entry + self.holding_days
+        if exit >= len(closes):
+            return None, None
+        return float(closes.iloc[exit] / closes.iloc[entry] - 1), closes.index[exit]
+
+    @staticmethod
+    def position(decision: Optional[str]) -> int:
+        """Map a processed decision to a position: BUY 1, SELL -1, otherwise 0."""
+        decision = (decision or "").upper()
+        if "BUY" in decision:
+            return 1
+        if "SELL" in decision:
+            return -1
+        return 0
+
+    @staticmethod
+    def _reflection_state(final_state: Dict[str, Any]) -> Dict[str, Any]:
+        """The parts of a final state the reflector reads, in JSON-safe form."""
+        return {
+            "market_report": final_state["market_report"],
+            "sentiment_report": final_state["sentiment_report"],
+            "news_report": final_state["news_report"],
+            "fundamentals_report": final_state["fundamentals_report"],
+            "investment_debate_state": {
+                "bull_history": final_state["investment_debate_state"]["bull_history"],
+                "bear_history": final_state["investment_debate_state"]["bear_history"],
+                "judge_decision": final_state["investment_debate_state"]["judge_decision"],
+            },
+            "trader_investment_plan": final_state["trader_investment_plan"],
+            "risk_debate_state": {
+                "judge_decision": final_state["risk_debate_state"]["judge_decision"],
+            },
+        }
+
+    def _load_checkpoint(self) -> Dict[tuple, Dict[str, Any]]:
+        records = {}
+        if self.checkpoint_path and os.path.exists(self.checkpoint_path):
+            with open(self.checkpoint_path) as f:
+                for line in f:
+                    if line.strip():
+                        record = json.loads(line)
+                        # Later lines (e.g. after reflection) replace earlier ones
+                        records[(record["ticker"], record["trade_date"])] = record
+            print(f"Resuming backtest with {len(records)} completed runs")
+        return records
+
+    def _save_record(self, record: Dict[str, Any]):
+        if not self.checkpoint_path:
+            return
+        with self._checkpoint_lock:
+            directory = os.path.dirname(os.path.abspath(self.checkpoint_path))
+            os.makedirs(directory, exist_ok=True)
+            with open(self.checkpoint_path, "a") as f:
+                f.write(json.dumps(record) + "\n")
+
+    def _reflect_due(self, pending: List[Dict[str, Any]], curr_date: Optional[str]):
+        """Reflect on every pending run whose exit day is on or before curr_date
+        (all of them when curr_date is None)."""
+        due = [
+            record
+            for record in pending
+            if curr_date is None or record["exit_date"] <= curr_date
+        ]
+        due.sort(key=lambda r: (r["exit_date"], r["ticker"]))
+        self.graph.reflect_and_remember_many(
+            [(record["state"], record["position_return"]) for record in due],
+            max_concurrency=self.max_workers,
+        )
+        for record in due:
+            record["reflected"] = True
+            self._save_record(record)
+            pending.remove(record)
+
+    def run(self, tickers: Iterable[str], start_date: str, end_date: str) -> Dict[str, Any]:
+        """Run the backtest and return its report (see `report`)."""
+        tickers = list(tickers)
+        records = self._load_checkpoint()
+        pending = [
+            record
+            for record in records.values()
+            if self.reflect
+            and record["position_return"] is not None
+            and not record.get("reflected")
+        ]
+
+        days_by_ticker = {
+            ticker: set(self.trading_days(ticker, start_date, end_date))
+            for ticker in tickers
+        }
+        all_days = sorted(set().union(*days_by_ticker.values()))
+
+        errors = []
+        for trade_date in all_days:
+            if self.reflect:
+                self._reflect_due(pending, trade_date)
+
+            todo = [
+                ticker
+                for ticker in tickers
+                if trade_date in days_by_ticker[ticker]
+                and (ticker, trade_date) not in records
+            ]
+            if not todo:
+                continue
+
+            for result in self.graph.propagate_many(
+                todo, trade_date, max_concurrency=self.max_workers
+            ):
+                ticker = result["company_of_interest"]
+                if result["error"] is not None:
+                    # Not checkpointed, so a resumed backtest retries it
+                    errors.append(
+                        {"ticker": ticker, "trade_date": trade_date, "error": str(result["error"])}
+                    )
+                    continue
+
+                forward_return, exit_date = self.forward_return(ticker, trade_date)
+                position = self.position(result["decision"])
+                record = {
+                    "ticker": ticker,
+                    "trade_date": trade_date,
+                    "decision": result["decision"],
+                    "position": position,
+                    "forward_return": forward_return,
+                    "exit_date": exit_date,
+                    "position_return": (
+                        position * forward_return if forward_return is not None else None
+                    ),
+                    "reflected": False,
+                    "state": self._reflection_state(result["final_state"]),
+                }
+                records[(ticker, trade_date)] = record
+                self._save_record(record)
+                if self.reflect and record["position_return"] is not None:
+                    pending.append(record)
+
+        if self.reflect:
+            self._reflect_due(pending, None)
+
+        report = self.report(
+            [
+                record
+                for record in records.values()
+                if record["ticker"] in days_by_ticker
+                and record["trade_date"] in days_by_ticker[record["ticker"]]
+            ]
+        )
+        report["errors"] = errors
+        return report
+
+    @staticmethod
+    def report(records: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+        """Summarize backtest records.
+
+        Each decision day's return is the equal-weighted mean position return
+        of the tickers decided that day; the equity curve compounds these, so
+        it assumes holding periods do not overlap (step >= holding_days).
+        Hit rate counts BUY/SELL decisions with a positive position return.
+        """
+        scored = [r for r in records if r["position_return"] is not None]
+        if not scored:
+            return {
+                "runs": 0,
+                "trades": 0,
+                "hit_rate": None,
+                "total_return": 0.0,
+                "equity_curve": [],
+                "per_ticker": {},
+            }
+
+        frame = pd.DataFrame(scored)
+        daily = frame.groupby("trade_date")["position_return"].mean().sort_index()
+        equity = (1 + daily).cumprod()
+
+        def summarize(rows: pd.DataFrame) -> Dict[str, Any]:
+            trades = rows[rows["position"] != 0]
+            return {
+                "runs": len(rows),
+                "trades": len(trades),
+                "hit_rate": (
+                    float((trades["position_return"] > 0).mean()) if len(trades) else None
+                ),
+                "total_return": float((1 + rows.sort_values("trade_date")["position_return"]).prod() - 1),
+            }
+
+        summary = summarize(frame)
+        summary["total_return"] = float(equity.iloc[-1] - 1)
+        summary["equity_curve"] = [
+            {"date": trade_date, "return": float(daily[trade_date]), "equity": float(value)}
+            for trade_date, value in equity.items()
+        ]
+        summary["per_ticker"] = {
+            ticker: summarize(rows) for ticker, rows in frame.groupby("ticker")
+        }
+        return summary
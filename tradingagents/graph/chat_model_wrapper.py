@@ -0,0 +1,68 @@
+# TradingAgents/graph/chat_model_wrapper.py
+
+from typing import Any, List, Optional, Sequence, Tuple
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import BaseMessage
+from langchain_core.outputs import ChatResult
+
+
+class ChatModelWrapper(BaseChatModel):
+    """Base class for chat models that wrap another chat model.
+
+    Tool binding, identifying parameters and the sync/async calls are
+    delegated to `llm`, always passing the run manager on so the inner
+    model keeps its callbacks and graph metadata. Subclasses hook into a
+    call by overriding `_before_call` (rewrite the request, or answer it
+    without calling the model) and `_after_call` (see the model's result).
+    """
+
+    llm: BaseChatModel
+    wrapper_type: str = "wrapped"  # prefix of _llm_type
+
+    @property
+    def _llm_type(self) -> str:
+        return f"{self.wrapper_type}-{self.llm._llm_type}"
+
+    @property
+    def _identifying_params(self):
+        return self.llm._identifying_params
+
+    def bind_tools(self, tools: Sequence[Any], **kwargs: Any):
+        # Let the wrapped model format the tools, then bind them to the wrapper
+        return self.bind(**self.llm.bind_tools(tools, **kwargs).kwargs)
+
+    def _before_call(
+        self, messages: List[BaseMessage], stop, kwargs: dict, run_manager
+    ) -> Tuple[List[BaseMessage], dict, Optional[ChatResult], Any]:
+        """(messages, kwargs) to send, a result that answers the call without
+        the model (or None), and context handed to `_after_call`."""
+        return messages, kwargs, None, None
+
+    def _after_call(self, context: Any, result: ChatResult) -> ChatResult:
+        """Called with the model's result; returns the result to hand back."""
+        return result
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        messages, kwargs, result, context = self._before_call(
+            messages, stop, kwargs, run_manager
+        )
+        if result is not None:
+            return result
+        result = self.llm._generate(
+            messages, stop=stop, run_manager=run_manager, **kwargs
+        )
+        return self._after_call(context, result)
+
+    async def _agenerate(
+        self, messages, stop=None, run_manager=None, **kwargs
+    ) -> ChatResult:
+        messages, kwargs, result, context = self._before_call(
+            messages, stop, kwargs, run_manager
+        )
+        if result is not None:
+            return result
+        result = await self.llm._agenerate(
+            messages, stop=stop, run_manager=run_manager, **kwargs
+        )
+        return self._after_call(context, result)
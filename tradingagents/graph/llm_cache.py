@@ -0,0 +1,245 @@
+# TradingAgents/graph/llm_cache.py
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+from langchain_core.messages import BaseMessage, message_to_dict, messages_from_dict
+from langchain_core.outputs import ChatResult
+
+from .chat_model_wrapper import ChatModelWrapper
+from .llm_recording import chat_result, request_key, serialize_request
+
+
+class LLMResponseCache:
+    """SQLite cache of chat model responses with TTL and LRU size bound.
+
+    Lookups match the exact request hash first. With an embedding function
+    and a similarity threshold, a miss falls back to the most similar cached
+    prompt within the same scope: model, graph node, call options (e.g. bound
+    tools) and the run's ticker and trade date.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        ttl_seconds: Optional[int] = None,
+        max_entries: int = 10000,
+        embed: Optional[Callable[[str], List[float]]] = None,
+        similarity_threshold: Optional[float] = None,
+    ):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.embed = embed
+        self.similarity_threshold = similarity_threshold
+        self._lock = threading.Lock()
+        self._stats = {}  # node -> {"exact_hits": int, "similar_hits": int, "misses": int}
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS llm_cache (
+                    key TEXT PRIMARY KEY,
+                    scope TEXT NOT NULL,
+                    embedding BLOB,
+                    response TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    last_access REAL NOT NULL
+                )
+                """
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_llm_cache_scope ON llm_cache (scope)"
+            )
+
+    @contextmanager
+    def _connect(self):
+        """Open a connection that commits on success and is always closed."""
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    @property
+    def semantic(self) -> bool:
+        return self.embed is not None and self.similarity_threshold is not None
+
+    def _record(self, node: Optional[str], outcome: str):
+        with self._lock:
+            node_stats = self._stats.setdefault(
+                node or "", {"exact_hits": 0, "similar_hits": 0, "misses": 0}
+            )
+            node_stats[outcome] += 1
+
+    def embedding(self, prompt: str) -> Optional[np.ndarray]:
+        """Normalized prompt embedding in semantic mode, otherwise None."""
+        if not self.semantic:
+            return None
+        try:
+            embedding = np.asarray(self.embed(prompt), dtype=np.float32)
+        except Exception as e:
+            print(f"DEBUG: LLM cache embedding failed, using exact match only: {e}")
+            return None
+        norm = np.linalg.norm(embedding)
+        return embedding / norm if norm else None
+
+    def get(
+        self, key: str, scope: str, prompt: str, node: Optional[str]
+    ) -> Tuple[Optional[List[BaseMessage]], Optional[np.ndarray]]:
+        """Cached response messages for a request (or None), plus the prompt
+        embedding if one was computed, to be reused by `set` on a miss."""
+        now = time.time()
+        min_created = now - self.ttl_seconds if self.ttl_seconds else 0
+
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT key, response FROM llm_cache WHERE key = ? AND created_at >= ?",
+                (key, min_created),
+            ).fetchone()
+            outcome = "exact_hits"
+
+            # Only embed the prompt when there is no exact match
+            embedding = self.embedding(prompt) if row is None else None
+            if embedding is not None:
+                candidates = conn.execute(
+                    """
+                    SELECT key, embedding FROM llm_cache
+                    WHERE scope = ? AND length(embedding) = ? AND created_at >= ?
+                    """,
+                    (scope, embedding.nbytes, min_created),
+                ).fetchall()
+                if candidates:
+                    matrix = np.stack(
+                        [np.frombuffer(blob, dtype=np.float32) for _, blob in candidates]
+                    )
+                    similarities = matrix @ embedding
+                    best = int(np.argmax(similarities))
+                    if similarities[best] >= self.similarity_threshold:
+                        row = conn.execute(
+                            "SELECT key, response FROM llm_cache WHERE key = ?",
+                            (candidates[best][0],),
+                        ).fetchone()
+                        outcome = "similar_hits"
+
+            if row is None:
+                self._record(node, "misses")
+                return None, embedding
+
+            conn.execute(
+                "UPDATE llm_cache SET last_access = ? WHERE key = ?", (now, row[0])
+            )
+
+        self._record(node, outcome)
+        return messages_from_dict(json.loads(row[1])), embedding
+
+    def set(
+        self,
+        key: str,
+        scope: str,
+        embedding: Optional[np.ndarray],
+        messages: List[BaseMessage],
+    ):
+        """Cache the response messages of a request."""
+        now = time.time()
+
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO llm_cache VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    key,
+                    scope,
+                    embedding.tobytes() if embedding is not None else None,
+                    json.dumps([message_to_dict(m) for m in messages]),
+                    now,
+                    now,
+                ),
+            )
+            self._evict(conn, now)
+
+    def _evict(self, conn, now: float):
+        """Drop expired entries, then least recently used ones above max_entries."""
+        if self.ttl_seconds:
+            conn.execute(
+                "DELETE FROM llm_cache WHERE created_at < ?", (now - self.ttl_seconds,)
+            )
+        conn.execute(
+            """
+            DELETE FROM llm_cache WHERE key IN (
+                SELECT key FROM llm_cache ORDER BY last_access DESC LIMIT -1 OFFSET ?
+            )
+            """,
+            (self.max_entries,),
+        )
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Hit/miss counters and hit rate per graph node for this process."""
+        with self._lock:
+            stats = {}
+            for node, counts in self._stats.items():
+                hits = counts["exact_hits"] + counts["similar_hits"]
+                total = hits + counts["misses"]
+                stats[node] = {**counts, "hit_rate": hits / total if total else 0.0}
+            return stats
+
+    def clear(self):
+        """Remove all cached responses."""
+        with self._connect() as conn:
+            conn.execute("DELETE FROM llm_cache")
+
+
+class CachingChatModel(ChatModelWrapper):
+    """Chat model wrapper that serves repeated requests from an LLMResponseCache.
+
+    Only calls made from the graph nodes listed in `nodes` are cached ("*"
+    caches every call, including ones made outside the graph such as signal
+    processing and reflection).
+    """
+
+    response_cache: LLMResponseCache
+    nodes: List[str] = []
+    wrapper_type: str = "caching"
+
+    def _before_call(self, messages, stop, kwargs, run_manager):
+        metadata = run_manager.metadata if run_manager else {}
+        node = metadata.get("langgraph_node")
+        if "*" not in self.nodes and node not in self.nodes:
+            return messages, kwargs, None, None
+
+        request = serialize_request(
+            self.llm._identifying_params, messages, stop, kwargs
+        )
+        # Prompts share a long static prefix, so similar prompts of another
+        # ticker or date must never match each other
+        run = [
+            node or "",
+            metadata.get("company_of_interest", ""),
+            metadata.get("trade_date", ""),
+        ]
+        scope = request_key(
+            serialize_request(self.llm._identifying_params, [], stop, kwargs)
+            + "\n".join(run)
+        )
+        key = request_key(request)
+        prompt = "\n\n".join(str(m.content) for m in messages)
+        cached, embedding = self.response_cache.get(key, scope, prompt, node)
+        if cached is not None:
+            return messages, kwargs, chat_result(cached), None
+        lookup = {"key": key, "scope": scope, "embedding": embedding}
+        return messages, kwargs, None, lookup
+
+    def _after_call(self, lookup, result: ChatResult) -> ChatResult:
+        if lookup is not None:
+            self.response_cache.set(
+                messages=[generation.message for generation in result.generations],
+                **lookup,
+            )
+        return result
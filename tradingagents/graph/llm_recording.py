@@ -0,0 +1,194 @@
+# TradingAgents/graph/llm_recording.py
+
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import time
+from contextlib import contextmanager
+from typing import Any, List, Optional, Sequence
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import BaseMessage, message_to_dict, messages_from_dict
+from langchain_core.outputs import ChatGeneration, ChatResult
+from langchain_core.utils.function_calling import convert_to_openai_tool
+
+from .chat_model_wrapper import ChatModelWrapper
+
+
+# Tool output lines that change on every call without changing the data, e.g.
+# the "# Data retrieved on: <now>" header of the yfinance tools
+VOLATILE_LINES = re.compile(r"^# Data retrieved on: .*(?:\n|$)", re.MULTILINE)
+
+
+def _stable_content(content):
+    return VOLATILE_LINES.sub("", content) if isinstance(content, str) else content
+
+
+def serialize_request(
+    model: Any, messages: List[BaseMessage], stop, kwargs: dict
+) -> str:
+    """Canonical JSON of a chat request: the model identity (e.g. its
+    identifying parameters), the messages without their generated ids and
+    volatile lines, and the call options."""
+    return json.dumps(
+        {
+            "model": model,
+            "messages": [
+                {
+                    "type": m.type,
+                    "name": m.name,
+                    "content": _stable_content(m.content),
+                    "tool_calls": getattr(m, "tool_calls", None),
+                    "tool_call_id": getattr(m, "tool_call_id", None),
+                }
+                for m in messages
+            ],
+            "stop": stop,
+            "kwargs": kwargs,
+        },
+        sort_keys=True,
+        default=str,
+    )
+
+
+def request_key(request: str) -> str:
+    return hashlib.sha256(request.encode("utf-8")).hexdigest()
+
+
+def chat_result(messages: List[BaseMessage]) -> ChatResult:
+    """Wrap stored response messages into a ChatResult."""
+    return ChatResult(generations=[ChatGeneration(message=m) for m in messages])
+
+
+class LLMRecordingStore:
+    """SQLite store of recorded chat model responses, keyed by request hash."""
+
+    def __init__(self, path: str):
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS llm_recordings (
+                    key TEXT PRIMARY KEY,
+                    model TEXT NOT NULL,
+                    request TEXT NOT NULL,
+                    response TEXT NOT NULL,
+                    created_at REAL NOT NULL
+                )
+                """
+            )
+
+    @contextmanager
+    def _connect(self):
+        """Open a connection that commits on success and is always closed."""
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def get(self, key: str) -> Optional[List[BaseMessage]]:
+        """The recorded response messages for a key, or None."""
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT response FROM llm_recordings WHERE key = ?", (key,)
+            ).fetchone()
+        return messages_from_dict(json.loads(row[0])) if row else None
+
+    def set(self, key: str, model: str, request: str, messages: List[BaseMessage]):
+        """Record the response messages of a request."""
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO llm_recordings VALUES (?, ?, ?, ?, ?)",
+                (
+                    key,
+                    model,
+                    request,
+                    json.dumps([message_to_dict(m) for m in messages]),
+                    time.time(),
+                ),
+            )
+
+
+class ReplayOnlyChatModel(BaseChatModel):
+    """Stand-in for a provider's chat model when every response is replayed.
+
+    Creates no provider client, so replay runs need no API keys. Reaching
+    the model means a request was not recorded.
+    """
+
+    model: str
+
+    @property
+    def _llm_type(self) -> str:
+        return "replay-only"
+
+    @property
+    def _identifying_params(self):
+        return {"model": self.model}
+
+    def bind_tools(self, tools: Sequence[Any], **kwargs: Any):
+        return self.bind(**kwargs)
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        raise LookupError(f"No recorded response for {self.model}")
+
+
+class RecordingChatModel(ChatModelWrapper):
+    """Chat model wrapper that records responses and replays them.
+
+    Requests are keyed by a hash of `model_id` (or the wrapped model's
+    parameters), the messages (without their generated ids and volatile
+    lines such as retrieval timestamps) and call options. Bound tools are
+    keyed by their schemas, not the provider's format of them. Modes:
+        record: always call the model and store the response
+        replay: only serve stored responses; a miss raises LookupError
+        auto: serve stored responses, call and record on a miss
+    """
+
+    store: LLMRecordingStore
+    mode: str = "auto"
+    model_id: Optional[str] = None
+    wrapper_type: str = "recording"
+
+    def bind_tools(self, tools: Sequence[Any], **kwargs: Any):
+        return self.bind(
+            **self.llm.bind_tools(tools, **kwargs).kwargs,
+            recorded_tools=[convert_to_openai_tool(tool) for tool in tools],
+        )
+
+    def _before_call(self, messages, stop, kwargs, run_manager):
+        # The tool schemas stand in for the provider-formatted tools in the
+        # key, and are never sent to the model
+        kwargs = dict(kwargs)
+        tools = kwargs.pop("recorded_tools", None)
+        request_kwargs = kwargs if tools is None else {**kwargs, "tools": tools}
+        request = serialize_request(
+            self.model_id or self.llm._identifying_params,
+            messages,
+            stop,
+            request_kwargs,
+        )
+        key = request_key(request)
+        recorded = None if self.mode == "record" else self.store.get(key)
+        if recorded is None and self.mode == "replay":
+            raise LookupError(
+                f"No recorded response for {self.llm._llm_type} request {key[:12]}"
+            )
+        if recorded is not None:
+            return messages, kwargs, chat_result(recorded), None
+        return messages, kwargs, None, (key, request)
+
+    def _after_call(self, context, result: ChatResult) -> ChatResult:
+        key, request = context
+        self.store.set(
+            key,
+            self.llm._llm_type,
+            request,
+            [generation.message for generation in result.generations],
+        )
+        return result
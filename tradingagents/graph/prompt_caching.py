@@ -0,0 +1,132 @@
+# TradingAgents/graph/prompt_caching.py
+
+import threading
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlparse
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.messages import BaseMessage
+from langchain_core.outputs import LLMResult
+
+from .chat_model_wrapper import ChatModelWrapper
+
+
+def supports_prompt_caching(provider: str, backend_url: Optional[str]) -> bool:
+    """Whether requests to this provider and backend accept the cache parameters.
+
+    OpenAI-compatible servers (Ollama, OpenRouter, vLLM) may reject the unknown
+    prompt_cache_key parameter, so OpenAI caching is limited to api.openai.com.
+    """
+    if provider == "anthropic":
+        return True
+    if provider == "openai":
+        return urlparse(backend_url or "").hostname == "api.openai.com"
+    return False
+
+
+class PromptCachingChatModel(ChatModelWrapper):
+    """Chat model wrapper that asks the provider to cache the static prompt prefix.
+
+    Agent prompts start with a static system message followed by the
+    per-run values. For Anthropic that system message gets a cache_control
+    breakpoint, so tools and system prompt are cached together. OpenAI caches
+    prefixes automatically; requests get a prompt_cache_key per graph node so
+    identical prefixes are routed to the same cache.
+    """
+
+    provider: str
+    cache_retention: Optional[str] = None  # OpenAI prompt_cache_retention, e.g. "24h"
+    wrapper_type: str = "prompt-caching"
+
+    def _before_call(self, messages: List[BaseMessage], stop, kwargs: dict, run_manager):
+        if self.provider == "anthropic":
+            if messages and messages[0].type == "system" and isinstance(
+                messages[0].content, str
+            ):
+                breakpoint_block = {
+                    "type": "text",
+                    "text": messages[0].content,
+                    "cache_control": {"type": "ephemeral"},
+                }
+                messages = [
+                    messages[0].model_copy(update={"content": [breakpoint_block]})
+                ] + list(messages[1:])
+        elif self.provider == "openai":
+            # Sent in the request body: older openai clients reject these as
+            # keyword arguments of Completions.create()
+            node = run_manager.metadata.get("langgraph_node") if run_manager else None
+            extra_body = {"prompt_cache_key": f"tradingagents-{node or 'default'}"}
+            if self.cache_retention:
+                extra_body["prompt_cache_retention"] = self.cache_retention
+            kwargs = {
+                **kwargs,
+                "extra_body": {
+                    **extra_body,
+                    **(getattr(self.llm, "extra_body", None) or {}),
+                    **(kwargs.get("extra_body") or {}),
+                },
+            }
+        return messages, kwargs, None, None
+
+
+class RunMetrics(BaseCallbackHandler):
+    """Callback collecting LLM calls and token usage of a graph run per node,
+    including input tokens served from the provider's prompt cache."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._nodes = {}  # run_id -> graph node of an in-flight chat model call
+        self._usage = {}  # node -> counters
+
+    def on_chat_model_start(
+        self, serialized, messages, *, run_id, metadata=None, **kwargs
+    ):
+        with self._lock:
+            self._nodes[run_id] = (metadata or {}).get("langgraph_node", "")
+
+    def on_llm_end(self, response: LLMResult, *, run_id, **kwargs):
+        with self._lock:
+            node = self._nodes.pop(run_id, "")
+            usage = self._usage.setdefault(
+                node,
+                {
+                    "calls": 0,
+                    "input_tokens": 0,
+                    "output_tokens": 0,
+                    "cached_input_tokens": 0,
+                    "cache_creation_input_tokens": 0,
+                },
+            )
+            usage["calls"] += 1
+            for generations in response.generations:
+                for generation in generations:
+                    metadata = getattr(generation, "message", None)
+                    metadata = getattr(metadata, "usage_metadata", None) or {}
+                    details = metadata.get("input_token_details") or {}
+                    usage["input_tokens"] += metadata.get("input_tokens", 0)
+                    usage["output_tokens"] += metadata.get("output_tokens", 0)
+                    usage["cached_input_tokens"] += details.get("cache_read") or 0
+                    usage["cache_creation_input_tokens"] += (
+                        details.get("cache_creation") or 0
+                    )
+
+    def on_llm_error(self, error, *, run_id, **kwargs):
+        with self._lock:
+            self._nodes.pop(run_id, None)
+
+    def summary(self) -> Dict[str, Any]:
+        """Totals and per-node counters, with the share of cached input tokens."""
+        with self._lock:
+            nodes = {node: dict(usage) for node, usage in self._usage.items()}
+
+        total = {}
+        for usage in nodes.values():
+            for key, value in usage.items():
+                total[key] = total.get(key, 0) + value
+        for usage in [total, *nodes.values()]:
+            usage["cached_input_ratio"] = (
+                usage.get("cached_input_tokens", 0) / usage["input_tokens"]
+                if usage.get("input_tokens")
+                else 0.0
+            )
+        return {"total": total, "nodes": nodes}
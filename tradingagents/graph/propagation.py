@@ -24,7 +24,14 @@ class Propagator:
             "company_of_interest": company_name,
             "trade_date": str(trade_date),
             "investment_debate_state": InvestDebateState(
-                {"history": "", "current_response": "", "count": 0}
+                {
+                    "history": "",
+                    "current_response": "",
+                    "count": 0,
+                    "turns": [],
+                    "summary": "",
+                    "summarized_count": 0,
+                }
             ),
             "risk_debate_state": RiskDebateState(
                 {
@@ -33,6 +40,9 @@ class Propagator:
                     "current_safe_response": "",
                     "current_neutral_response": "",
                     "count": 0,
+                    "turns": [],
+                    "summary": "",
+                    "summarized_count": 0,
                 }
             ),
             "market_report": "",
@@ -41,9 +51,21 @@ class Propagator:
             "news_report": "",
         }
 
-    def get_graph_args(self) -> Dict[str, Any]:
-        """Get arguments for the graph invocation."""
+    def get_graph_args(self, callbacks=None, state=None) -> Dict[str, Any]:
+        """Get arguments for the graph invocation.
+
+        With the initial state, the ticker and trade date are added to the run
+        metadata, so chat model wrappers can tell runs apart.
+        """
+        config = {"recursion_limit": self.max_recur_limit}
+        if callbacks:
+            config["callbacks"] = callbacks
+        if state:
+            config["metadata"] = {
+                "company_of_interest": state["company_of_interest"],
+                "trade_date": state["trade_date"],
+            }
         return {
             "stream_mode": "values",
-            "config": {"recursion_limit": self.max_recur_limit},
+            "config": config,
         }
@@ -1,12 +1,21 @@
 # TradingAgents/graph/reflection.py
 
-from typing import Dict, Any
+from typing import Any, Dict, List, Optional, Tuple
 from langchain_openai import ChatOpenAI
 
 
 class Reflector:
     """Handles reflection on decisions and updating memory."""
 
+    # Reflected component -> the part of the final state it is judged on
+    components = {
+        "bull": lambda state: state["investment_debate_state"]["bull_history"],
+        "bear": lambda state: state["investment_debate_state"]["bear_history"],
+        "trader": lambda state: state["trader_investment_plan"],
+        "invest_judge": lambda state: state["investment_debate_state"]["judge_decision"],
+        "risk_manager": lambda state: state["risk_debate_state"]["judge_decision"],
+    }
+
     def __init__(self, quick_thinking_llm: ChatOpenAI):
         """Initialize the reflector with an LLM."""
         self.quick_thinking_llm = quick_thinking_llm
@@ -55,11 +64,9 @@ Adhere strictly to these instructions, and ensure your output is detailed, accur
 
         return f"{curr_market_report}\n\n{curr_sentiment_report}\n\n{curr_news_report}\n\n{curr_fundamentals_report}"
 
-    def _reflect_on_component(
-        self, component_type: str, report: str, situation: str, returns_losses
-    ) -> str:
-        """Generate reflection for a component."""
-        messages = [
+    def _reflection_messages(self, report: str, situation: str, returns_losses):
+        """Prompt asking to reflect on a report given the situation and returns."""
+        return [
             ("system", self.reflection_system_prompt),
             (
                 "human",
@@ -67,55 +74,95 @@ Adhere strictly to these instructions, and ensure your output is detailed, accur
             ),
         ]
 
-        result = self.quick_thinking_llm.invoke(messages).content
-        return result
+    def reflect_many(
+        self,
+        runs: List[Tuple[Dict[str, Any], Any]],
+        memories: Dict[str, Any],
+        max_concurrency: Optional[int] = None,
+    ):
+        """Reflect every component on several runs and update their memories.
+
+        Each run's situation is built once, all reflection prompts are sent
+        concurrently, and each distinct situation is embedded once for all
+        memories. A failed reflection is logged and skipped; the others are
+        still stored.
+
+        Args:
+            runs: (final_state, returns_losses) pairs
+            memories: Component name (see `components`) -> its memory
+            max_concurrency: Maximum number of concurrent reflection calls
+        """
+        situations = [self._extract_current_situation(state) for state, _ in runs]
+        targets, requests = [], []
+        for (state, returns_losses), situation in zip(runs, situations):
+            for component in memories:
+                targets.append((component, situation))
+                requests.append(
+                    self._reflection_messages(
+                        self.components[component](state), situation, returns_losses
+                    )
+                )
+        if not requests:
+            return
+
+        results = self.quick_thinking_llm.batch(
+            requests,
+            config={"max_concurrency": max_concurrency},
+            return_exceptions=True,
+        )
+        reflected = []
+        for target, result in zip(targets, results):
+            if isinstance(result, Exception):
+                print(f"FAILED: reflection for {target[0]}: {result}")
+            else:
+                reflected.append((target, result.content))
+        if not reflected:
+            return
+
+        # All memories embed with the same backend, so one request covers them
+        unique_situations = list(
+            dict.fromkeys(situation for (_, situation), _ in reflected)
+        )
+        embeddings = dict(
+            zip(
+                unique_situations,
+                next(iter(memories.values())).get_embeddings(unique_situations),
+            )
+        )
+
+        for component, memory in memories.items():
+            reflections = [
+                (situation, reflection)
+                for (target, situation), reflection in reflected
+                if target == component
+            ]
+            if not reflections:
+                continue
+            memory.add_situations(
+                reflections,
+                embeddings=[embeddings[situation] for situation, _ in reflections],
+            )
 
     def reflect_bull_researcher(self, current_state, returns_losses, bull_memory):
         """Reflect on bull researcher's analysis and update memory."""
-        situation = self._extract_current_situation(current_state)
-        bull_debate_history = current_state["investment_debate_state"]["bull_history"]
-
-        result = self._reflect_on_component(
-            "BULL", bull_debate_history, situation, returns_losses
-        )
-        bull_memory.add_situations([(situation, result)])
+        self.reflect_many([(current_state, returns_losses)], {"bull": bull_memory})
 
     def reflect_bear_researcher(self, current_state, returns_losses, bear_memory):
         """Reflect on bear researcher's analysis and update memory."""
-        situation = self._extract_current_situation(current_state)
-        bear_debate_history = current_state["investment_debate_state"]["bear_history"]
-
-        result = self._reflect_on_component(
-            "BEAR", bear_debate_history, situation, returns_losses
-        )
-        bear_memory.add_situations([(situation, result)])
+        self.reflect_many([(current_state, returns_losses)], {"bear": bear_memory})
 
     def reflect_trader(self, current_state, returns_losses, trader_memory):
         """Reflect on trader's decision and update memory."""
-        situation = self._extract_current_situation(current_state)
-        trader_decision = current_state["trader_investment_plan"]
-
-        result = self._reflect_on_component(
-            "TRADER", trader_decision, situation, returns_losses
-        )
-        trader_memory.add_situations([(situation, result)])
+        self.reflect_many([(current_state, returns_losses)], {"trader": trader_memory})
 
     def reflect_invest_judge(self, current_state, returns_losses, invest_judge_memory):
         """Reflect on investment judge's decision and update memory."""
-        situation = self._extract_current_situation(current_state)
-        judge_decision = current_state["investment_debate_state"]["judge_decision"]
-
-        result = self._reflect_on_component(
-            "INVEST JUDGE", judge_decision, situation, returns_losses
+        self.reflect_many(
+            [(current_state, returns_losses)], {"invest_judge": invest_judge_memory}
         )
-        invest_judge_memory.add_situations([(situation, result)])
 
     def reflect_risk_manager(self, current_state, returns_losses, risk_manager_memory):
         """Reflect on risk manager's decision and update memory."""
-        situation = self._extract_current_situation(current_state)
-        judge_decision = current_state["risk_debate_state"]["judge_decision"]
-
-        result = self._reflect_on_component(
-            "RISK JUDGE", judge_decision, situation, returns_losses
+        self.reflect_many(
+            [(current_state, returns_losses)], {"risk_manager": risk_manager_memory}
         )
-        risk_manager_memory.add_situations([(situation, result)])
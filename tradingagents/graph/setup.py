@@ -1,6 +1,7 @@
 # TradingAgents/graph/setup.py
 
 from typing import Dict, Any
+from langchain_core.runnables import Runnable, RunnableLambda
 from langchain_openai import ChatOpenAI
 from langgraph.graph import END, StateGraph, START
 from langgraph.prebuilt import ToolNode
@@ -25,6 +26,8 @@ class GraphSetup:
         invest_judge_memory,
         risk_manager_memory,
         conditional_logic: ConditionalLogic,
+        debate_context=None,
+        report_distiller=None,
     ):
         """Initialize with required components."""
         self.quick_thinking_llm = quick_thinking_llm
@@ -36,9 +39,51 @@ class GraphSetup:
         self.invest_judge_memory = invest_judge_memory
         self.risk_manager_memory = risk_manager_memory
         self.conditional_logic = conditional_logic
+        self.debate_context = debate_context
+        self.report_distiller = report_distiller
+
+    @staticmethod
+    def _bind_message_channel(node, channel: str):
+        """Run an analyst node against its own message channel instead of `messages`."""
+        if not isinstance(node, Runnable):
+            node = RunnableLambda(node)
+
+        def channel_input(state):
+            return {**state, "messages": state.get(channel) or state["messages"]}
+
+        def channel_update(state, result):
+            result = dict(result)
+            if "messages" in result:
+                new_messages = list(result.pop("messages"))
+                if not state.get(channel):
+                    # Seed the channel with the initial human message on first use
+                    new_messages = list(state["messages"]) + new_messages
+                result[channel] = new_messages
+            return result
+
+        def channel_node(state, config):
+            return channel_update(state, node.invoke(channel_input(state), config))
+
+        async def achannel_node(state, config):
+            return channel_update(
+                state, await node.ainvoke(channel_input(state), config)
+            )
+
+        return RunnableLambda(channel_node, afunc=achannel_node)
+
+    @staticmethod
+    def _bind_condition_channel(condition, channel: str):
+        """Evaluate a routing condition against an analyst's message channel."""
+
+        def channel_condition(state):
+            return condition({**state, "messages": state[channel]})
+
+        return channel_condition
 
     def setup_graph(
-        self, selected_analysts=["market", "social", "news", "fundamentals"]
+        self,
+        selected_analysts=["market", "social", "news", "fundamentals"],
+        parallel_analysts=False,
     ):
         """Set up and compile the agent workflow graph.
 
@@ -48,6 +93,9 @@ class GraphSetup:
                 - "social": Social media analyst
                 - "news": News analyst
                 - "fundamentals": Fundamentals analyst
+            parallel_analysts (bool): Run the analysts concurrently, each with its
+                own tool loop on an isolated message channel, and join them before
+                the Bull Researcher. If False, the analysts run as a sequential chain.
         """
         if len(selected_analysts) == 0:
             raise ValueError("Trading Agents Graph Setup Error: no analysts selected!")
@@ -87,10 +135,10 @@ class GraphSetup:
 
         # Create researcher and manager nodes
         bull_researcher_node = create_bull_researcher(
-            self.quick_thinking_llm, self.bull_memory
+            self.quick_thinking_llm, self.bull_memory, self.debate_context
         )
         bear_researcher_node = create_bear_researcher(
-            self.quick_thinking_llm, self.bear_memory
+            self.quick_thinking_llm, self.bear_memory, self.debate_context
         )
         research_manager_node = create_research_manager(
             self.deep_thinking_llm, self.invest_judge_memory
@@ -98,9 +146,9 @@ class GraphSetup:
         trader_node = create_trader(self.quick_thinking_llm, self.trader_memory)
 
         # Create risk analysis nodes
-        risky_analyst = create_risky_debator(self.quick_thinking_llm)
-        neutral_analyst = create_neutral_debator(self.quick_thinking_llm)
-        safe_analyst = create_safe_debator(self.quick_thinking_llm)
+        risky_analyst = create_risky_debator(self.quick_thinking_llm, self.debate_context)
+        neutral_analyst = create_neutral_debator(self.quick_thinking_llm, self.debate_context)
+        safe_analyst = create_safe_debator(self.quick_thinking_llm, self.debate_context)
         risk_manager_node = create_risk_manager(
             self.deep_thinking_llm, self.risk_manager_memory
         )
@@ -108,6 +156,21 @@ class GraphSetup:
         # Create workflow
         workflow = StateGraph(AgentState)
 
+        # Parallel analysts each keep their tool loop on a separate channel
+        if parallel_analysts:
+            for analyst_type in selected_analysts:
+                channel = f"{analyst_type}_messages"
+                analyst_nodes[analyst_type] = self._bind_message_channel(
+                    analyst_nodes[analyst_type], channel
+                )
+                delete_nodes[analyst_type] = self._bind_message_channel(
+                    delete_nodes[analyst_type], channel
+                )
+                tool_nodes[analyst_type] = ToolNode(
+                    list(tool_nodes[analyst_type].tools_by_name.values()),
+                    messages_key=channel,
+                )
+
         # Add analyst nodes to the graph
         for analyst_type, node in analyst_nodes.items():
             workflow.add_node(f"{analyst_type.capitalize()} Analyst", node)
@@ -126,31 +189,63 @@ class GraphSetup:
         workflow.add_node("Safe Analyst", safe_analyst)
         workflow.add_node("Risk Judge", risk_manager_node)
 
+        # Optionally condense the reports once before the debates
+        debate_entry = "Bull Researcher"
+        if self.report_distiller is not None:
+            workflow.add_node("Report Distiller", self.report_distiller)
+            workflow.add_edge("Report Distiller", "Bull Researcher")
+            debate_entry = "Report Distiller"
+
         # Define edges
-        # Start with the first analyst
-        first_analyst = selected_analysts[0]
-        workflow.add_edge(START, f"{first_analyst.capitalize()} Analyst")
+        if parallel_analysts:
+            # Fan out from START to every analyst
+            for analyst_type in selected_analysts:
+                workflow.add_edge(START, f"{analyst_type.capitalize()} Analyst")
+        else:
+            # Start with the first analyst
+            first_analyst = selected_analysts[0]
+            workflow.add_edge(START, f"{first_analyst.capitalize()} Analyst")
 
-        # Connect analysts in sequence
+        # Connect analysts to their tool loops
         for i, analyst_type in enumerate(selected_analysts):
             current_analyst = f"{analyst_type.capitalize()} Analyst"
             current_tools = f"tools_{analyst_type}"
             current_clear = f"Msg Clear {analyst_type.capitalize()}"
 
             # Add conditional edges for current analyst
+            condition = getattr(
+                self.conditional_logic, f"should_continue_{analyst_type}"
+            )
+            if parallel_analysts:
+                condition = self._bind_condition_channel(
+                    condition, f"{analyst_type}_messages"
+                )
             workflow.add_conditional_edges(
                 current_analyst,
-                getattr(self.conditional_logic, f"should_continue_{analyst_type}"),
+                condition,
                 [current_tools, current_clear],
             )
             workflow.add_edge(current_tools, current_analyst)
 
+            if parallel_analysts:
+                continue
+
             # Connect to next analyst or to Bull Researcher if this is the last analyst
             if i < len(selected_analysts) - 1:
                 next_analyst = f"{selected_analysts[i+1].capitalize()} Analyst"
                 workflow.add_edge(current_clear, next_analyst)
             else:
-                workflow.add_edge(current_clear, "Bull Researcher")
+                workflow.add_edge(current_clear, debate_entry)
+
+        if parallel_analysts:
+            # Join all analyst branches before the research debate
+            workflow.add_edge(
+                [
+                    f"Msg Clear {analyst_type.capitalize()}"
+                    for analyst_type in selected_analysts
+                ],
+                debate_entry,
+            )
 
         # Add remaining edges
         workflow.add_conditional_edges(
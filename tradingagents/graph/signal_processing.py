@@ -1,31 +1,100 @@
 # TradingAgents/graph/signal_processing.py
 
+import re
+import threading
+from typing import Dict, Optional
+
 from langchain_openai import ChatOpenAI
 
+# "FINALER TRANSAKTIONSVORSCHLAG: **KAUFEN**" or its English form; a decision
+# followed by "/" is the echoed template, not a decision
+_DECISION_MARKER = re.compile(
+    r"(?:FINALER\s+TRANSAKTIONSVORSCHLAG|FINAL\s+TRANSACTION\s+PROPOSAL)[\s:*]*"
+    r"(KAUFEN|VERKAUFEN|HALTEN|BUY|SELL|HOLD)\b(?!\s*/)",
+    re.IGNORECASE,
+)
+_DECISIONS = {
+    "KAUFEN": "BUY",
+    "VERKAUFEN": "SELL",
+    "HALTEN": "HOLD",
+    "BUY": "BUY",
+    "SELL": "SELL",
+    "HOLD": "HOLD",
+}
+
 
 class SignalProcessor:
     """Processes trading signals to extract actionable decisions."""
 
-    def __init__(self, quick_thinking_llm: ChatOpenAI):
-        """Initialize with an LLM for processing."""
+    def __init__(self, quick_thinking_llm: ChatOpenAI, fast_path: bool = True):
+        """Initialize with an LLM for processing.
+
+        Args:
+            quick_thinking_llm: LLM used when the decision cannot be parsed
+            fast_path: Parse the final transaction proposal marker before
+                asking the LLM
+        """
         self.quick_thinking_llm = quick_thinking_llm
+        self.fast_path = fast_path
+        self._lock = threading.Lock()
+        self._stats = {"parsed": 0, "llm_fallbacks": 0}
+
+    @staticmethod
+    def parse_decision(full_signal: str) -> Optional[str]:
+        """The decision stated by the final transaction proposal marker(s),
+        or None if there is no marker or the markers disagree."""
+        decisions = {
+            _DECISIONS[match.upper()] for match in _DECISION_MARKER.findall(full_signal)
+        }
+        return decisions.pop() if len(decisions) == 1 else None
+
+    def _fast_decision(self, full_signal: str) -> Optional[str]:
+        decision = self.parse_decision(full_signal) if self.fast_path else None
+        with self._lock:
+            self._stats["parsed" if decision else "llm_fallbacks"] += 1
+        return decision
+
+    def stats(self) -> Dict[str, float]:
+        """How many signals were parsed and how many needed the LLM."""
+        with self._lock:
+            total = self._stats["parsed"] + self._stats["llm_fallbacks"]
+            return {
+                **self._stats,
+                "fallback_rate": self._stats["llm_fallbacks"] / total if total else 0.0,
+            }
 
     def process_signal(self, full_signal: str) -> str:
         """
         Process a full trading signal to extract the core decision.
 
+        The final transaction proposal marker is parsed directly; the LLM is
+        only asked when it is missing or ambiguous.
+
         Args:
             full_signal: Complete trading signal text
 
         Returns:
             Extracted decision (BUY, SELL, or HOLD)
         """
-        messages = [
+        decision = self._fast_decision(full_signal)
+        if decision:
+            return decision
+        return self.quick_thinking_llm.invoke(self._get_messages(full_signal)).content
+
+    async def aprocess_signal(self, full_signal: str) -> str:
+        """Async variant of process_signal."""
+        decision = self._fast_decision(full_signal)
+        if decision:
+            return decision
+        result = await self.quick_thinking_llm.ainvoke(self._get_messages(full_signal))
+        return result.content
+
+    def _get_messages(self, full_signal: str) -> list:
+        """Build the extraction prompt for a trading signal."""
+        return [
             (
                 "system",
                 "You are an efficient assistant designed to analyze paragraphs or financial reports provided by a group of analysts. Your task is to extract the investment decision: SELL, BUY, or HOLD. Provide only the extracted decision (SELL, BUY, or HOLD) as your output, without adding any additional text or information.",
             ),
             ("human", full_signal),
         ]
-
-        return self.quick_thinking_llm.invoke(messages).content
@@ -3,8 +3,10 @@
 import os
 from pathlib import Path
 import json
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import date
-from typing import Dict, Any, Tuple, List, Optional
+from typing import Dict, Any, Tuple, List, Optional, Iterator, Sequence, Union
 
 from langchain_openai import ChatOpenAI
 from langchain_anthropic import ChatAnthropic
@@ -15,12 +17,15 @@ from langgraph.prebuilt import ToolNode
 from tradingagents.agents import *
 from tradingagents.default_config import DEFAULT_CONFIG
 from tradingagents.agents.utils.memory import FinancialSituationMemory
+from tradingagents.agents.utils.debate_context import DebateContext
 from tradingagents.agents.utils.agent_states import (
     AgentState,
     InvestDebateState,
     RiskDebateState,
 )
 from tradingagents.dataflows.config import set_config
+from tradingagents.dataflows.price_cache import prefetch_prices
+from tradingagents.dataflows.vendor_cache import get_vendor_cache
 
 # Import the new abstract tool methods from agent_utils
 from tradingagents.agents.utils.agent_utils import (
@@ -41,6 +46,9 @@ from .setup import GraphSetup
 from .propagation import Propagator
 from .reflection import Reflector
 from .signal_processing import SignalProcessor
+from .llm_recording import LLMRecordingStore, RecordingChatModel, ReplayOnlyChatModel
+from .llm_cache import CachingChatModel, LLMResponseCache
+from .prompt_caching import PromptCachingChatModel, RunMetrics, supports_prompt_caching
 
 
 class TradingAgentsGraph:
@@ -72,7 +80,12 @@ class TradingAgentsGraph:
         )
 
         # Initialize LLMs
-        if self.config["llm_provider"].lower() == "openai" or self.config["llm_provider"] == "ollama" or self.config["llm_provider"] == "openrouter":
+        recording = self.config.get("llm_recording", {})
+        if recording.get("mode") == "replay":
+            # Every response comes from the recording: no provider clients or API keys
+            self.deep_thinking_llm = ReplayOnlyChatModel(model=self.config["deep_think_llm"])
+            self.quick_thinking_llm = ReplayOnlyChatModel(model=self.config["quick_think_llm"])
+        elif self.config["llm_provider"].lower() == "openai" or self.config["llm_provider"] == "ollama" or self.config["llm_provider"] == "openrouter":
             self.deep_thinking_llm = ChatOpenAI(model=self.config["deep_think_llm"], base_url=self.config["backend_url"])
             self.quick_thinking_llm = ChatOpenAI(model=self.config["quick_think_llm"], base_url=self.config["backend_url"])
         elif self.config["llm_provider"].lower() == "anthropic":
@@ -83,7 +96,63 @@ class TradingAgentsGraph:
             self.quick_thinking_llm = ChatGoogleGenerativeAI(model=self.config["quick_think_llm"])
         else:
             raise ValueError(f"Unsupported LLM provider: {self.config['llm_provider']}")
+
+        # Let the provider cache the static prefix of every agent prompt
+        prompt_caching = self.config.get("prompt_caching", {})
+        provider = self.config["llm_provider"].lower()
+        if prompt_caching.get("enabled", False) and supports_prompt_caching(
+            provider, self.config["backend_url"]
+        ):
+            self.deep_thinking_llm = PromptCachingChatModel(
+                llm=self.deep_thinking_llm,
+                provider=provider,
+                cache_retention=prompt_caching.get("openai_cache_retention"),
+            )
+            self.quick_thinking_llm = PromptCachingChatModel(
+                llm=self.quick_thinking_llm,
+                provider=provider,
+                cache_retention=prompt_caching.get("openai_cache_retention"),
+            )
+
+        # Record LLM responses, or replay recorded ones. Requests are keyed by
+        # provider and model name, which replay knows without the clients
+        if recording.get("mode"):
+            store = LLMRecordingStore(
+                recording.get("path")
+                or os.path.join(self.config["data_cache_dir"], "llm_recordings.sqlite")
+            )
+            self.deep_thinking_llm = RecordingChatModel(
+                llm=self.deep_thinking_llm,
+                store=store,
+                mode=recording["mode"],
+                model_id=f"{provider}:{self.config['deep_think_llm']}",
+            )
+            self.quick_thinking_llm = RecordingChatModel(
+                llm=self.quick_thinking_llm,
+                store=store,
+                mode=recording["mode"],
+                model_id=f"{provider}:{self.config['quick_think_llm']}",
+            )
         
+        # Serve repeated prompts of the configured nodes from the response cache
+        self.llm_cache = None
+        cache_settings = self.config.get("llm_cache", {})
+        if cache_settings.get("enabled", False):
+            self.llm_cache = LLMResponseCache(
+                cache_settings.get("path")
+                or os.path.join(self.config["data_cache_dir"], "llm_cache.sqlite"),
+                ttl_seconds=cache_settings.get("ttl_seconds"),
+                max_entries=cache_settings.get("max_entries", 10000),
+                similarity_threshold=cache_settings.get("similarity_threshold"),
+            )
+            nodes = list(cache_settings.get("nodes", []))
+            self.deep_thinking_llm = CachingChatModel(
+                llm=self.deep_thinking_llm, response_cache=self.llm_cache, nodes=nodes
+            )
+            self.quick_thinking_llm = CachingChatModel(
+                llm=self.quick_thinking_llm, response_cache=self.llm_cache, nodes=nodes
+            )
+
         # Initialize memories
         self.bull_memory = FinancialSituationMemory("bull_memory", self.config)
         self.bear_memory = FinancialSituationMemory("bear_memory", self.config)
@@ -91,6 +160,10 @@ class TradingAgentsGraph:
         self.invest_judge_memory = FinancialSituationMemory("invest_judge_memory", self.config)
         self.risk_manager_memory = FinancialSituationMemory("risk_manager_memory", self.config)
 
+        if self.llm_cache is not None and self.llm_cache.similarity_threshold is not None:
+            # Embed prompts with the same backend as the memories
+            self.llm_cache.embed = self.bull_memory.get_embedding
+
         # Create tool nodes
         self.tool_nodes = self._create_tool_nodes()
 
@@ -106,19 +179,35 @@ class TradingAgentsGraph:
             self.invest_judge_memory,
             self.risk_manager_memory,
             self.conditional_logic,
+            DebateContext.from_config(self.quick_thinking_llm, self.config),
+            (
+                create_report_distiller(
+                    self.quick_thinking_llm,
+                    self.config.get("report_distillation", {}).get("max_words", 250),
+                )
+                if self.config.get("report_distillation", {}).get("enabled", False)
+                else None
+            ),
         )
 
         self.propagator = Propagator()
         self.reflector = Reflector(self.quick_thinking_llm)
-        self.signal_processor = SignalProcessor(self.quick_thinking_llm)
+        self.signal_processor = SignalProcessor(
+            self.quick_thinking_llm, self.config.get("signal_fast_path", True)
+        )
 
         # State tracking
         self.curr_state = None
         self.ticker = None
-        self.log_states_dict = {}  # date to full state dict
+        self.last_run_metrics = None  # LLM calls and token usage of the last propagate
+        self.log_states_dict = {}  # ticker to (date to full state dict)
+        self._log_lock = threading.Lock()
 
         # Set up the graph
-        self.graph = self.graph_setup.setup_graph(selected_analysts)
+        self.graph = self.graph_setup.setup_graph(
+            selected_analysts,
+            parallel_analysts=self.config.get("parallel_analysts", False),
+        )
 
     def _create_tool_nodes(self) -> Dict[str, ToolNode]:
         """Create tool nodes for different data sources using abstract methods."""
@@ -162,11 +251,134 @@ class TradingAgentsGraph:
 
         self.ticker = company_name
 
+        metrics = RunMetrics()
+        final_state = self._run_graph(company_name, trade_date, [metrics])
+
+        # Store current state for reflection
+        self.curr_state = final_state
+        self.last_run_metrics = metrics.summary()
+
+        # Log state
+        self._log_state(trade_date, final_state, self.last_run_metrics)
+        self._report_cache_stats()
+
+        # Return decision and processed signal
+        return final_state, self.process_signal(final_state["final_trade_decision"])
+
+    async def apropagate(self, company_name, trade_date):
+        """Async variant of propagate, running every node with ainvoke/astream.
+
+        Many calls can be awaited concurrently on one event loop.
+        """
+
+        self.ticker = company_name
+
+        metrics = RunMetrics()
+        final_state = await self._arun_graph(company_name, trade_date, [metrics])
+
+        # Store current state for reflection
+        self.curr_state = final_state
+        self.last_run_metrics = metrics.summary()
+
+        # Log state
+        self._log_state(trade_date, final_state, self.last_run_metrics)
+        self._report_cache_stats()
+
+        # Return decision and processed signal
+        return final_state, await self.aprocess_signal(
+            final_state["final_trade_decision"]
+        )
+
+    def propagate_many(
+        self,
+        tickers: Sequence[str],
+        dates: Union[str, Sequence[str]],
+        max_concurrency: int = 4,
+    ) -> Iterator[Dict[str, Any]]:
+        """Run the graph for many (ticker, date) pairs concurrently.
+
+        All runs share this instance's compiled graph, LLM clients and memories.
+        Results are yielded as each run finishes, not in input order. Closing
+        the generator early cancels the runs that have not started yet.
+
+        Args:
+            tickers: Ticker symbols to analyze
+            dates: A single trade date applied to every ticker, or one date per ticker
+            max_concurrency: Maximum number of graph runs in flight at once
+
+        Yields:
+            Dict with company_of_interest, trade_date, final_state, decision,
+            metrics (LLM calls and token usage, see RunMetrics.summary) and error
+            (None on success; the other results are None on failure)
+        """
+        tickers = list(tickers)
+        if isinstance(dates, (str, date)):
+            dates = [dates] * len(tickers)
+        else:
+            dates = list(dates)
+        if len(dates) != len(tickers):
+            raise ValueError(
+                f"propagate_many: got {len(tickers)} tickers but {len(dates)} dates"
+            )
+        if max_concurrency < 1:
+            raise ValueError("propagate_many: max_concurrency must be at least 1")
+
+        self.prefetch_prices(tickers)
+
+        def run_one(company_name, trade_date):
+            metrics = RunMetrics()
+            final_state = self._run_graph(company_name, trade_date, [metrics])
+            self._log_state(trade_date, final_state, metrics.summary())
+            decision = self.process_signal(final_state["final_trade_decision"])
+            return final_state, decision, metrics.summary()
+
+        executor = ThreadPoolExecutor(max_workers=max_concurrency)
+        try:
+            futures = {
+                executor.submit(run_one, company_name, trade_date): (
+                    company_name,
+                    trade_date,
+                )
+                for company_name, trade_date in zip(tickers, dates)
+            }
+            for future in as_completed(futures):
+                company_name, trade_date = futures[future]
+                try:
+                    final_state, decision, metrics = future.result()
+                    error = None
+                except Exception as e:
+                    print(f"FAILED: propagate for {company_name} on {trade_date}: {e}")
+                    final_state, decision, metrics, error = None, None, None, e
+
+                yield {
+                    "company_of_interest": company_name,
+                    "trade_date": str(trade_date),
+                    "final_state": final_state,
+                    "decision": decision,
+                    "metrics": metrics,
+                    "error": error,
+                }
+        finally:
+            # When the caller stops early, cancel the queued runs instead of
+            # waiting for them; runs already in flight finish in the background
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        self._report_cache_stats()
+
+    def _report_cache_stats(self):
+        """Print the vendor cache hit rate of this process, if the cache is enabled."""
+        vendor_cache = get_vendor_cache()
+        if vendor_cache is not None:
+            vendor_cache.report()
+
+    def _run_graph(self, company_name, trade_date, callbacks=None):
+        """Run the compiled graph once and return the final state."""
+
         # Initialize state
         init_agent_state = self.propagator.create_initial_state(
             company_name, trade_date
         )
-        args = self.propagator.get_graph_args()
+        args = self.propagator.get_graph_args(callbacks, init_agent_state)
 
         if self.debug:
             # Debug mode with tracing
@@ -183,24 +395,68 @@ class TradingAgentsGraph:
             # Standard mode without tracing
             final_state = self.graph.invoke(init_agent_state, **args)
 
-        # Store current state for reflection
-        self.curr_state = final_state
+        return final_state
 
-        # Log state
-        self._log_state(trade_date, final_state)
+    async def _arun_graph(self, company_name, trade_date, callbacks=None):
+        """Run the compiled graph once on the event loop and return the final state."""
 
-        # Return decision and processed signal
-        return final_state, self.process_signal(final_state["final_trade_decision"])
+        # Initialize state
+        init_agent_state = self.propagator.create_initial_state(
+            company_name, trade_date
+        )
+        args = self.propagator.get_graph_args(callbacks, init_agent_state)
+
+        if self.debug:
+            # Debug mode with tracing
+            trace = []
+            async for chunk in self.graph.astream(init_agent_state, **args):
+                if len(chunk["messages"]) == 0:
+                    pass
+                else:
+                    chunk["messages"][-1].pretty_print()
+                    trace.append(chunk)
+
+            final_state = trace[-1]
+        else:
+            # Standard mode without tracing
+            final_state = await self.graph.ainvoke(init_agent_state, **args)
+
+        return final_state
+
+    def prefetch_prices(self, tickers: Sequence[str]):
+        """Fill the price cache for all tickers in one batched download.
 
-    def _log_state(self, trade_date, final_state):
+        Only runs when prices or indicators come from yfinance and
+        "prefetch_prices" is enabled; failures are logged, the graph then
+        downloads per ticker as before.
+        """
+        vendors = self.config["data_vendors"]
+        uses_yfinance = "yfinance" in (
+            vendors.get("core_stock_apis"),
+            vendors.get("technical_indicators"),
+        )
+        if not self.config.get("prefetch_prices", False) or not uses_yfinance:
+            return
+
+        try:
+            prefetch_prices(list(tickers))
+        except Exception as e:
+            print(f"FAILED: price prefetch: {e}")
+
+    def _log_state(self, trade_date, final_state, metrics=None):
         """Log the final state to a JSON file."""
-        self.log_states_dict[str(trade_date)] = {
+        ticker = final_state["company_of_interest"]
+        state_entry = {
             "company_of_interest": final_state["company_of_interest"],
             "trade_date": final_state["trade_date"],
             "market_report": final_state["market_report"],
             "sentiment_report": final_state["sentiment_report"],
             "news_report": final_state["news_report"],
             "fundamentals_report": final_state["fundamentals_report"],
+            "report_digests": {
+                report: final_state.get(f"{report}_digest", "")
+                for report in ("market", "sentiment", "news", "fundamentals")
+            },
             "investment_debate_state": {
                 "bull_history": final_state["investment_debate_state"]["bull_history"],
                 "bear_history": final_state["investment_debate_state"]["bear_history"],
@@ -222,36 +478,59 @@ class TradingAgentsGraph:
             },
             "investment_plan": final_state["investment_plan"],
             "final_trade_decision": final_state["final_trade_decision"],
+            "run_metrics": metrics,
         }
 
-        # Save to file
-        directory = Path(f"eval_results/{self.ticker}/TradingAgentsStrategy_logs/")
-        directory.mkdir(parents=True, exist_ok=True)
+        with self._log_lock:
+            ticker_states = self.log_states_dict.setdefault(ticker, {})
+            ticker_states[str(trade_date)] = state_entry
 
-        with open(
-            f"eval_results/{self.ticker}/TradingAgentsStrategy_logs/full_states_log_{trade_date}.json",
-            "w",
-        ) as f:
-            json.dump(self.log_states_dict, f, indent=4)
+            # Save to file
+            directory = Path(f"eval_results/{ticker}/TradingAgentsStrategy_logs/")
+            directory.mkdir(parents=True, exist_ok=True)
 
-    def reflect_and_remember(self, returns_losses):
-        """Reflect on decisions and update memory based on returns."""
-        self.reflector.reflect_bull_researcher(
-            self.curr_state, returns_losses, self.bull_memory
-        )
-        self.reflector.reflect_bear_researcher(
-            self.curr_state, returns_losses, self.bear_memory
-        )
-        self.reflector.reflect_trader(
-            self.curr_state, returns_losses, self.trader_memory
-        )
-        self.reflector.reflect_invest_judge(
-            self.curr_state, returns_losses, self.invest_judge_memory
-        )
-        self.reflector.reflect_risk_manager(
-            self.curr_state, returns_losses, self.risk_manager_memory
+            with open(
+                f"eval_results/{ticker}/TradingAgentsStrategy_logs/full_states_log_{trade_date}.json",
+                "w",
+            ) as f:
+                json.dump(ticker_states, f, indent=4)
+
+    def reflect_and_remember(self, returns_losses, final_state=None):
+        """Reflect on decisions and update memory based on returns.
+
+        Args:
+            returns_losses: Realized returns of the position
+            final_state: State to reflect on, e.g. one yielded by propagate_many.
+                Defaults to the state of the last propagate call.
+        """
+        self.reflect_and_remember_many([(final_state or self.curr_state, returns_losses)])
+
+    def reflect_and_remember_many(self, runs, max_concurrency=None):
+        """Reflect on several runs at once, e.g. a whole book after a trading day.
+
+        All reflection prompts are issued concurrently and the memories are
+        updated with one batched embedding request.
+
+        Args:
+            runs: (final_state, returns_losses) pairs
+            max_concurrency: Maximum number of concurrent reflection calls
+        """
+        self.reflector.reflect_many(
+            list(runs),
+            {
+                "bull": self.bull_memory,
+                "bear": self.bear_memory,
+                "trader": self.trader_memory,
+                "invest_judge": self.invest_judge_memory,
+                "risk_manager": self.risk_manager_memory,
+            },
+            max_concurrency=max_concurrency,
         )
 
     def process_signal(self, full_signal):
         """Process a signal to extract the core decision."""
         return self.signal_processor.process_signal(full_signal)
+
+    async def aprocess_signal(self, full_signal):
+        """Async variant of process_signal."""
+        return await self.signal_processor.aprocess_signal(full_signal)
@@ -257,6 +257,9 @@ from apscheduler.triggers.interval import IntervalTrigger
 # Store for analysis results (temporary, in-memory)
 analysis_results = {}
 
+# Running analysis tasks (keeps references so they are not garbage collected)
+analysis_tasks = set()
+
 # Scheduler for automated analyses
 scheduler = BackgroundScheduler()
 scheduler.start()
@@ -417,8 +420,8 @@ def update_progress(analysis_id: str, step: str, percent: int, step_number: int,
         logger.info(f"PROGRESS: {percent:3d}% | Step {step_number:2d}/{total_steps:2d} | {step}")
 
 
-def run_analysis_background(analysis_id: str, request: AnalysisRequest):
-    """Run analysis in background thread with progress tracking"""
+async def run_analysis_background(analysis_id: str, request: AnalysisRequest):
+    """Run analysis as a background task on the event loop with progress tracking"""
     start_time = datetime.now()
     
     # Create logger for this analysis
@@ -447,10 +450,9 @@ def run_analysis_background(analysis_id: str, request: AnalysisRequest):
         current_step = 0
         
         # Step 1: Initialization
-        import time
         current_step += 1
         update_progress(analysis_id, "Verbindung zum LLM-Provider...", 3, current_step, total_steps, logger)
-        time.sleep(0.3)  # Kurze Pause damit Frontend Update sieht
+        await asyncio.sleep(0.3)  # Kurze Pause damit Frontend Update sieht
         
         # Konfiguration erstellen
         config = DEFAULT_CONFIG.copy()
@@ -462,21 +464,22 @@ def run_analysis_background(analysis_id: str, request: AnalysisRequest):
         
         current_step += 1
         update_progress(analysis_id, "Konfiguration wird geladen...", 5, current_step, total_steps, logger)
-        time.sleep(0.3)
+        await asyncio.sleep(0.3)
 
         # Step 2: Initialize Trading Graph
         current_step += 1
         update_progress(analysis_id, f"{analyst_count} Analysten werden initialisiert...", 8, current_step, total_steps, logger)
-        time.sleep(0.2)
-        ta = TradingAgentsGraph(debug=True, config=config)
+        await asyncio.sleep(0.2)
+        # Setting up clients, memories and the graph blocks, keep it off the event loop
+        ta = await asyncio.to_thread(TradingAgentsGraph, debug=True, config=config)
         
         current_step += 1
         update_progress(analysis_id, "Marktdaten werden abgerufen...", 12, current_step, total_steps, logger)
-        time.sleep(0.2)
+        await asyncio.sleep(0.2)
         
         current_step += 1
         update_progress(analysis_id, "Fundamentaldaten werden geladen...", 18, current_step, total_steps, logger)
-        time.sleep(0.2)
+        await asyncio.sleep(0.2)
         
         # Step 3: Run analysis with progress tracking
         # We'll track progress through the analysis phases
@@ -499,7 +502,7 @@ def run_analysis_background(analysis_id: str, request: AnalysisRequest):
         
         update_progress(analysis_id, "Analysten arbeiten an der Analyse...", 50, current_step + 2, total_steps, logger)
         
-        result, decision = ta.propagate(request.ticker, request.date)
+        result, decision = await ta.apropagate(request.ticker, request.date)
         
         analysis_duration = (datetime.now() - step_start).total_seconds()
         logger.info(f"Hauptanalyse abgeschlossen nach {analysis_duration:.1f}s")
@@ -576,7 +579,8 @@ def run_analysis_background(analysis_id: str, request: AnalysisRequest):
 
         # Send Discord notification if webhook provided
         if request.discord_webhook and request.discord_notify:
-            send_discord_notification(
+            await asyncio.to_thread(
+                send_discord_notification,
                 request.discord_webhook,
                 request.ticker,
                 str(decision),
@@ -640,9 +644,10 @@ async def analyze_stock(request: AnalysisRequest):
         }
     }
     
-    # Start background thread
-    thread = threading.Thread(target=run_analysis_background, args=(analysis_id, request))
-    thread.start()
+    # Start background task on the event loop
+    task = asyncio.create_task(run_analysis_background(analysis_id, request))
+    analysis_tasks.add(task)
+    task.add_done_callback(analysis_tasks.discard)
     
     return {
         "success": True,